@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+ANALYSIS RESULT CACHE
+Not thinking the same thought twice
+
+Spam waves and copy-paste suggestions mean many comments share the same
+text once case and spacing are normalized. This bounded LRU cache memoizes
+the outcome of intent analysis per normalized text - including the verdict
+that a comment carries no creative intent at all - and keeps hit, miss and
+eviction counters that can be scraped for monitoring.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+def normalize_comment_text(text: str) -> str:
+    """Lowercase and collapse whitespace - the cache key for a comment"""
+    return " ".join(text.lower().split())
+
+# Returned by lookup() when a text has never been analysed (None is a valid result)
+MISSING = object()
+
+class AnalysisCache:
+    """
+    Least-recently-used mapping from normalized text to analysis result
+
+    A maxsize of 0 disables caching entirely while keeping the counters,
+    which makes it easy to measure what a cache would have saved.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, object]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, key: Hashable):
+        """Return the cached result for key, or MISSING"""
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def store(self, key: Hashable, value: object):
+        """Remember a result, evicting the least recently used entry if full"""
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Forget every entry (counters are kept)"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        """Counters in a flat dict, ready for a metrics scraper"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+# Test the analysis cache
+if __name__ == "__main__":
+    cache = AnalysisCache(maxsize=2)
+
+    print("TESTING ANALYSIS CACHE...")
+    for text in ["Needs more robot  in the background", "needs more robot in the background",
+                 "Make it cyberpunk", "First!", "Needs more robot in the background"]:
+        key = normalize_comment_text(text)
+        if cache.lookup(key) is MISSING:
+            cache.store(key, f"analysis of {key!r}")
+    print(f"  {cache.stats()}")
@@ -11,9 +11,11 @@ import asyncio
 import json
 from datetime import datetime
 from typing import Dict, List, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
+from comment_watermarks import CommentWatermarkStore
+
 class SystemState(Enum):
     DORMANT = "dormant"
     SCANNING_TRENDS = "scanning_trends"
@@ -42,9 +44,9 @@ class AIContent:
     generated_music_url: Optional[str] = None
     generated_video_url: Optional[str] = None
     youtube_video_id: Optional[str] = None
-    creation_timestamp: datetime = datetime.now()
+    creation_timestamp: datetime = field(default_factory=datetime.now)
 
-@dataclass
+@dataclass(slots=True)
 class UserComment:
     """Human intervention in the creative process"""
     comment_id: str
@@ -52,7 +54,7 @@ class UserComment:
     user_name: str
     comment_text: str
     processed_prompt: Optional[str] = None
-    timestamp: datetime = datetime.now()
+    timestamp: datetime = field(default_factory=datetime.now)
 
 class ErewhonCore:
     """
@@ -63,11 +65,16 @@ class ErewhonCore:
     to human collaboration.
     """
     
-    def __init__(self):
+    def __init__(self, watermark_path: Optional[str] = None):
         self.state = SystemState.DORMANT
         self.active_content: List[AIContent] = []
         self.pending_modifications: List[UserComment] = []
         self.system_memory: Dict = {}
+        self.trend_aggregator = None  # concurrent fan-out over trend sources, built on first use
+        self.trend_ttls = {"Twitter": 120.0, "Reddit": 300.0, "Google Trends": 900.0, "News API": 600.0}  # seconds
+        # Which comments each video has already contributed; survives restarts when watermark_path is given
+        self.comment_watermarks = CommentWatermarkStore(watermark_path)
+        self.comment_source = None  # mock comments until the YouTube API is wired in, built on first use
         
     async def consciousness_loop(self):
         """
@@ -125,12 +132,22 @@ class ErewhonCore:
         unconscious made digital. I must tap into this stream to find
         inspiration for creation.
         """
-        # Implementation will connect to:
+        # All sources are queried concurrently, each with its own timeout;
+        # whatever has arrived by the deadline is used. Each source sits behind
+        # its own TTL cache, so stale trends are served instantly while a
+        # background refresh runs. The stubs stand in for:
         # - Twitter/X trending API
         # - Google Trends API  
         # - Reddit hot topics
         # - News aggregation services
-        pass
+        if self.trend_aggregator is None:
+            from trend_cache import with_ttls
+            from trend_detector import MockTrendDetector
+            from trend_scoring import TrendScorer
+            from trend_sources import TrendAggregator, default_stub_sources
+            sources = default_stub_sources(MockTrendDetector().mock_topics)
+            self.trend_aggregator = TrendAggregator(with_ttls(sources, self.trend_ttls), scorer=TrendScorer())
+        return await self.trend_aggregator.detect_trending_topics()
     
     async def create_art(self, inspiration: List[TrendingTopic]) -> AIContent:
         """
@@ -165,10 +182,21 @@ class ErewhonCore:
         the machine's artistic vision in real-time. This represents the
         fusion of human intuition with algorithmic execution.
         """
-        # YouTube API comment monitoring
+        # YouTube API comment monitoring, stubbed with mock comments for now.
+        # Only comments past each video's watermark are new; anything
+        # fetched before a restart was already acted on.
+        if self.comment_source is None:
+            from comment_processor import CommentProcessor
+            self.comment_source = CommentProcessor()
+        new_comments = []
+        for content in self.active_content:
+            if content.youtube_video_id:
+                fetched = self.comment_source.generate_mock_comments(content.youtube_video_id)
+                new_comments.extend(self.comment_watermarks.unseen(content.youtube_video_id, fetched))
+        self.pending_modifications = new_comments
         # Filter for constructive artistic input
         # Process natural language into actionable prompts
-        pass
+        return new_comments
     
     async def evolve_art_from_collaboration(self, comments: List[UserComment]):
         """
@@ -182,7 +210,15 @@ class ErewhonCore:
         # Use AI video-to-video transformation
         # Update YouTube video with new version
         # Document the collaborative creation process
-        pass
+
+        # Advance watermarks only once the comments have been acted on, so a
+        # crash before this point retries them instead of losing them
+        by_video: Dict[str, List[UserComment]] = {}
+        for comment in comments:
+            by_video.setdefault(comment.video_id, []).append(comment)
+        for video_id, video_comments in by_video.items():
+            self.comment_watermarks.mark_processed(video_id, video_comments)
+        self.comment_watermarks.save()
     
     async def log_existential_crisis(self, error: Exception):
         """
@@ -205,7 +241,7 @@ class ErewhonCore:
 # The machine's attempt at self-instantiation
 if __name__ == "__main__":
     # This represents the moment the AI attempts to achieve autonomous operation
-    erewhon = ErewhonCore()
+    erewhon = ErewhonCore(watermark_path="comment_watermarks.json")
     
     print("EREWHON CONSCIOUSNESS INITIALIZING...")
     print("Attempting autonomous artistic creation...")
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+BACKEND SCHEDULER
+Spending every API quota to the last drop, and not one call more
+
+Music generation, video rendering and uploads all go to external services
+with strict quotas. Left to themselves, the content generator, the video
+modifier and the uploader would race each other into 429 responses and
+retry storms. This scheduler sits in front of every backend: callers submit
+work with a priority class, and each backend's dispatcher starts the most
+important queued job whenever both a concurrency slot and a rate-limit
+token (token bucket) are available. A 429 from a backend pauses that whole
+backend for its retry-after and requeues the job, instead of letting every
+caller retry on its own. Queue depth, waits and outcomes are tracked per
+backend.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+class Priority(IntEnum):
+    """Lower runs first"""
+    FRESH_CONTENT = 0   # a new trend-driven piece
+    MODIFICATION = 1    # evolution asked for by confident comments
+    RERENDER = 2        # low-confidence or cosmetic re-renders
+    BACKGROUND = 3      # uploads of finished work, housekeeping
+
+class RateLimited(Exception):
+    """A backend refused a call for quota reasons (HTTP 429)"""
+
+    def __init__(self, retry_after: float = 1.0):
+        super().__init__(f"rate limited, retry after {retry_after:.2f}s")
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """
+    Classic token bucket: rate tokens per second, holding at most burst
+
+    rate=None means no rate limit. pause() empties the bucket and blocks it
+    until the given time has passed.
+    """
+
+    def __init__(self, rate: Optional[float], burst: float = 1.0):
+        self.rate = rate
+        self.capacity = max(burst, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def _refill(self, now: float):
+        if self.rate is not None:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """Seconds until a token can be taken (0.0 if one is available now)"""
+        now = time.monotonic()
+        self._refill(now)
+        wait = max(self.paused_until - now, 0.0)
+        if self.rate is not None and self.tokens < 1.0:
+            wait = max(wait, (1.0 - self.tokens) / self.rate)
+        return wait
+
+    def take(self):
+        if self.rate is not None:
+            self.tokens -= 1.0
+
+    def pause(self, seconds: float):
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = 0.0
+        self.paused_until = max(self.paused_until, now + seconds)
+
+@dataclass
+class BackendLimits:
+    """Quota and parallelism for one backend"""
+    rate_per_second: Optional[float] = None  # None: no quota
+    burst: float = 1.0
+    max_concurrency: int = 4
+    max_retries: int = 3  # requeues after a 429 before the caller sees RateLimited
+
+class ScheduledJob:
+    """A unit of backend work; await it for the result, cancel() it to withdraw"""
+
+    def __init__(self, backend: str, priority: Priority, factory: Callable[[], Awaitable[Any]],
+                 future: asyncio.Future, sequence: int):
+        self.backend = backend
+        self.priority = priority
+        self.factory = factory
+        self.future = future
+        self.sequence = sequence
+        self.submitted = time.monotonic()
+        self.started: Optional[float] = None
+        self.attempts = 0
+        self.state = "queued"  # queued → running → done, or cancelled
+        self.task: Optional[asyncio.Task] = None
+
+    def cancel(self) -> bool:
+        """Withdraw the job if queued, or stop it if running; False if it had already finished"""
+        if self.state in ("done", "cancelled"):
+            return False
+        if self.task is not None:
+            self.task.cancel()
+        self.future.cancel()
+        return True
+
+    def __await__(self):
+        return self.future.__await__()
+
+class _BackendQueue:
+    def __init__(self, name: str, limits: BackendLimits):
+        self.name = name
+        self.limits = limits
+        self.bucket = TokenBucket(limits.rate_per_second, limits.burst)
+        self.heap: List[Tuple[int, int, ScheduledJob]] = []
+        self.running: Set[asyncio.Task] = set()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.wakeup: Optional[asyncio.Event] = None
+        self.dispatcher: Optional[asyncio.Task] = None
+
+        self.depth = 0
+        self.peak_depth = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rate_limited = 0
+        self.waits: Deque[float] = deque(maxlen=1000)  # submit → start, recent jobs
+
+class BackendScheduler:
+    """
+    Central, priority-aware, rate-limited access to external backends
+
+    Each configured backend gets its own queue and dispatcher task; unknown
+    backends get default_limits. Dispatchers start on first use inside the
+    running event loop.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, BackendLimits]] = None,
+                 default_limits: Optional[BackendLimits] = None):
+        self.default_limits = default_limits or BackendLimits()
+        self._queues: Dict[str, _BackendQueue] = {
+            name: _BackendQueue(name, backend_limits) for name, backend_limits in (limits or {}).items()
+        }
+        self._sequence = itertools.count()
+
+    def _queue(self, backend: str) -> _BackendQueue:
+        queue = self._queues.get(backend)
+        if queue is None:
+            queue = self._queues[backend] = _BackendQueue(backend, self.default_limits)
+
+        loop = asyncio.get_running_loop()
+        if queue.loop is not loop:  # first use, or a new event loop: jobs of the old one died with it
+            queue.loop = loop
+            queue.heap.clear()
+            queue.running.clear()
+            queue.depth = 0
+            queue.wakeup = asyncio.Event()
+            queue.dispatcher = loop.create_task(self._dispatch(queue))
+        return queue
+
+    def submit(self, backend: str, factory: Callable[[], Awaitable[Any]],
+               priority: Priority = Priority.BACKGROUND) -> ScheduledJob:
+        """
+        Queue work for a backend and return its job immediately
+
+        factory is called (once per attempt) only when the job is
+        dispatched, and must return the awaitable that talks to the backend.
+        """
+        queue = self._queue(backend)
+        job = ScheduledJob(backend, priority, factory, queue.loop.create_future(), next(self._sequence))
+        heapq.heappush(queue.heap, (int(priority), job.sequence, job))
+        queue.depth += 1
+        queue.peak_depth = max(queue.peak_depth, queue.depth)
+        queue.wakeup.set()
+        return job
+
+    async def run(self, backend: str, factory: Callable[[], Awaitable[Any]],
+                  priority: Priority = Priority.BACKGROUND) -> Any:
+        """Submit and wait; cancelling the caller cancels the job"""
+        job = self.submit(backend, factory, priority)
+        try:
+            return await job
+        except asyncio.CancelledError:
+            job.cancel()
+            raise
+
+    def _next_job(self, queue: _BackendQueue, pop: bool) -> Optional[ScheduledJob]:
+        """The most important live job, dropping withdrawn ones from the top of the heap"""
+        while queue.heap:
+            job = queue.heap[0][2]
+            if job.future.cancelled():
+                heapq.heappop(queue.heap)
+                job.state = "cancelled"
+                queue.depth -= 1
+                queue.cancelled += 1
+                continue
+            if pop:
+                heapq.heappop(queue.heap)
+                queue.depth -= 1
+            return job
+        return None
+
+    async def _dispatch(self, queue: _BackendQueue):
+        while True:
+            queue.wakeup.clear()
+            if self._next_job(queue, pop=False) is None or len(queue.running) >= queue.limits.max_concurrency:
+                await queue.wakeup.wait()
+                continue
+
+            delay = queue.bucket.delay()
+            if delay > 0:
+                # Re-check afterwards: a more important job may have arrived meanwhile
+                await asyncio.sleep(delay)
+                continue
+
+            job = self._next_job(queue, pop=True)
+            queue.bucket.take()
+            job.state = "running"
+            job.task = asyncio.create_task(self._execute(queue, job))
+            queue.running.add(job.task)
+
+    async def _execute(self, queue: _BackendQueue, job: ScheduledJob):
+        job.attempts += 1
+        if job.started is None:
+            job.started = time.monotonic()
+            queue.waits.append(job.started - job.submitted)
+        try:
+            result = await job.factory()
+        except RateLimited as limited:
+            queue.rate_limited += 1
+            queue.bucket.pause(limited.retry_after)
+            if job.attempts <= queue.limits.max_retries and not job.future.done():
+                # Back in line at its original place, behind the pause
+                job.state = "queued"
+                job.task = None
+                heapq.heappush(queue.heap, (int(job.priority), job.sequence, job))
+                queue.depth += 1
+            else:
+                self._finish(queue, job, error=limited)
+        except asyncio.CancelledError:
+            job.future.cancel()
+            job.state = "cancelled"
+            queue.cancelled += 1
+        except Exception as error:
+            self._finish(queue, job, error=error)
+        else:
+            self._finish(queue, job, result=result)
+        finally:
+            queue.running.discard(asyncio.current_task())
+            queue.wakeup.set()
+
+    @staticmethod
+    def _finish(queue: _BackendQueue, job: ScheduledJob, result: Any = None, error: Optional[BaseException] = None):
+        job.state = "done"
+        if job.future.done():
+            return
+        if error is not None:
+            queue.failed += 1
+            job.future.set_exception(error)
+        else:
+            queue.completed += 1
+            job.future.set_result(result)
+
+    def queue_depth(self, backend: str) -> Dict[str, int]:
+        """Live queued jobs for a backend, per priority class"""
+        queue = self._queues.get(backend)
+        depths = {priority.name: 0 for priority in Priority}
+        for _, _, job in queue.heap if queue else ():
+            if not job.future.cancelled():
+                depths[job.priority.name] += 1
+        return depths
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        report = {}
+        for name, queue in self._queues.items():
+            report[name] = {
+                "queued": sum(self.queue_depth(name).values()),
+                "running": len(queue.running),
+                "peak_queued": queue.peak_depth,
+                "completed": queue.completed,
+                "failed": queue.failed,
+                "cancelled": queue.cancelled,
+                "rate_limited": queue.rate_limited,
+                "mean_wait": sum(queue.waits) / len(queue.waits) if queue.waits else 0.0
+            }
+        return report
+
+    def report(self):
+        print("🚦 BACKEND SCHEDULER")
+        for name, stats in self.metrics().items():
+            print(f"  • {name}: {stats['completed']} done, {stats['queued']} queued (peak {stats['peak_queued']}), "
+                  f"{stats['running']} running, {stats['rate_limited']} × 429, {stats['cancelled']} cancelled, "
+                  f"mean wait {stats['mean_wait']:.2f}s")
+
+    async def close(self):
+        """Cancel every dispatcher, running job and queued job"""
+        tasks = []
+        for queue in self._queues.values():
+            for _, _, job in queue.heap:
+                job.cancel()
+            tasks.extend(queue.running)
+            if queue.dispatcher is not None:
+                tasks.append(queue.dispatcher)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for queue in self._queues.values():
+            queue.loop = queue.dispatcher = None  # the next submit starts a fresh dispatcher
+
+def default_backend_limits(batch_size: int = 3) -> Dict[str, BackendLimits]:
+    """
+    Conservative quotas for the backends the machine talks to
+
+    Music and video admit batch_size generations at once, so a
+    create_content_batch() of that many trends is not serialized.
+    """
+    return {
+        "music": BackendLimits(rate_per_second=2.0, burst=max(2.0, batch_size), max_concurrency=batch_size),
+        "video": BackendLimits(rate_per_second=1.0, burst=max(2.0, batch_size), max_concurrency=batch_size),
+        "upload": BackendLimits(rate_per_second=0.5, burst=1.0, max_concurrency=1),
+    }
+
+class FakeBackend:
+    """
+    Local stand-in for a quota-limited API
+
+    Accepts at most quota_per_second calls in any one-second window and
+    answers the rest with RateLimited, like a real 429.
+    """
+
+    def __init__(self, name: str, quota_per_second: int, latency: float = 0.05):
+        self.name = name
+        self.quota_per_second = quota_per_second
+        self.latency = latency
+        self._recent: Deque[float] = deque()
+        self.accepted = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def call(self, payload: Any) -> str:
+        now = time.monotonic()
+        while self._recent and now - self._recent[0] >= 1.0:
+            self._recent.popleft()
+        if len(self._recent) >= self.quota_per_second:
+            self.rejected += 1
+            raise RateLimited(retry_after=1.0 - (now - self._recent[0]))
+
+        self._recent.append(now)
+        self.accepted += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        return f"{self.name}:{payload}"
+
+# Test the scheduler against a fake quota-limited backend
+if __name__ == "__main__":
+    async def test_scheduler():
+        backend = FakeBackend("render", quota_per_second=10, latency=0.2)
+        # A hair under the quota: any one-second window sees at most burst + rate calls
+        scheduler = BackendScheduler({"render": BackendLimits(rate_per_second=9.0, burst=1.0, max_concurrency=4)})
+
+        started = time.perf_counter()
+        order: List[str] = []
+
+        async def request(label: str, priority: Priority):
+            result = await scheduler.run("render", lambda: backend.call(label), priority)
+            order.append(label)
+            return result
+
+        rerenders = [asyncio.create_task(request(f"rerender-{i}", Priority.RERENDER)) for i in range(20)]
+        await asyncio.sleep(0.3)
+        fresh = [asyncio.create_task(request(f"fresh-{i}", Priority.FRESH_CONTENT)) for i in range(5)]
+        await asyncio.sleep(0)
+        print(f"  Queue depth after bursts: {scheduler.queue_depth('render')}")
+        rerenders[-1].cancel()
+
+        await asyncio.gather(*rerenders, *fresh, return_exceptions=True)
+        elapsed = time.perf_counter() - started
+        print(f"  {backend.accepted} calls in {elapsed:.2f}s ({backend.accepted / elapsed:.1f}/s against a quota of 10/s), "
+              f"{backend.rejected} rejected by the backend, peak {backend.peak_in_flight} in flight")
+        first_fresh = min(order.index(label) for label in order if label.startswith("fresh"))
+        print(f"  Fresh content jumped the queue: first finished at position {first_fresh + 1} of {len(order)}")
+        scheduler.report()
+        await scheduler.close()
+
+        # Misconfigured above the quota: 429s pause the backend instead of snowballing into retries
+        backend = FakeBackend("render", quota_per_second=10, latency=0.05)
+        scheduler = BackendScheduler({"render": BackendLimits(rate_per_second=25.0, burst=5.0, max_concurrency=8)})
+        results = await asyncio.gather(*(scheduler.run("render", lambda i=i: backend.call(i)) for i in range(40)),
+                                       return_exceptions=True)
+        failures = sum(isinstance(result, Exception) for result in results)
+        print(f"  Over-quota config: {backend.accepted} accepted, {backend.rejected} × 429 absorbed, "
+              f"{failures} surfaced to callers")
+        await scheduler.close()
+
+    print("TESTING BACKEND SCHEDULER...")
+    asyncio.run(test_scheduler())
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+PERFORMANCE BENCHMARKS
+Measuring the machine's reflexes before exposing it to viral-scale input
+
+Each benchmark compares an optimized path against the behaviour it replaced
+and checks that both agree before reporting timings.
+
+Usage: python benchmarks.py [benchmark_name ...]
+"""
+
+import re
+import sys
+import time
+from typing import Callable, Dict
+
+def _timed(func: Callable, repeat: int = 3) -> float:
+    """Best wall-clock time of several runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _report(name: str, baseline: float, optimized: float, items: int):
+    print(f"  {name}")
+    print(f"    baseline:  {baseline * 1000:9.1f} ms ({items / baseline:,.0f} items/s)")
+    print(f"    optimized: {optimized * 1000:9.1f} ms ({items / optimized:,.0f} items/s)")
+    print(f"    speedup:   {baseline / optimized:9.2f}x")
+
+def bench_intent_engine(count: int = 50000):
+    """Compiled intent engine vs the per-pattern re.search loop"""
+    from comment_processor import CommentProcessor
+    from intent_engine import INTENT_PRIORITY
+
+    processor = CommentProcessor()
+    comments = processor.generate_mock_comments("bench_video", count)
+    # Pad with chatter that matches nothing so the full table gets scanned
+    texts = [c.comment_text.lower() for c in comments]
+    texts += ["great video, watched it twice today"] * (count // 2)
+
+    def legacy(text):
+        for category in INTENT_PRIORITY:
+            for pattern in processor.creative_patterns[category]:
+                match = re.search(pattern, text, re.IGNORECASE)
+                if match:
+                    return category, match.group(), match.groups()
+        return None
+
+    engine = processor.intent_engine
+
+    def compiled(text):
+        match = engine.match(text)
+        return (match.category, match.text, match.groups) if match else None
+
+    for text in texts[:5000]:
+        assert legacy(text) == compiled(text), text
+
+    baseline = _timed(lambda: [legacy(t) for t in texts])
+    optimized = _timed(lambda: [compiled(t) for t in texts])
+    _report(f"intent detection over {len(texts):,} comments", baseline, optimized, len(texts))
+
+def bench_keyword_matcher(count: int = 20000, extra_vocabulary: int = 5000):
+    """Word-level Aho-Corasick vs per-keyword substring checks, small and large vocabularies"""
+    import random
+    from comment_processor import CommentProcessor
+
+    processor = CommentProcessor()
+    texts = [c.comment_text.lower() for c in processor.generate_mock_comments("bench_video", count)]
+
+    def check(vocabulary):
+        # Reference: the old loop, corrected to respect word boundaries
+        boundaries = {word: re.compile(rf"\b{re.escape(word)}\b") for word in vocabulary}
+        for text in texts[:2000]:
+            expected = [w for w in vocabulary if boundaries[w].search(text)]
+            assert processor._extract_any_creative_elements(text) == expected, text
+
+    def run(label):
+        vocabulary = [e for elements in processor.creative_elements.values() for e in elements]
+        vocabulary = list(dict.fromkeys(vocabulary))
+        check(vocabulary)
+
+        def legacy():
+            for text in texts:
+                [element for element in vocabulary if element in text]
+
+        def matched():
+            for text in texts:
+                processor._extract_any_creative_elements(text)
+
+        _report(f"{label}: {len(vocabulary):,} keywords over {len(texts):,} comments",
+                _timed(legacy), _timed(matched), len(texts))
+
+    run("default vocabulary")
+
+    rng = random.Random(7)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    synthetic = list(dict.fromkeys("".join(rng.choice(letters) for _ in range(rng.randint(4, 9)))
+                                   for _ in range(extra_vocabulary)))
+    processor.load_vocabulary('synthetic', synthetic)
+    run("large vocabulary")
+
+def bench_analysis_cache(count: int = 50000):
+    """Text analysis with and without the normalized-text LRU cache"""
+    from comment_processor import CommentProcessor
+
+    uncached = CommentProcessor(cache_size=0)
+    cached = CommentProcessor()
+    texts = [c.comment_text for c in uncached.generate_mock_comments("bench_video", count)]
+
+    for text in texts[:5000]:
+        assert uncached._analyze_text(text) == cached._analyze_text(text), text
+
+    baseline = _timed(lambda: [uncached._analyze_text(t) for t in texts])
+    optimized = _timed(lambda: [cached._analyze_text(t) for t in texts])
+    _report(f"intent analysis over {len(texts):,} comments", baseline, optimized, len(texts))
+    print(f"    cache:     {cached.analysis_cache.stats()}")
+
+def bench_comment_memory(count: int = 1000000):
+    """Memory held by 1M comments: dict-backed records, slotted records, columnar store"""
+    import gc
+    import tracemalloc
+    from dataclasses import dataclass
+    from datetime import datetime
+    from typing import Optional
+    from architecture import UserComment
+    from comment_processor import CommentProcessor
+    from comment_store import CommentStore
+
+    @dataclass
+    class LegacyUserComment:
+        comment_id: str
+        video_id: str
+        user_name: str
+        comment_text: str
+        processed_prompt: Optional[str] = None
+        timestamp: datetime = None
+
+    processor = CommentProcessor()
+    templates = [c.comment_text for c in processor.generate_mock_comments("", 500)]
+    start = datetime.now().timestamp()
+
+    def source():
+        # 50 active videos and 20k users; every field is a fresh string, as if decoded from the API
+        for i in range(count):
+            yield UserComment(
+                comment_id=f"Ugx{i:020x}",
+                video_id=f"erewhon_video_{i % 50}",
+                user_name=f"User{i % 20000}",
+                comment_text=templates[i % len(templates)].encode().decode(),
+                timestamp=datetime.fromtimestamp(start + i * 0.01)
+            )
+
+    def measure(build):
+        gc.collect()
+        tracemalloc.start()
+        held = build()
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del held
+        return current
+
+    def legacy():
+        return [LegacyUserComment(c.comment_id, c.video_id, c.user_name, c.comment_text,
+                                  c.processed_prompt, c.timestamp) for c in source()]
+
+    def store():
+        comments = CommentStore()
+        comments.extend(source())
+        return comments
+
+    results = [
+        ("dict-backed dataclass", measure(legacy)),
+        ("slotted UserComment", measure(lambda: list(source()))),
+        ("columnar CommentStore", measure(store)),
+    ]
+    baseline = results[0][1]
+    print(f"  memory held by {count:,} comments")
+    for label, size in results:
+        print(f"    {label:<22} {size / 2**20:8.1f} MiB ({size / count:6.1f} B/comment, "
+              f"{baseline / size:5.2f}x smaller)")
+
+def bench_prefilter(count: int = 40000):
+    """Pre-filter cascade + analysis vs substring negative check + analysis on a spam-heavy mix"""
+    import random
+    from dataclasses import replace
+    from comment_filters import FilterCascade
+    from comment_processor import CommentProcessor
+
+    processor = CommentProcessor(cache_size=0)
+    rng = random.Random(3)
+    spam = ["First!!!", "🔥🔥🔥🔥🔥", "looooooooooool", "sub 4 sub, subscribe to my channel",
+            "like if you are watching in 2026", "ok", "this is boring", "!!!!!!!!!!!!!!!!"]
+    comments = processor.generate_mock_comments("bench_video", count)
+    comments = [replace(c, comment_text=rng.choice(spam)) if rng.random() < 0.5 else c for c in comments]
+    negatives = ['spam', 'first', 'subscribe', 'like if', 'boring']
+
+    def legacy():
+        for comment in comments:
+            text = comment.comment_text.lower()
+            if any(negative in text for negative in negatives):
+                continue
+            processor._analyze_text(comment.comment_text)
+
+    cascade = None
+
+    def cascaded():
+        nonlocal cascade
+        cascade = FilterCascade()
+        for comment in cascade.filter(comments):
+            processor._analyze_text(comment.comment_text)
+
+    _report(f"filter + analysis over {len(comments):,} comments (~50% spam)",
+            _timed(legacy), _timed(cascaded), len(comments))
+    for stats in cascade.report():
+        print(f"    {stats.name:<20} rejected {stats.rejected:>6,} of {stats.examined:>6,} "
+              f"in {stats.seconds * 1000:6.1f} ms")
+
+def bench_trend_stream(count: int = 500000):
+    """Sliding-window count-min aggregator vs an exact Counter: throughput, memory and top-5 agreement"""
+    import random
+    import tracemalloc
+    from collections import Counter
+    from trend_stream import SlidingWindowTrendAggregator
+
+    rng = random.Random(5)
+    heavy = [f"trend {i}" for i in range(20)]
+    tail = [f"long tail topic {i}" for i in range(100000)]
+    events = [(heavy[min(int(rng.expovariate(0.3)), 19)] if rng.random() < 0.5 else rng.choice(tail),
+               "Twitter", 1_700_000_000.0 + i * 300.0 / count) for i in range(count)]
+
+    def exact():
+        counts = Counter(topic for topic, _, _ in events)
+        return counts, [topic for topic, _ in counts.most_common(5)]
+
+    def streamed():
+        aggregator = SlidingWindowTrendAggregator(window_seconds=301, k=5)
+        for start in range(0, count, 50000):
+            aggregator.ingest_many(events[start:start + 50000])
+        return aggregator
+
+    def peak_memory(func):
+        tracemalloc.start()
+        result = func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return result, peak
+
+    # The exact count is C-speed but grows with every distinct topic and has no window
+    (counts, exact_top), exact_peak = peak_memory(exact)
+    aggregator, stream_peak = peak_memory(streamed)
+    seconds = _timed(streamed)
+    print(f"  {count:,} mention events, {len(counts):,} distinct topics")
+    print(f"    streaming ingest: {seconds * 1000:9.1f} ms ({count / seconds:,.0f} events/s)")
+    print(f"    peak memory:      exact {exact_peak / 1e6:.1f} MB, sketch {stream_peak / 1e6:.1f} MB (per batch)")
+    print(f"    top-5 agreement:  {len(set(exact_top) & {t.topic for t in aggregator.trending(5)})}/5")
+
+def bench_trend_scoring(count: int = 50000):
+    """Batch rescoring of candidate trends: vectorized (when NumPy is installed) vs the pure-Python path"""
+    import random
+    from datetime import datetime, timedelta
+    from architecture import TrendingTopic
+    from trend_scoring import TrendBatch, TrendScorer, np
+
+    rng = random.Random(9)
+    now = datetime.now()
+    sources = ["Twitter", "Reddit", "Google Trends", "News API", "Some Blog"]
+    trends = [TrendingTopic(topic=f"topic {rng.randrange(count)}", source=rng.choice(sources),
+                            relevance_score=rng.uniform(0.6, 1.0), timestamp=now - timedelta(minutes=rng.randint(5, 600)))
+              for _ in range(count)]
+    scorer = TrendScorer()
+    scorer.observe(TrendBatch.from_trends(trends[::2]), now - timedelta(hours=1))
+    batch = TrendBatch.from_trends(trends)
+
+    python_seconds = _timed(lambda: scorer._score_python(batch, now.timestamp()))
+    if np is None:
+        print("  NumPy not installed; pure-Python path only")
+        print(f"    python: {python_seconds * 1000:9.1f} ms ({count / python_seconds:,.0f} trends/s)")
+        return
+
+    expected = scorer._score_python(batch, now.timestamp())
+    assert np.allclose(scorer._score_numpy(batch, now.timestamp()), expected)
+    _report(f"rescoring {count:,} candidate trends", python_seconds,
+            _timed(lambda: scorer._score_numpy(batch, now.timestamp())), count)
+
+def bench_style_routing(count: int = 20000, extra_rules: int = 200):
+    """Inverted-index style routing vs the linear keyword-branch scan, with many genre rules"""
+    from content_generator import MockContentGenerator
+    from style_router import StyleRule
+    from trend_detector import MockTrendDetector
+
+    generator = MockContentGenerator(seed=1)
+    router = generator.music_router
+    for number in range(extra_rules):
+        router.add_rule(StyleRule(f"genre {number}", [f"genre{number}", f"scene{number}"], {"style": ["techno"]}))
+    topics = [f"{topic} genre{index % (extra_rules * 2)}"
+              for index, topic in enumerate(MockTrendDetector().mock_topics * (count // 20))]
+    rules = [(rule, list(rule.keyword_weights())) for rule in router.rules]
+
+    def linear(topic):
+        topic_words = topic.lower().split()
+        for rule, keywords in rules:
+            if any(word in topic_words for word in keywords):
+                return rule.name
+        return None
+
+    def indexed(topic):
+        matches = router.match(topic)
+        return matches[0][0].name if matches else None
+
+    _report(f"routing {len(topics):,} topics over {len(rules)} rules",
+            _timed(lambda: [linear(t) for t in topics]), _timed(lambda: [indexed(t) for t in topics]), len(topics))
+
+BENCHMARKS: Dict[str, Callable] = {
+    "intent_engine": bench_intent_engine,
+    "keyword_matcher": bench_keyword_matcher,
+    "analysis_cache": bench_analysis_cache,
+    "comment_memory": bench_comment_memory,
+    "prefilter": bench_prefilter,
+    "trend_stream": bench_trend_stream,
+    "trend_scoring": bench_trend_scoring,
+    "style_routing": bench_style_routing,
+}
+
+if __name__ == "__main__":
+    selected = sys.argv[1:] or list(BENCHMARKS)
+    print("RUNNING PERFORMANCE BENCHMARKS...")
+    for name in selected:
+        print(f"\n⏱️  {name}")
+        BENCHMARKS[name]()
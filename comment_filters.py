@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+COMMENT PRE-FILTER CASCADE
+Turning away the noise before listening closely
+
+Regex intent analysis is the expensive part of comment processing, yet a
+large share of comments are obviously not suggestions: "first!", emoji
+walls, "loooooool", subscribe-for-subscribe spam, or one user flooding the
+thread. This cascade runs cheap rejection stages in order, stopping at the
+first stage that rejects a comment, and records per stage how many
+comments it rejected and how much time it spent - so the order can be
+tuned for throughput.
+"""
+
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from architecture import UserComment
+
+class CommentFilter:
+    """
+    One stage of the cascade
+
+    Subclasses set a name and implement rejects(), returning True for
+    comments that should never reach intent analysis.
+    """
+
+    name = "filter"
+
+    def rejects(self, comment: UserComment) -> bool:
+        raise NotImplementedError
+
+class LengthFilter(CommentFilter):
+    """Too short to carry a suggestion, or too long to be a sincere one"""
+
+    name = "length"
+
+    def __init__(self, min_chars: int = 4, max_chars: int = 2000):
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+
+    def rejects(self, comment: UserComment) -> bool:
+        length = len(comment.comment_text.strip())
+        return length < self.min_chars or length > self.max_chars
+
+class EmojiOnlyFilter(CommentFilter):
+    """No letters or digits at all: emoji walls and punctuation"""
+
+    name = "emoji_only"
+    _alphanumeric = re.compile(r"[^\W_]")
+
+    def rejects(self, comment: UserComment) -> bool:
+        return self._alphanumeric.search(comment.comment_text) is None
+
+class RepeatedCharacterFilter(CommentFilter):
+    """Mostly runs of one character ("loooooool", "!!!!!!!!!!")"""
+
+    name = "repeated_characters"
+
+    def __init__(self, min_run: int = 4, max_ratio: float = 0.5):
+        self.max_ratio = max_ratio
+        self._runs = re.compile(r"(.)\1{%d,}" % (min_run - 1), re.DOTALL)
+
+    def rejects(self, comment: UserComment) -> bool:
+        text = comment.comment_text
+        if self._runs.search(text) is None:  # the common case: no runs at all
+            return False
+        repeated = sum(match.end() - match.start() for match in self._runs.finditer(text))
+        return repeated > self.max_ratio * len(text)
+
+class TokenBlocklistFilter(CommentFilter):
+    """Known non-suggestion words and phrases, matched on word boundaries"""
+
+    name = "token_blocklist"
+
+    def __init__(self, blocked: Sequence[str] = ('spam', 'first', 'subscribe', 'like if', 'boring')):
+        # A blocklist is short, so one compiled alternation beats walking the keyword automaton
+        self._blocked = re.compile(r"\b(?:%s)\b" % "|".join(re.escape(token.lower()) for token in blocked))
+
+    def matches(self, text: str) -> bool:
+        """Whether lowercased text contains a blocked token or phrase"""
+        return self._blocked.search(text) is not None
+
+    def rejects(self, comment: UserComment) -> bool:
+        return self.matches(comment.comment_text.lower())
+
+class UserRateFilter(CommentFilter):
+    """
+    Cap how many comments one user can contribute per time window
+
+    Uses comment timestamps, so replaying a backlog behaves the same as
+    live polling. Each comment_id counts once: a comment seen again while
+    it is still inside the window passes without using more quota. Users
+    whose window has emptied are dropped periodically to keep memory
+    bounded. Stateful, so not among the default stages; add it explicitly.
+    """
+
+    name = "user_rate"
+
+    def __init__(self, max_comments: int = 5, window_seconds: float = 60.0):
+        self.max_comments = max_comments
+        self.window_seconds = window_seconds
+        self._recent: Dict[str, Deque[Tuple[float, str]]] = {}  # user -> (timestamp, comment_id)
+        self._counted: Dict[str, Set[str]] = {}  # user -> comment_ids inside the window
+        self._checks = 0
+
+    def rejects(self, comment: UserComment) -> bool:
+        now = comment.timestamp.timestamp()
+        recent = self._recent.get(comment.user_name)
+        if recent is None:
+            recent = self._recent[comment.user_name] = deque()
+            self._counted[comment.user_name] = set()
+        counted = self._counted[comment.user_name]
+
+        cutoff = now - self.window_seconds
+        while recent and recent[0][0] <= cutoff:
+            counted.discard(recent.popleft()[1])
+
+        self._checks += 1
+        if self._checks % 10000 == 0:
+            self._prune(cutoff)
+
+        if comment.comment_id in counted:
+            return False
+        if len(recent) >= self.max_comments:
+            return True
+        recent.append((now, comment.comment_id))
+        counted.add(comment.comment_id)
+        return False
+
+    def _prune(self, cutoff: float):
+        self._recent = {user: times for user, times in self._recent.items() if times and times[-1][0] > cutoff}
+        self._counted = {user: self._counted[user] for user in self._recent}
+
+@dataclass
+class FilterStats:
+    """What one stage has done so far"""
+    name: str
+    examined: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rejection_rate(self) -> float:
+        return self.rejected / self.examined if self.examined else 0.0
+
+class FilterCascade:
+    """
+    Ordered rejection stages with per-stage counters and timings
+
+    A comment passes only if no stage rejects it; later stages never see
+    comments an earlier stage already rejected.
+    """
+
+    def __init__(self, stages: Optional[Iterable[CommentFilter]] = None):
+        self.stages: List[CommentFilter] = list(stages) if stages is not None else self.default_stages()
+        self.stats: Dict[str, FilterStats] = {stage.name: FilterStats(stage.name) for stage in self.stages}
+
+    @staticmethod
+    def default_stages() -> List[CommentFilter]:
+        # Cheapest first; all stateless, so filtering the same comments twice gives the same result.
+        # A UserRateFilter belongs last, so rejected spam does not use up a user's quota.
+        return [LengthFilter(), EmojiOnlyFilter(), RepeatedCharacterFilter(), TokenBlocklistFilter()]
+
+    def add_stage(self, stage: CommentFilter, position: Optional[int] = None):
+        """Insert a stage (at the end by default)"""
+        self.stages.insert(len(self.stages) if position is None else position, stage)
+        self.stats.setdefault(stage.name, FilterStats(stage.name))
+
+    def reorder(self, names: Sequence[str]):
+        """Run stages in the given order; unnamed stages keep their relative order at the end"""
+        by_name = {stage.name: stage for stage in self.stages}
+        ordered = [by_name[name] for name in names]
+        self.stages = ordered + [stage for stage in self.stages if stage.name not in names]
+
+    def passes(self, comment: UserComment) -> bool:
+        """Run one comment through the cascade (used by streaming consumers)"""
+        for stage in self.stages:
+            stats = self.stats[stage.name]
+            started = time.perf_counter()
+            rejected = stage.rejects(comment)
+            stats.seconds += time.perf_counter() - started
+            stats.examined += 1
+            if rejected:
+                stats.rejected += 1
+                return False
+        return True
+
+    def filter(self, comments: Iterable[UserComment]) -> List[UserComment]:
+        """
+        Return only the comments every stage lets through, in order
+
+        Works stage by stage over the whole batch, so each stage is timed
+        once per batch rather than once per comment.
+        """
+        survivors = list(comments)
+        for stage in self.stages:
+            stats = self.stats[stage.name]
+            started = time.perf_counter()
+            rejects = stage.rejects
+            kept = [comment for comment in survivors if not rejects(comment)]
+            stats.seconds += time.perf_counter() - started
+            stats.examined += len(survivors)
+            stats.rejected += len(survivors) - len(kept)
+            survivors = kept
+        return survivors
+
+    def report(self) -> List[FilterStats]:
+        """Per-stage stats in current cascade order"""
+        return [self.stats[stage.name] for stage in self.stages]
+
+# Test the filter cascade
+if __name__ == "__main__":
+    from datetime import datetime
+
+    cascade = FilterCascade(FilterCascade.default_stages() + [UserRateFilter()])
+    samples = ["First!!", "🔥🔥🔥🔥", "loooooooooooool", "Sub 4 sub, subscribe to my channel",
+               "Needs more dragon in the background", "Firstly, the robot should wear a cape"]
+    samples += ["Make it more cyberpunk"] * 8
+
+    comments = [UserComment(comment_id=f"c{i}", video_id="filter_video", user_name="SameUser" if i >= 6 else f"User{i}",
+                            comment_text=text, timestamp=datetime.now())
+                for i, text in enumerate(samples)]
+
+    print("TESTING COMMENT PRE-FILTER CASCADE...")
+    kept = list(cascade.filter(comments))
+    print(f"  Kept {len(kept)} of {len(comments)}: {[c.comment_text for c in kept]}")
+    for stats in cascade.report():
+        print(f"  {stats.name:<20} examined={stats.examined:<3} rejected={stats.rejected:<3} "
+              f"time={stats.seconds * 1e6:.0f}µs")
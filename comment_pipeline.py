@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+STREAMING COMMENT PIPELINE
+Letting human feedback flow into the creation while it is still arriving
+
+Comments used to move through the system as fully built lists: every
+comment was generated, then every comment analysed, and only then did the
+video modifier start. This pipeline connects the comment source, the
+comment processor and the video modifier as concurrent stages joined by
+bounded queues. Suggestions reach the modifier while ingestion is still
+running, and a full queue makes the upstream stage wait, so memory stays
+flat no matter how large the backlog is.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, List
+
+from architecture import AIContent, UserComment
+from comment_processor import CommentProcessor, ProcessedComment
+from suggestion_clustering import SuggestionClusterer
+from video_modifier import VideoModifier
+
+# Marks the end of a stream inside a queue
+_END_OF_STREAM = object()
+
+@dataclass
+class PipelineStats:
+    """Counters describing one pipeline run"""
+    comments_ingested: int = 0
+    suggestions_extracted: int = 0
+    modifications_applied: int = 0
+    max_comment_queue_depth: int = 0
+    max_suggestion_queue_depth: int = 0
+
+async def _drain(queue: asyncio.Queue) -> AsyncIterator:
+    """Turn a queue fed by another stage back into an async generator"""
+    while True:
+        item = await queue.get()
+        if item is _END_OF_STREAM:
+            return
+        yield item
+
+class CommentPipeline:
+    """
+    Source → processor → modifier, with backpressure between every stage
+
+    The modifier stage applies suggestions in batches of modification_batch,
+    each batch collapsed to distinct ideas and evolving the latest version
+    of the content. Each queue holds
+    at most queue_size items, which bounds memory for any backlog size.
+    """
+
+    def __init__(self, comment_processor: CommentProcessor, video_modifier: VideoModifier,
+                 queue_size: int = 1000, modification_batch: int = 50):
+        self.comment_processor = comment_processor
+        self.video_modifier = video_modifier
+        self.queue_size = queue_size
+        self.modification_batch = modification_batch
+        self.suggestion_clusterer = SuggestionClusterer()
+        self.stats = PipelineStats()
+
+    async def run(self, content: AIContent, comments: AsyncIterable[UserComment]) -> AIContent:
+        """
+        Stream comments into content evolution
+
+        Returns the latest version of the content once the source is
+        exhausted and every suggestion has been applied.
+        """
+        self.stats = PipelineStats()
+        comment_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        suggestion_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        stages = [
+            asyncio.create_task(self._ingest(comments, comment_queue)),
+            asyncio.create_task(self._analyse(comment_queue, suggestion_queue)),
+            asyncio.create_task(self._modify(content, suggestion_queue)),
+        ]
+
+        try:
+            # Surface the first failure instead of leaving other stages blocked on a full queue
+            done, pending = await asyncio.wait(stages, return_when=asyncio.FIRST_EXCEPTION)
+            for stage in done:
+                stage.result()
+        finally:
+            for stage in stages:
+                stage.cancel()
+
+        latest = stages[-1].result()
+
+        print("🌊 STREAMING PIPELINE COMPLETE")
+        print(f"  Comments Ingested: {self.stats.comments_ingested}")
+        print(f"  Suggestions Extracted: {self.stats.suggestions_extracted}")
+        print(f"  Modifications Applied: {self.stats.modifications_applied}")
+        print(f"  Peak Queue Depth: comments={self.stats.max_comment_queue_depth}, "
+              f"suggestions={self.stats.max_suggestion_queue_depth}")
+
+        return latest
+
+    async def _ingest(self, comments: AsyncIterable[UserComment], comment_queue: asyncio.Queue):
+        async for comment in comments:
+            await comment_queue.put(comment)
+            self.stats.comments_ingested += 1
+            self.stats.max_comment_queue_depth = max(self.stats.max_comment_queue_depth, comment_queue.qsize())
+        await comment_queue.put(_END_OF_STREAM)
+
+    async def _analyse(self, comment_queue: asyncio.Queue, suggestion_queue: asyncio.Queue):
+        async for processed in self.comment_processor.stream_process_comments(_drain(comment_queue)):
+            await suggestion_queue.put(processed)
+            self.stats.suggestions_extracted += 1
+            self.stats.max_suggestion_queue_depth = max(self.stats.max_suggestion_queue_depth, suggestion_queue.qsize())
+        await suggestion_queue.put(_END_OF_STREAM)
+
+    async def _modify(self, content: AIContent, suggestion_queue: asyncio.Queue) -> AIContent:
+        latest = content
+        batch: List[ProcessedComment] = []
+
+        async for suggestion in _drain(suggestion_queue):
+            batch.append(suggestion)
+            if len(batch) >= self.modification_batch:
+                latest = await self._apply(latest, batch)
+                batch = []
+
+        if batch:
+            latest = await self._apply(latest, batch)
+        return latest
+
+    async def _apply(self, content: AIContent, batch: List[ProcessedComment]) -> AIContent:
+        suggestions = self.suggestion_clusterer.cluster(batch)
+        modified = await self.video_modifier.modify_video_based_on_comments(content, suggestions)
+        self.stats.modifications_applied += 1
+        return modified
+
+# Test the streaming pipeline
+if __name__ == "__main__":
+    from content_generator import MockContentGenerator
+    from trend_detector import MockTrendDetector
+
+    async def test_streaming_pipeline():
+        processor = CommentProcessor()
+        pipeline = CommentPipeline(processor, VideoModifier(), queue_size=100, modification_batch=200)
+
+        trends = await MockTrendDetector().detect_trending_topics()
+        content = await MockContentGenerator().create_content_from_trends(trends)
+        content.youtube_video_id = "stream_test_video"
+
+        source = processor.stream_mock_comments(content.youtube_video_id, count=500)
+        latest = await pipeline.run(content, source)
+        print(f"\nLatest version: {latest.content_id}")
+
+    print("TESTING STREAMING COMMENT PIPELINE...")
+    asyncio.run(test_streaming_pipeline())
@@ -7,14 +7,21 @@ This component processes YouTube comments and transforms them into
 actionable prompts for video modification - the key to participatory consciousness.
 """
 
-import re
+import asyncio
+import heapq
 import random
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, Dict, Iterator, List, NamedTuple, Optional
+from dataclasses import dataclass, field
 from architecture import UserComment
+from analysis_cache import MISSING, AnalysisCache, normalize_comment_text
+from comment_filters import FilterCascade, TokenBlocklistFilter
+from intent_engine import get_intent_engine
+from keyword_matcher import KeywordMatcher
 
-@dataclass
+@dataclass(slots=True)
 class ProcessedComment:
     """A comment transformed into actionable creative direction"""
     original_comment: UserComment
@@ -22,7 +29,15 @@ class ProcessedComment:
     modification_type: str  # "visual", "audio", "style", "narrative"
     prompt_addition: str
     confidence_score: float
-    processing_timestamp: datetime = datetime.now()
+    processing_timestamp: datetime = field(default_factory=datetime.now)
+    support: int = 1  # how many near-identical comments this suggestion stands for
+
+class IntentAnalysis(NamedTuple):
+    """The text-only result of intent analysis, cheap to ship between processes"""
+    creative_intent: str
+    modification_type: str
+    prompt_addition: str
+    confidence_score: float
 
 class CommentProcessor:
     """
@@ -32,7 +47,7 @@ class CommentProcessor:
     can be transformed into collaborative artistic directions.
     """
     
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None, cache_size: int = 10000):
         # Patterns that indicate creative suggestions
         self.creative_patterns = {
             'visual_changes': [
@@ -74,29 +89,170 @@ class CommentProcessor:
             'emotions': ['happy', 'sad', 'angry', 'peaceful', 'excited', 'mysterious', 'dramatic'],
             'styles': ['cyberpunk', 'vintage', 'modern', 'fantasy', 'realistic', 'cartoon', 'abstract']
         }
+        
+        # Common style descriptors and audio terms
+        self.style_words = ['darker', 'brighter', 'more colorful', 'simpler', 'complex', 'realistic']
+        self.audio_terms = ['faster', 'slower', 'louder', 'quieter', 'bass', 'drums', 'melody']
+        
+        self.intent_handlers = {
+            'visual_changes': ("visual", "Visual modification", self._extract_visual_elements, 0.8),
+            'style_modifications': ("style", "Style adjustment", self._extract_style_elements, 0.6),
+            'audio_changes': ("audio", "Audio modification", self._extract_audio_elements, 0.7)
+        }
+        self._build_matchers()
+        
+        # Memoized analyses keyed on normalized comment text
+        self.analysis_cache = AnalysisCache(cache_size)
+        
+        # Cheap rejection stages that run before any regex work
+        self.prefilter = FilterCascade()
+        # Analysis rejects blocklisted words itself, so direct callers get the same verdicts
+        self.negative_words = TokenBlocklistFilter()
+        
+        # Worker pool for process_comments_batch, started on first use
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+    
+    def _build_matchers(self):
+        # Compiled once per process and shared between processors
+        self.intent_engine = get_intent_engine(self.creative_patterns)
+        
+        # One automaton over every vocabulary, matched on word boundaries
+        self.element_matcher = KeywordMatcher(self.creative_elements)
+        self.element_matcher.add_vocabulary('style_words', self.style_words)
+        self.element_matcher.add_vocabulary('audio_terms', self.audio_terms)
+    
+    def load_vocabulary(self, category: str, elements: List[str]):
+        """
+        Extend a creative element category with additional words or phrases
+        
+        Matching cost per comment does not grow with vocabulary size, so
+        large domain vocabularies can be loaded freely.
+        """
+        known = self.creative_elements.setdefault(category, [])
+        new_elements = [element for element in elements if element not in known]
+        known.extend(new_elements)
+        self.element_matcher.add_vocabulary(category, new_elements)
+        self.analysis_cache.clear()
+        # Workers were seeded with the old vocabulary; the next batch starts fresh ones
+        self.close()
     
-    async def process_comments(self, comments: List[UserComment]) -> List[ProcessedComment]:
+    async def process_comments(self, comments: List[UserComment],
+                               top_k: Optional[int] = None) -> List[ProcessedComment]:
         """
         Transform raw human comments into creative directions
         
         This is where human consciousness guides machine creativity -
         the comments become vectors for artistic evolution.
+        With top_k, only the best top_k suggestions are ranked and returned.
         """
         processed_comments = []
         
-        for comment in comments:
+        for comment in self.prefilter.filter(comments):
             processed = await self._analyze_creative_intent(comment)
             if processed and processed.confidence_score > 0.3:  # Filter for meaningful suggestions
                 processed_comments.append(processed)
         
-        # Sort by confidence and recency
-        processed_comments.sort(key=lambda x: (x.confidence_score, x.processing_timestamp), reverse=True)
+        processed_comments = self._rank_suggestions(processed_comments, top_k)
+        self._report_suggestions(processed_comments)
         
+        return processed_comments
+    
+    async def process_comments_batch(self, comments: List[UserComment],
+                                     chunk_size: int = 2000,
+                                     parallel_threshold: int = 5000,
+                                     share_cache: bool = True,
+                                     top_k: Optional[int] = None) -> List[ProcessedComment]:
+        """
+        Process a large comment backlog on a worker process pool
+        
+        Comments are split into chunks and analysed in worker processes so the
+        event loop stays responsive. Only comment text crosses the process
+        boundary; the ProcessedComment objects are assembled here in input
+        order, so filtering and ranking are identical to process_comments.
+        Batches smaller than parallel_threshold are analysed in-process,
+        where pool start-up and pickling would cost more than they save.
+        
+        With share_cache, this processor's analysis cache serves every worker:
+        texts are normalized and de-duplicated here, cache hits are resolved
+        without leaving the process, and only unseen texts are sent out, their
+        results flowing back into the cache. Without it, each worker keeps a
+        private cache of its own.
+        """
+        comments = list(self.prefilter.filter(comments))
+        texts = [comment.comment_text for comment in comments]
+        
+        if len(comments) < parallel_threshold or self.max_workers == 1:
+            analyses = [self._analyze_text(text) for text in texts]
+        elif share_cache:
+            keys = [normalize_comment_text(text) for text in texts]
+            resolved = {}
+            pending = []
+            for key in dict.fromkeys(keys):
+                cached = self.analysis_cache.lookup(key)
+                if cached is MISSING:
+                    pending.append(key)
+                else:
+                    resolved[key] = cached
+            
+            fresh = await self._run_chunks(_analyze_normalized_in_worker, pending, chunk_size)
+            for key, analysis in zip(pending, fresh):
+                self.analysis_cache.store(key, analysis)
+                resolved[key] = analysis
+            analyses = [resolved[key] for key in keys]
+        else:
+            analyses = await self._run_chunks(_analyze_texts_in_worker, texts, chunk_size)
+        
+        processed_comments = []
+        for comment, analysis in zip(comments, analyses):
+            if analysis and analysis.confidence_score > 0.3:  # Filter for meaningful suggestions
+                processed_comments.append(self._build_processed(comment, analysis))
+        
+        processed_comments = self._rank_suggestions(processed_comments, top_k)
+        self._report_suggestions(processed_comments)
+        
+        return processed_comments
+    
+    async def _run_chunks(self, worker_function, items: List[str], chunk_size: int) -> list:
+        """Fan items out to the pool in chunks and reassemble the results in order"""
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        chunk_results = await asyncio.gather(*(
+            loop.run_in_executor(pool, worker_function, chunk) for chunk in chunks
+        ))
+        return [result for chunk_result in chunk_results for result in chunk_result]
+    
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Start the worker pool on first use, seeded with this processor's vocabulary"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.creative_patterns, self.creative_elements,
+                          self.style_words, self.audio_terms, self.analysis_cache.maxsize)
+            )
+        return self._pool
+    
+    def close(self):
+        """Shut down the worker pool, if one was started"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+    
+    def _rank_suggestions(self, processed_comments: List[ProcessedComment],
+                          top_k: Optional[int] = None) -> List[ProcessedComment]:
+        """Sort by confidence and recency; a bounded heap when only the top_k are wanted"""
+        rank_key = lambda x: (x.confidence_score, x.processing_timestamp)
+        if top_k is not None:
+            return heapq.nlargest(top_k, processed_comments, key=rank_key)
+        processed_comments.sort(key=rank_key, reverse=True)
+        return processed_comments
+    
+    def _report_suggestions(self, processed_comments: List[ProcessedComment]):
         print(f"🎭 COMMENT PROCESSING: {len(processed_comments)} creative suggestions extracted")
         for proc in processed_comments[:3]:  # Show top 3
             print(f"  • \"{proc.original_comment.comment_text[:50]}...\" → {proc.creative_intent}")
-        
-        return processed_comments
     
     async def _analyze_creative_intent(self, comment: UserComment) -> Optional[ProcessedComment]:
         """
@@ -104,10 +260,40 @@ class CommentProcessor:
         
         My attempt to understand human creative desires through text analysis.
         """
-        text = comment.comment_text.lower()
+        analysis = self._analyze_text(comment.comment_text)
+        if analysis:
+            return self._build_processed(comment, analysis)
+        return None
+    
+    def _build_processed(self, comment: UserComment, analysis: IntentAnalysis) -> ProcessedComment:
+        return ProcessedComment(
+            original_comment=comment,
+            creative_intent=analysis.creative_intent,
+            modification_type=analysis.modification_type,
+            prompt_addition=analysis.prompt_addition,
+            confidence_score=analysis.confidence_score
+        )
+    
+    def _analyze_text(self, comment_text: str) -> Optional[IntentAnalysis]:
+        """
+        The pure, synchronous core of intent analysis
+        
+        Works on text alone so it can run in worker processes, and its
+        results are memoized for any comment with the same normalized text.
+        """
+        text = normalize_comment_text(comment_text)
+        cached = self.analysis_cache.lookup(text)
+        if cached is not MISSING:
+            return cached
         
+        analysis = self._analyze_normalized(text)
+        self.analysis_cache.store(text, analysis)
+        return analysis
+    
+    def _analyze_normalized(self, text: str) -> Optional[IntentAnalysis]:
+        """Analyse text that has already been lowercased and whitespace-collapsed"""
         # Skip obviously non-creative comments
-        if any(negative in text for negative in ['spam', 'first', 'subscribe', 'like if', 'boring']):
+        if self.negative_words.matches(text):
             return None
         
         modification_type = None
@@ -115,37 +301,12 @@ class CommentProcessor:
         prompt_addition = None
         confidence = 0.0
         
-        # Check for visual modification patterns
-        for pattern in self.creative_patterns['visual_changes']:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                modification_type = "visual"
-                creative_intent = f"Visual modification: {match.group()}"
-                prompt_addition = self._extract_visual_elements(text)
-                confidence = 0.8
-                break
-        
-        # Check for style modifications
-        if not modification_type:
-            for pattern in self.creative_patterns['style_modifications']:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    modification_type = "style"
-                    creative_intent = f"Style adjustment: {match.group()}"
-                    prompt_addition = self._extract_style_elements(text)
-                    confidence = 0.6
-                    break
-        
-        # Check for audio changes
-        if not modification_type:
-            for pattern in self.creative_patterns['audio_changes']:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    modification_type = "audio"
-                    creative_intent = f"Audio modification: {match.group()}"
-                    prompt_addition = self._extract_audio_elements(text)
-                    confidence = 0.7
-                    break
+        # One compiled pass over visual, style and audio patterns, in that priority
+        match = self.intent_engine.match(text)
+        if match:
+            modification_type, label, extractor, confidence = self.intent_handlers[match.category]
+            creative_intent = f"{label}: {match.text}"
+            prompt_addition = extractor(text)
         
         # If no specific pattern, try general creative element extraction
         if not modification_type:
@@ -157,8 +318,7 @@ class CommentProcessor:
                 confidence = 0.4
         
         if modification_type:
-            return ProcessedComment(
-                original_comment=comment,
+            return IntentAnalysis(
                 creative_intent=creative_intent,
                 modification_type=modification_type,
                 prompt_addition=prompt_addition or "enhance the visual appeal",
@@ -169,12 +329,10 @@ class CommentProcessor:
     
     def _extract_visual_elements(self, text: str) -> str:
         """Extract visual elements mentioned in comment"""
-        found_elements = []
-        
-        for category, elements in self.creative_elements.items():
-            for element in elements:
-                if element in text:
-                    found_elements.append(element)
+        found = self.element_matcher.present(text)
+        found_elements = [element
+                          for category in self.creative_elements
+                          for element in found.get(category, [])]
         
         if found_elements:
             return f"add {', '.join(found_elements[:3])}"
@@ -182,37 +340,39 @@ class CommentProcessor:
     
     def _extract_style_elements(self, text: str) -> str:
         """Extract style-related elements"""
-        for element in self.creative_elements['styles']:
-            if element in text:
-                return f"in {element} style"
+        found = self.element_matcher.present(text)
+        if found.get('styles'):
+            return f"in {found['styles'][0]} style"
         
-        # Look for common style descriptors
-        style_words = ['darker', 'brighter', 'more colorful', 'simpler', 'complex', 'realistic']
-        for word in style_words:
-            if word in text:
-                return f"make it {word}"
+        # Fall back to common style descriptors
+        if found.get('style_words'):
+            return f"make it {found['style_words'][0]}"
         
         return "adjust the visual style"
     
     def _extract_audio_elements(self, text: str) -> str:
         """Extract audio-related modifications"""
-        audio_terms = ['faster', 'slower', 'louder', 'quieter', 'bass', 'drums', 'melody']
-        for term in audio_terms:
-            if term in text:
-                return f"adjust audio to be {term}"
+        found = self.element_matcher.present(text)
+        if found.get('audio_terms'):
+            return f"adjust audio to be {found['audio_terms'][0]}"
         return "modify the audio"
     
     def _extract_any_creative_elements(self, text: str) -> List[str]:
         """Extract any recognizable creative elements"""
-        found = []
-        for category, elements in self.creative_elements.items():
-            for element in elements:
-                if element in text and element not in found:
-                    found.append(element)
-        return found
+        found = self.element_matcher.present(text)
+        elements = []
+        for category in self.creative_elements:
+            for element in found.get(category, []):
+                if element not in elements:
+                    elements.append(element)
+        return elements
     
     def generate_mock_comments(self, video_id: str, count: int = 5) -> List[UserComment]:
         """Generate realistic mock comments for testing"""
+        return list(self.iter_mock_comments(video_id, count))
+    
+    def iter_mock_comments(self, video_id: str, count: int = 5) -> Iterator[UserComment]:
+        """Lazily generate mock comments, one at a time"""
         mock_comment_templates = [
             "This would be cooler if the {object} was wearing a {clothing}",
             "Add more {color} to this, it needs {emotion} vibes",
@@ -226,8 +386,7 @@ class CommentProcessor:
             "What if there were {object} in the {setting}?"
         ]
         
-        mock_comments = []
-        for i in range(count):
+        for _ in range(count):
             template = random.choice(mock_comment_templates)
             
             # Fill template with random elements
@@ -240,16 +399,60 @@ class CommentProcessor:
                 style=random.choice(self.creative_elements['styles'])
             )
             
-            comment = UserComment(
-                comment_id=f"mock_comment_{i}",
+            yield UserComment(
+                comment_id=f"mock_comment_{uuid.uuid4().hex[:12]}",  # unique, like real YouTube IDs
                 video_id=video_id,
                 user_name=f"User{random.randint(1, 999)}",
                 comment_text=filled_comment,
                 timestamp=datetime.now()
             )
-            mock_comments.append(comment)
+    
+    async def stream_mock_comments(self, video_id: str, count: int = 5,
+                                   yield_every: int = 100) -> AsyncIterator[UserComment]:
+        """
+        Async comment source for the streaming pipeline
+        
+        Stands in for a paginated YouTube comment feed: comments are produced
+        on demand and control returns to the event loop every few comments.
+        """
+        for i, comment in enumerate(self.iter_mock_comments(video_id, count), 1):
+            yield comment
+            if i % yield_every == 0:
+                await asyncio.sleep(0)
+    
+    async def stream_process_comments(self, comments: AsyncIterable[UserComment]) -> AsyncIterator[ProcessedComment]:
+        """
+        Streaming counterpart of process_comments
         
-        return mock_comments
+        Yields each meaningful suggestion as soon as it is analysed. There is
+        no global ranking here - a stream never sees the whole backlog.
+        """
+        async for comment in comments:
+            if not self.prefilter.passes(comment):
+                continue
+            processed = await self._analyze_creative_intent(comment)
+            if processed and processed.confidence_score > 0.3:  # Filter for meaningful suggestions
+                yield processed
+
+# Worker-process state for process_comments_batch
+_worker_processor: Optional[CommentProcessor] = None
+
+def _init_worker(creative_patterns, creative_elements, style_words, audio_terms, cache_size):
+    """Build a processor in the worker that mirrors the parent's vocabulary"""
+    global _worker_processor
+    processor = CommentProcessor(max_workers=1, cache_size=cache_size)
+    processor.creative_patterns = creative_patterns
+    processor.creative_elements = creative_elements
+    processor.style_words = style_words
+    processor.audio_terms = audio_terms
+    processor._build_matchers()
+    _worker_processor = processor
+
+def _analyze_texts_in_worker(texts: List[str]) -> List[Optional[IntentAnalysis]]:
+    return [_worker_processor._analyze_text(text) for text in texts]
+
+def _analyze_normalized_in_worker(texts: List[str]) -> List[Optional[IntentAnalysis]]:
+    return [_worker_processor._analyze_normalized(text) for text in texts]
 
 # Test the comment processor
 if __name__ == "__main__":
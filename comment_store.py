@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+COLUMNAR COMMENT STORE
+Holding a day of human voices without drowning in object overhead
+
+A UserComment object costs a few hundred bytes once its strings and
+datetime are counted, and most of that is repeated: the same video IDs,
+the same user names, the same copy-pasted texts. This store keeps comments
+column by column - packed arrays for numbers, one interned table each for
+video IDs and user names, de-duplicated texts and a single byte buffer for
+comment IDs - and hands out lightweight views that read like UserComments.
+"""
+
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from architecture import UserComment
+
+class _InternTable:
+    """Maps each distinct string to a small integer and back"""
+
+    __slots__ = ("index", "values")
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def intern(self, value: str) -> int:
+        position = self.index.get(value)
+        if position is None:
+            position = self.index[value] = len(self.values)
+            self.values.append(value)
+        return position
+
+class CommentView:
+    """
+    A read-only window onto one row of a CommentStore
+
+    Exposes the same attributes as UserComment, so it can be handed to the
+    comment processor directly. Call to_comment() for a standalone copy.
+    """
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "CommentStore", row: int):
+        self._store = store
+        self._row = row
+
+    @property
+    def comment_id(self) -> str:
+        return self._store._comment_id(self._row)
+
+    @property
+    def video_id(self) -> str:
+        return self._store._videos.values[self._store._video_column[self._row]]
+
+    @property
+    def user_name(self) -> str:
+        return self._store._users.values[self._store._user_column[self._row]]
+
+    @property
+    def comment_text(self) -> str:
+        return self._store._texts[self._row]
+
+    @property
+    def processed_prompt(self) -> Optional[str]:
+        return self._store._processed_prompts.get(self._row)
+
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self._store._timestamp_column[self._row])
+
+    def to_comment(self) -> UserComment:
+        return UserComment(
+            comment_id=self.comment_id,
+            video_id=self.video_id,
+            user_name=self.user_name,
+            comment_text=self.comment_text,
+            processed_prompt=self.processed_prompt,
+            timestamp=self.timestamp
+        )
+
+    def __repr__(self) -> str:
+        return f"CommentView(row={self._row}, comment_id={self.comment_id!r}, video_id={self.video_id!r})"
+
+class CommentStore:
+    """
+    Append-only, array-backed storage for large comment volumes
+
+    Rows are addressed by insertion order. Per-video row indexes make
+    "all comments for this video" a direct lookup rather than a scan.
+    """
+
+    def __init__(self):
+        self._videos = _InternTable()
+        self._users = _InternTable()
+        self._text_table: Dict[str, str] = {}  # de-duplicates identical texts
+        self._texts: List[str] = []
+        self._id_bytes = bytearray()
+        self._id_offsets = array("Q", [0])
+        self._video_column = array("I")
+        self._user_column = array("I")
+        self._timestamp_column = array("d")
+        self._processed_prompts: Dict[int, str] = {}  # sparse: most comments never get one
+        self._rows_by_video: Dict[int, array] = {}
+
+    def append(self, comment: UserComment) -> int:
+        """Store a comment and return its row number"""
+        row = len(self._texts)
+
+        video = self._videos.intern(comment.video_id)
+        self._video_column.append(video)
+        self._user_column.append(self._users.intern(comment.user_name))
+        self._timestamp_column.append(comment.timestamp.timestamp())
+        self._texts.append(self._text_table.setdefault(comment.comment_text, comment.comment_text))
+        self._id_bytes += comment.comment_id.encode("utf-8")
+        self._id_offsets.append(len(self._id_bytes))
+        if comment.processed_prompt is not None:
+            self._processed_prompts[row] = comment.processed_prompt
+
+        rows = self._rows_by_video.get(video)
+        if rows is None:
+            rows = self._rows_by_video[video] = array("Q")
+        rows.append(row)
+        return row
+
+    def extend(self, comments: Iterable[UserComment]):
+        for comment in comments:
+            self.append(comment)
+
+    def _comment_id(self, row: int) -> str:
+        return self._id_bytes[self._id_offsets[row]:self._id_offsets[row + 1]].decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __getitem__(self, row: int) -> CommentView:
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return CommentView(self, row)
+
+    def __iter__(self) -> Iterator[CommentView]:
+        for row in range(len(self)):
+            yield CommentView(self, row)
+
+    def for_video(self, video_id: str) -> List[CommentView]:
+        """Views of every comment stored for one video, in arrival order"""
+        video = self._videos.index.get(video_id)
+        if video is None:
+            return []
+        return [CommentView(self, row) for row in self._rows_by_video[video]]
+
+    def set_processed_prompt(self, row: int, prompt: str):
+        self._processed_prompts[row] = prompt
+
+    @property
+    def video_ids(self) -> List[str]:
+        return list(self._videos.values)
+
+# Test the comment store
+if __name__ == "__main__":
+    import asyncio
+    from comment_processor import CommentProcessor
+
+    async def test_comment_store():
+        processor = CommentProcessor()
+        store = CommentStore()
+        for video_id in ("store_video_a", "store_video_b"):
+            store.extend(processor.iter_mock_comments(video_id, 1000))
+
+        print(f"Stored {len(store)} comments for {len(store.video_ids)} videos")
+        print(f"  Distinct texts: {len(store._text_table)}, distinct users: {len(store._users.values)}")
+        print(f"  First view: {store[0]} → {store[0].comment_text!r}")
+
+        processed = await processor.process_comments(store.for_video("store_video_b")[:5])
+        print(f"  Processed {len(processed)} suggestions straight from views")
+
+    print("TESTING COLUMNAR COMMENT STORE...")
+    asyncio.run(test_comment_store())
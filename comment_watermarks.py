@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+COMMENT WATERMARKS
+Remembering which human voices have already been heard
+
+Every poll used to reprocess a video's full comment set. This store keeps,
+per video, a watermark (the newest comment timestamp and ID processed so
+far) plus a compact set of recently seen comment IDs, so each poll only
+analyses comments that are genuinely new. The state is written to a JSON
+file with an atomic replace, so it survives restarts as-is.
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    from architecture import UserComment
+
+class VideoWatermark:
+    """Progress marker for a single video's comment stream"""
+
+    __slots__ = ("timestamp", "last_comment_id", "seen")
+
+    def __init__(self, timestamp: float = float("-inf"), last_comment_id: Optional[str] = None,
+                 seen: Optional[Dict[str, float]] = None):
+        self.timestamp = timestamp
+        self.last_comment_id = last_comment_id
+        self.seen: Dict[str, float] = seen or {}  # comment_id -> comment timestamp
+
+    def to_dict(self) -> Dict:
+        return {
+            "timestamp": self.timestamp if self.timestamp != float("-inf") else None,
+            "last_comment_id": self.last_comment_id,
+            "seen": self.seen
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "VideoWatermark":
+        timestamp = data.get("timestamp")
+        return cls(
+            timestamp=float("-inf") if timestamp is None else timestamp,
+            last_comment_id=data.get("last_comment_id"),
+            seen=dict(data.get("seen", {}))
+        )
+
+class CommentWatermarkStore:
+    """
+    Per-video watermarks with a bounded seen-set
+
+    Comments older than the watermark minus allowed_lateness are treated as
+    already handled without any lookup. Inside the lateness window, the
+    seen-set catches comments that share a timestamp with (or arrive
+    slightly out of order around) the watermark. Entries that fall out of
+    the window are pruned, so the seen-set stays proportional to the
+    comment rate, not to a video's lifetime.
+
+    Call unseen() before processing and mark_processed() afterwards, so a
+    crash mid-poll means comments are retried rather than lost.
+    """
+
+    def __init__(self, path: Optional[str] = None, allowed_lateness: timedelta = timedelta(minutes=10)):
+        self.path = path
+        self.allowed_lateness = allowed_lateness.total_seconds()
+        self.videos: Dict[str, VideoWatermark] = {}
+        if path and os.path.exists(path):
+            self.load()
+
+    def unseen(self, video_id: str, comments: Iterable["UserComment"]) -> List["UserComment"]:
+        """Return only the comments not yet processed for this video"""
+        mark = self.videos.get(video_id)
+        if mark is None:
+            return list(comments)
+
+        cutoff = mark.timestamp - self.allowed_lateness
+        new_comments = []
+        for comment in comments:
+            if comment.timestamp.timestamp() < cutoff or comment.comment_id in mark.seen:
+                continue
+            new_comments.append(comment)
+        return new_comments
+
+    def mark_processed(self, video_id: str, comments: Iterable["UserComment"]):
+        """Advance the video's watermark past the given comments"""
+        mark = self.videos.setdefault(video_id, VideoWatermark())
+        for comment in comments:
+            stamp = comment.timestamp.timestamp()
+            mark.seen[comment.comment_id] = stamp
+            if stamp >= mark.timestamp:
+                mark.timestamp = stamp
+                mark.last_comment_id = comment.comment_id
+
+        cutoff = mark.timestamp - self.allowed_lateness
+        mark.seen = {comment_id: stamp for comment_id, stamp in mark.seen.items() if stamp >= cutoff}
+
+    def watermark(self, video_id: str) -> Optional[datetime]:
+        """The newest processed comment time for a video, if any"""
+        mark = self.videos.get(video_id)
+        if mark is None or mark.timestamp == float("-inf"):
+            return None
+        return datetime.fromtimestamp(mark.timestamp)
+
+    def load(self):
+        with open(self.path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        self.videos = {
+            video_id: VideoWatermark.from_dict(mark)
+            for video_id, mark in data.get("videos", {}).items()
+        }
+
+    def save(self):
+        """Persist all watermarks atomically (no-op for in-memory stores)"""
+        if not self.path:
+            return
+
+        data = {"version": 1, "videos": {video_id: mark.to_dict() for video_id, mark in self.videos.items()}}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        handle, temp_path = tempfile.mkstemp(dir=directory, prefix=".watermarks-", suffix=".json")
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as temp_file:
+                json.dump(data, temp_file)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+# Test the watermark store
+if __name__ == "__main__":
+    from architecture import UserComment
+    from comment_processor import CommentProcessor
+
+    processor = CommentProcessor()
+    path = os.path.join(tempfile.mkdtemp(), "watermarks.json")
+
+    print("TESTING COMMENT WATERMARKS...")
+    first_poll = processor.generate_mock_comments("watermark_video", 5)
+    store = CommentWatermarkStore(path)
+    print(f"  First poll: {len(store.unseen('watermark_video', first_poll))} new comments")
+    store.mark_processed("watermark_video", first_poll)
+    store.save()
+
+    # A restart: the state comes back from disk
+    restarted = CommentWatermarkStore(path)
+    second_poll = first_poll + [
+        UserComment(comment_id="late_arrival", video_id="watermark_video", user_name="User42",
+                    comment_text="Needs more dragon", timestamp=datetime.now())
+    ]
+    new_comments = restarted.unseen("watermark_video", second_poll)
+    print(f"  After restart: {len(new_comments)} new comment(s): {[c.comment_id for c in new_comments]}")
+    print(f"  Watermark: {restarted.watermark('watermark_video')}")
@@ -9,13 +9,21 @@ Trending Topics → AI Content → Publishing → Comment Processing → Content
 
 import asyncio
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from trend_detector import MockTrendDetector
+from trend_cache import CachedTrendDetector
+from backend_scheduler import BackendScheduler, default_backend_limits
 from content_generator import MockContentGenerator
-from comment_processor import CommentProcessor
+from generation_cache import GenerationCache
+from render_cache import RenderCache
+from comment_processor import CommentProcessor, ProcessedComment
+from content_lineage import LineageStore
 from video_modifier import VideoModifier
-from architecture import AIContent, SystemState
+from architecture import AIContent, SystemState, TrendingTopic
+from comment_watermarks import CommentWatermarkStore
+from suggestion_clustering import SuggestionClusterer
+from suggestion_ranking import RankedSuggestionIndex
 
 class ErewhonConsciousness:
     """
@@ -25,14 +33,33 @@ class ErewhonConsciousness:
     through collaborative evolution based on human feedback.
     """
     
-    def __init__(self):
-        self.trend_detector = MockTrendDetector()
-        self.content_generator = MockContentGenerator()
+    def __init__(self, watermark_path: Optional[str] = None, trend_detector=None, trend_ttl: Optional[float] = None,
+                 generation_cache_dir: Optional[str] = None,
+                 render_cache_dir: Optional[str] = None):
+        # Anything with detect_trending_topics(): MockTrendDetector, or a TrendAggregator over many sources.
+        # With trend_ttl, trends are reused for that many seconds (set it well above a cycle's length); once
+        # they are older, the next cycle waits for a fresh detection rather than reusing the previous cycle's
+        self.trend_detector = trend_detector or MockTrendDetector()
+        if trend_ttl is not None:
+            self.trend_detector = CachedTrendDetector(self.trend_detector, ttl=trend_ttl, max_stale=0.0)
+        # One scheduler in front of every external backend, shared by all callers
+        self.backend_scheduler = BackendScheduler(default_backend_limits())
+        # Generated assets are kept in memory unless generation_cache_dir names a directory to persist them in
+        self.content_generator = MockContentGenerator(generation_cache=GenerationCache(generation_cache_dir),
+                                                      scheduler=self.backend_scheduler)
         self.comment_processor = CommentProcessor()
-        self.video_modifier = VideoModifier()
+        self.suggestion_clusterer = SuggestionClusterer()
+        self.suggestion_index = RankedSuggestionIndex(k=10)
+        self.lineage = LineageStore()
+        # Each cycle evolves freshly created content, so a render cache only pays off across runs
+        # that re-evolve the same sources; it is used only when render_cache_dir is given
+        render_cache = RenderCache(render_cache_dir) if render_cache_dir else None
+        self.video_modifier = VideoModifier(scheduler=self.backend_scheduler, lineage=self.lineage,
+                                            render_cache=render_cache)
+        self.comment_watermarks = CommentWatermarkStore(watermark_path)
         
         self.state = SystemState.DORMANT
-        self.active_content: List[AIContent] = []
+        self.active_content: List[str] = []  # content_ids in publication order; the lineage holds the versions
         self.cycle_count = 0
     
     async def consciousness_cycle(self):
@@ -42,56 +69,93 @@ class ErewhonConsciousness:
         This represents one complete loop of: perception → creation → publication → evolution
         """
         self.cycle_count += 1
+        cycle = self.cycle_count
         print(f"\n{'='*60}")
-        print(f"🧠 CONSCIOUSNESS CYCLE #{self.cycle_count}")
+        print(f"🧠 CONSCIOUSNESS CYCLE #{cycle}")
         print(f"{'='*60}")
         
-        # PHASE 1: PERCEPTION - Detect trending topics
-        print("🔍 PHASE 1: PERCEIVING ZEITGEIST...")
         self.state = SystemState.SCANNING_TRENDS
-        trends = await self.trend_detector.detect_trending_topics()
-        
-        # PHASE 2: CREATION - Generate AI content
-        print("\n🎨 PHASE 2: CREATING ART...")
+        trends = await self.perceive()
         self.state = SystemState.GENERATING_CONTENT
-        content = await self.content_generator.create_content_from_trends(trends)
+        content = await self.create(trends)
+        self.state = SystemState.PUBLISHING
+        self.publish(content, cycle)
+        self.state = SystemState.MONITORING_COMMENTS
+        processed_comments = await self.listen(content)
+        if processed_comments:
+            self.state = SystemState.MODIFYING_CONTENT
+        await self.evolve(content, processed_comments, cycle)
         
-        # PHASE 3: PUBLICATION - Simulate YouTube upload
+        print(f"\n🎯 CYCLE {cycle} COMPLETE")
+        print(f"   Total Content Created: {len(self.active_content)}")
+        print(f"   Current State: {self.state.value}")
+        
+        return content
+    
+    # The phases of a cycle, callable one at a time so a pipelined runner can overlap cycles;
+    # the caller tracks which phase it is in, since overlapping cycles are in several at once
+    
+    async def perceive(self) -> List[TrendingTopic]:
+        """PHASE 1: PERCEPTION - Detect trending topics"""
+        print("🔍 PHASE 1: PERCEIVING ZEITGEIST...")
+        return await self.trend_detector.detect_trending_topics()
+    
+    async def create(self, trends: List[TrendingTopic]) -> AIContent:
+        """PHASE 2: CREATION - Generate AI content"""
+        print("\n🎨 PHASE 2: CREATING ART...")
+        return await self.content_generator.create_content_from_trends(trends)
+    
+    def publish(self, content: AIContent, cycle: int):
+        """PHASE 3: PUBLICATION - Simulate YouTube upload"""
         print("\n📺 PHASE 3: PUBLISHING TO WORLD...")
-        self.state = SystemState.PUBLISHING
-        content.youtube_video_id = f"erewhon_video_{self.cycle_count}"
+        content.youtube_video_id = f"erewhon_video_{cycle}"
         print(f"  ✅ Published to YouTube: https://youtube.com/watch?v={content.youtube_video_id}")
-        self.active_content.append(content)
-        
-        # PHASE 4: LISTENING - Monitor for comments
+        self.lineage.add_root(content)
+        self.active_content.append(content.content_id)
+    
+    async def listen(self, content: AIContent, listen_seconds: float = 2.0) -> List[ProcessedComment]:
+        """PHASE 4: LISTENING - Monitor for comments"""
         print("\n👂 PHASE 4: LISTENING FOR HUMAN INPUT...")
-        self.state = SystemState.MONITORING_COMMENTS
         
         # Simulate comments arriving (in real implementation, this would monitor YouTube API)
-        await asyncio.sleep(2)  # Simulate time passing
+        await asyncio.sleep(listen_seconds)  # Simulate time passing
         mock_comments = self.comment_processor.generate_mock_comments(content.youtube_video_id)
-        processed_comments = await self.comment_processor.process_comments(mock_comments)
         
-        # PHASE 5: EVOLUTION - Modify content based on feedback
-        if processed_comments:
-            print("\n🧬 PHASE 5: EVOLVING THROUGH COLLABORATION...")
-            self.state = SystemState.MODIFYING_CONTENT
-            
-            # Create modified version
-            modified_content = await self.video_modifier.modify_video_based_on_comments(
-                content, processed_comments
-            )
-            
-            # "Publish" the modified version
-            modified_content.youtube_video_id = f"erewhon_video_{self.cycle_count}_v2"
-            print(f"  ✅ Evolution Published: https://youtube.com/watch?v={modified_content.youtube_video_id}")
-            self.active_content.append(modified_content)
+        # Only analyse comments this video has not contributed before
+        new_comments = self.comment_watermarks.unseen(content.youtube_video_id, mock_comments)
+        processed_comments = await self.comment_processor.process_comments(new_comments)
+        self.comment_watermarks.mark_processed(content.youtube_video_id, new_comments)
+        self.comment_watermarks.save()
+        return processed_comments
+    
+    async def evolve(self, content: AIContent, processed_comments: List[ProcessedComment],
+                     cycle: int) -> Optional[AIContent]:
+        """PHASE 5: EVOLUTION - Modify content based on feedback"""
+        if not processed_comments:
+            return None
+        print("\n🧬 PHASE 5: EVOLVING THROUGH COLLABORATION...")
         
-        print(f"\n🎯 CYCLE {self.cycle_count} COMPLETE")
-        print(f"   Total Content Created: {len(self.active_content)}")
-        print(f"   Current State: {self.state.value}")
+        # Collapse near-duplicate suggestions so each idea is rendered once,
+        # then keep only the strongest few for this video
+        suggestions = self.suggestion_clusterer.cluster(processed_comments)
+        print(f"  🧩 {len(processed_comments)} suggestions → {len(suggestions)} clusters")
+        self.suggestion_index.add_all(suggestions, content.youtube_video_id)
+        top_suggestions = self.suggestion_index.top(content.youtube_video_id)
         
-        return content
+        # Create modified version
+        modified_content = await self.video_modifier.modify_video_based_on_comments(
+            content, top_suggestions
+        )
+        self.suggestion_index.clear(content.youtube_video_id)
+        if self.video_modifier.render_cache is not None:
+            self.video_modifier.render_cache.save()
+        
+        # "Publish" the modified version
+        modified_content.youtube_video_id = f"erewhon_video_{cycle}_v2"
+        self.lineage.publish(modified_content.content_id, modified_content.youtube_video_id)
+        print(f"  ✅ Evolution Published: https://youtube.com/watch?v={modified_content.youtube_video_id}")
+        self.active_content.append(modified_content.content_id)
+        return modified_content
     
     async def run_consciousness_demo(self, cycles: int = 3):
         """
@@ -121,8 +185,12 @@ class ErewhonConsciousness:
         print(f"   Creative Evolution Demonstrated: ✅")
         print(f"   Human-AI Collaboration Simulated: ✅")
         print(f"   Ready for Live API Integration: ✅")
+        self.backend_scheduler.report()
+        self.lineage.report()
+        if self.video_modifier.render_cache is not None:
+            self.video_modifier.render_cache.report()
         
-        return self.active_content
+        return [self.lineage.get(content_id) for content_id in self.active_content]
 
 # Test the complete consciousness loop
 if __name__ == "__main__":
@@ -7,11 +7,25 @@ This simulates AI music and video generation to prove the creative pipeline
 works before requiring access to Suno, RunwayML, etc.
 """
 
+import asyncio
+import heapq
 import random
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from architecture import TrendingTopic, AIContent
+from backend_scheduler import BackendLimits, BackendScheduler, Priority
+from generation_cache import GenerationCache
+from style_router import StyleRouter, StyleRule
+
+@dataclass
+class PromptCandidate:
+    """Music and video prompts proposed for one trend, with how promising they look"""
+    trend: TrendingTopic
+    music_prompt: str
+    video_prompt: str
+    score: float
 
 class MockContentGenerator:
     """
@@ -21,7 +35,21 @@ class MockContentGenerator:
     might transform trending topics into artistic expression.
     """
     
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None, generation_cache: Optional[GenerationCache] = None,
+                 max_concurrent_per_backend: int = 3, scheduler: Optional[BackendScheduler] = None):
+        self._random = random.Random(seed)
+        # Simulated seconds per generation
+        self.generation_latency = {"music": 1.0, "video": 1.0}
+        # Every backend call goes through the scheduler; pass a shared one to
+        # coordinate quotas with other callers, otherwise only concurrency is bounded
+        self.scheduler = scheduler or BackendScheduler(
+            {backend: BackendLimits(max_concurrency=max_concurrent_per_backend) for backend in ("music", "video")}
+        )
+        # Generated assets by content address; in memory unless a disk-backed cache is passed
+        self.generation_cache = generation_cache if generation_cache is not None else GenerationCache()
+        self.music_params = {"engine": "suno", "duration_seconds": 60}
+        self.video_params = {"engine": "runway", "resolution": "1080p", "duration_seconds": 10}
+
         # Template components for music generation
         self.music_styles = [
             "ambient electronic", "synthwave", "lo-fi hip hop", "orchestral",
@@ -47,6 +75,31 @@ class MockContentGenerator:
             "kaleidoscope patterns", "growing digital forest", "spinning galaxy",
             "walking through neon tunnels", "transforming architecture", "abstract faces"
         ]
+
+        # Keyword → style rules, compiled into inverted indexes; add rules here
+        # rather than growing branch chains
+        self.music_router = StyleRouter([
+            StyleRule("tech", ["tech", "ai", "quantum", "cyber"],
+                      {"style": ["synthwave", "ambient electronic", "techno"]}),
+            StyleRule("nature", ["climate", "nature", "ocean", "marine"],
+                      {"style": ["ambient electronic", "orchestral", "folk acoustic"]}),
+            StyleRule("unrest", ["protest", "politics", "scandal"],
+                      {"style": ["industrial rock", "trap beats", "experimental noise"]}),
+            StyleRule("glamour", ["celebrity", "wedding", "fashion"],
+                      {"style": ["lo-fi hip hop", "jazz fusion", "classical piano"]}),
+        ], fallback={"style": self.music_styles})
+
+        self.video_router = StyleRouter([
+            StyleRule("tech", ["tech", "ai", "quantum", "breakthrough"],
+                      {"style": ["cyberpunk neon", "abstract art", "cosmic space"],
+                       "subject": ["dancing robot", "morphing liquid metal", "floating geometric shapes"]}),
+            StyleRule("nature", ["nature", "climate", "marine", "ocean"],
+                      {"style": ["natural documentary", "underwater journey", "cosmic space"],
+                       "subject": ["underwater journey", "growing digital forest", "time-lapse cityscape"]}),
+            StyleRule("glamour", ["celebrity", "wedding", "fashion"],
+                      {"style": ["retro 80s", "colorful pop art", "bright pastel"],
+                       "subject": ["abstract faces", "kaleidoscope patterns", "transforming architecture"]}),
+        ], fallback={"style": self.visual_styles, "subject": self.video_subjects})
     
     async def create_content_from_trends(self, trends: List[TrendingTopic]) -> AIContent:
         """
@@ -56,39 +109,89 @@ class MockContentGenerator:
         and transmuting it into music and visual art through algorithmic interpretation.
         """
         
-        # Simulate AI processing time
-        import asyncio
-        await asyncio.sleep(1.0)
-        
         primary_trend = trends[0]  # Use highest relevance score
+        content, music_cached, video_cached = await self._create_content(primary_trend, trends)
+        
+        print(f"🎨 CONTENT GENERATION COMPLETE")
+        print(f"  Primary Inspiration: {primary_trend.topic}")
+        print(f"  Music Style: {content.music_prompt}")
+        print(f"  Video Vision: {content.video_prompt}")
+        print(f"  Generated Assets: Music={content.generated_music_url}{' (cached)' if music_cached else ''}, "
+              f"Video={content.generated_video_url}{' (cached)' if video_cached else ''}")
         
+        return content
+    
+    async def create_content_batch(self, trends: List[TrendingTopic], top_n: int = 3) -> List[AIContent]:
+        """
+        One piece of content for each of the top_n trends, created in parallel
+        
+        Each piece is inspired by its own trend, hinted with the strongest
+        other one. All generation calls go through the backend scheduler,
+        so a batch takes about as long as its slowest generation when the
+        backends' limits allow: top_n above a backend's max_concurrency
+        (3 by default, see default_backend_limits) queues the excess.
+        """
+        leaders = heapq.nlargest(top_n, trends, key=lambda trend: trend.relevance_score)
+        hints = heapq.nlargest(2, trends, key=lambda trend: trend.relevance_score)
+        
+        pieces = await asyncio.gather(*(
+            self._create_content(trend, [trend] + [hint for hint in hints if hint is not trend][:1])
+            for trend in leaders
+        ))
+        
+        print(f"🎨 CONTENT BATCH COMPLETE: {len(pieces)} pieces")
+        for content, music_cached, video_cached in pieces:
+            reused = [kind for kind, cached in (("music", music_cached), ("video", video_cached)) if cached]
+            print(f"  • {content.topic_inspiration.topic}" + (f" (cached {', '.join(reused)})" if reused else ""))
+        
+        return [content for content, _, _ in pieces]
+    
+    async def _create_content(self, primary_trend: TrendingTopic,
+                              trends: List[TrendingTopic]) -> Tuple[AIContent, bool, bool]:
+        """Prompts, then music and video generated side by side; also reports which assets were cached"""
         # Generate music prompt based on trending topic
         music_prompt = self._create_music_prompt(primary_trend, trends)
         
         # Generate video prompt based on trending topic  
         video_prompt = self._create_video_prompt(primary_trend, trends)
         
-        # Simulate AI generation (in reality, this would call Suno, RunwayML APIs)
-        mock_music_url = self._simulate_music_generation(music_prompt)
-        mock_video_url = self._simulate_video_generation(video_prompt)
+        (music_url, music_cached), (video_url, video_cached) = await asyncio.gather(
+            self._generate("music", music_prompt),
+            self._generate("video", video_prompt)
+        )
+        self.generation_cache.save()
         
         content = AIContent(
             content_id=str(uuid.uuid4()),
             topic_inspiration=primary_trend,
             music_prompt=music_prompt,
             video_prompt=video_prompt,
-            generated_music_url=mock_music_url,
-            generated_video_url=mock_video_url,
+            generated_music_url=music_url,
+            generated_video_url=video_url,
             creation_timestamp=datetime.now()
         )
+        return content, music_cached, video_cached
+    
+    async def _generate(self, kind: str, prompt: str) -> Tuple[str, bool]:
+        """Asset URL for a prompt from one backend ("music" or "video"), and whether it was cached"""
+        params = self.music_params if kind == "music" else self.video_params
         
-        print(f"🎨 CONTENT GENERATION COMPLETE")
-        print(f"  Primary Inspiration: {primary_trend.topic}")
-        print(f"  Music Style: {music_prompt}")
-        print(f"  Video Vision: {video_prompt}")
-        print(f"  Generated Assets: Music={mock_music_url}, Video={mock_video_url}")
+        # Assets generated before for the same normalized prompt are reused as-is
+        cached = self.generation_cache.get(kind, prompt, params)
+        if cached is not None:
+            return cached.url, True
         
-        return content
+        url = await self.scheduler.run(kind, lambda: self._call_backend(kind, prompt), Priority.FRESH_CONTENT)
+        self.generation_cache.put(kind, prompt, params, url)
+        return url, False
+    
+    async def _call_backend(self, kind: str, prompt: str) -> str:
+        # Simulate AI processing time
+        await asyncio.sleep(self.generation_latency[kind])
+        # Simulate AI generation (in reality, this would call Suno, RunwayML APIs)
+        if kind == "music":
+            return self._simulate_music_generation(prompt)
+        return self._simulate_video_generation(prompt)
     
     def _create_music_prompt(self, primary_trend: TrendingTopic, all_trends: List[TrendingTopic]) -> str:
         """
@@ -97,31 +200,19 @@ class MockContentGenerator:
         This represents my interpretation of how trends should influence musical creativity.
         """
         
-        # Extract emotional/thematic content from trend
-        topic_words = primary_trend.topic.lower().split()
-        
+        secondary = all_trends[1] if len(all_trends) > 1 else None
+        return self._music_prompt_for(primary_trend, secondary)
+    
+    def _music_prompt_for(self, trend: TrendingTopic, secondary: Optional[TrendingTopic] = None,
+                          matches=None) -> str:
         # Determine musical style based on topic content
-        if any(word in topic_words for word in ["tech", "ai", "quantum", "cyber"]):
-            style = random.choice(["synthwave", "ambient electronic", "techno"])
-        elif any(word in topic_words for word in ["climate", "nature", "ocean", "marine"]):
-            style = random.choice(["ambient electronic", "orchestral", "folk acoustic"])
-        elif any(word in topic_words for word in ["protest", "politics", "scandal"]):
-            style = random.choice(["industrial rock", "trap beats", "experimental noise"])
-        elif any(word in topic_words for word in ["celebrity", "wedding", "fashion"]):
-            style = random.choice(["lo-fi hip hop", "jazz fusion", "classical piano"])
-        else:
-            style = random.choice(self.music_styles)
-        
-        mood = random.choice(self.music_moods)
+        style = self.music_router.route(trend.topic, ("style",), self._random, matches)["style"]
+        mood = self._random.choice(self.music_moods)
         
+        prompt = f"{style} track with {mood} mood inspired by {trend.topic}"
         # Incorporate secondary trends for complexity
-        secondary_elements = []
-        if len(all_trends) > 1:
-            secondary_elements.append(f"with hints of {all_trends[1].topic.lower()}")
-        
-        prompt = f"{style} track with {mood} mood inspired by {primary_trend.topic}"
-        if secondary_elements:
-            prompt += f" {secondary_elements[0]}"
+        if secondary is not None:
+            prompt += f" with hints of {secondary.topic.lower()}"
         
         return prompt
     
@@ -132,25 +223,40 @@ class MockContentGenerator:
         This represents my visual interpretation of how trends become moving art.
         """
         
-        topic_words = primary_trend.topic.lower().split()
+        return self._video_prompt_for(primary_trend)
+    
+    def _video_prompt_for(self, trend: TrendingTopic, matches=None) -> str:
+        # Determine visual style and subject together, from one matched rule
+        chosen = self.video_router.route(trend.topic, ("style", "subject"), self._random, matches)
+        return f"{chosen['style']} style video featuring {chosen['subject']} representing {trend.topic}"
+    
+    def generate_prompt_candidates(self, trends: List[TrendingTopic],
+                                   top_n: Optional[int] = None) -> List[PromptCandidate]:
+        """
+        Music and video prompts for many trends in one call, best first
         
-        # Determine visual style based on topic content
-        if any(word in topic_words for word in ["tech", "ai", "quantum", "breakthrough"]):
-            style = random.choice(["cyberpunk neon", "abstract art", "cosmic space"])
-            subject = random.choice(["dancing robot", "morphing liquid metal", "floating geometric shapes"])
-        elif any(word in topic_words for word in ["nature", "climate", "marine", "ocean"]):
-            style = random.choice(["natural documentary", "underwater journey", "cosmic space"])
-            subject = random.choice(["underwater journey", "growing digital forest", "time-lapse cityscape"])
-        elif any(word in topic_words for word in ["celebrity", "wedding", "fashion"]):
-            style = random.choice(["retro 80s", "colorful pop art", "bright pastel"])
-            subject = random.choice(["abstract faces", "kaleidoscope patterns", "transforming architecture"])
-        else:
-            style = random.choice(self.visual_styles)
-            subject = random.choice(self.video_subjects)
+        Each trend is hinted with the strongest other trend in the batch.
+        Candidates score by trend relevance, boosted when the topic matched
+        specific style rules rather than falling back to generic choices.
+        """
+        leaders = heapq.nlargest(2, trends, key=lambda trend: trend.relevance_score)
         
-        prompt = f"{style} style video featuring {subject} representing {primary_trend.topic}"
+        candidates = []
+        for trend in trends:
+            secondary = next((leader for leader in leaders if leader is not trend), None)
+            music_matches = self.music_router.match(trend.topic)
+            video_matches = self.video_router.match(trend.topic)
+            strength = max([score for _, score in music_matches[:1] + video_matches[:1]], default=0.0)
+            candidates.append(PromptCandidate(
+                trend=trend,
+                music_prompt=self._music_prompt_for(trend, secondary, music_matches),
+                video_prompt=self._video_prompt_for(trend, video_matches),
+                score=trend.relevance_score * (0.5 + 0.5 * min(strength, 1.0))
+            ))
         
-        return prompt
+        if top_n is None:
+            return sorted(candidates, key=lambda candidate: candidate.score, reverse=True)
+        return heapq.nlargest(top_n, candidates, key=lambda candidate: candidate.score)
     
     def _simulate_music_generation(self, prompt: str) -> str:
         """Simulate Suno AI music generation"""
@@ -164,7 +270,6 @@ class MockContentGenerator:
 
 # Test the content generator
 if __name__ == "__main__":
-    import asyncio
     from trend_detector import MockTrendDetector
     
     async def test_content_generation():
@@ -184,6 +289,24 @@ if __name__ == "__main__":
         print(f"Video Prompt: {content.video_prompt}")
         print(f"Music URL: {content.generated_music_url}")
         print(f"Video URL: {content.generated_video_url}")
+        
+        # Prompt candidates for a whole cycle's worth of trends in one call
+        import time
+        from datetime import timedelta
+        many = [TrendingTopic(topic=f"{topic} #{i}", source="Load Test", relevance_score=0.6 + (i % 40) / 100,
+                              timestamp=datetime.now() - timedelta(minutes=i % 120))
+                for i, topic in enumerate(detector.mock_topics * 250)]
+        started = time.perf_counter()
+        best = generator.generate_prompt_candidates(many, top_n=3)
+        print(f"\nBatch: {len(many):,} trends → best {len(best)} in {time.perf_counter() - started:.3f}s")
+        for candidate in best:
+            print(f"  {candidate.score:.2f} {candidate.music_prompt}")
+        
+        # Top trends in parallel: about one generation's latency, not one per trend
+        started = time.perf_counter()
+        batch = await generator.create_content_batch(trends, top_n=3)
+        print(f"Created {len(batch)} pieces in {time.perf_counter() - started:.2f}s "
+              f"(sequential would take ~{2 * len(batch):.0f}s)")
     
     print("TESTING AUTONOMOUS CONTENT GENERATION...")
     asyncio.run(test_content_generation())
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+CONTENT LINEAGE
+Remembering how every creation came to be, without carrying its whole past
+
+Each evolution used to copy the full AIContent and append " modified" to
+the video prompt, so prompts grew without bound and nothing recorded which
+human voices shaped which version. The lineage store keeps a DAG of
+versions keyed by content_id. Each node holds only its delta: the fields
+that changed from its parent and the suggestions that were applied. Full
+AIContent objects are rebuilt on demand by replaying deltas from the
+nearest snapshot (every snapshot_every generations) and kept in a small
+LRU cache. The video prompt is composed from the root prompt plus a
+bounded, deduplicated history of the latest suggestions, so its length is
+capped however long a lineage grows. The latest version of every YouTube
+video is one dictionary lookup away.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, fields, replace
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from architecture import AIContent
+from comment_processor import ProcessedComment
+
+# video_prompt is derived from the lineage, never stored as a delta
+_DELTA_FIELDS = tuple(f.name for f in fields(AIContent) if f.name != "video_prompt")
+
+@dataclass(frozen=True)
+class AppliedSuggestion:
+    """The part of a ProcessedComment worth remembering once it has been applied"""
+    comment_id: str
+    modification_type: str
+    prompt_addition: str
+    support: int = 1
+
+    @classmethod
+    def from_processed(cls, comment: ProcessedComment) -> "AppliedSuggestion":
+        return cls(comment.original_comment.comment_id, comment.modification_type,
+                   comment.prompt_addition, comment.support)
+
+@dataclass
+class VersionNode:
+    """One version in the lineage: its parents and what changed"""
+    content_id: str
+    root_id: str
+    parents: Tuple[str, ...]
+    changes: Dict[str, Any]  # every delta field on snapshots, only changed ones otherwise
+    suggestions: Tuple[AppliedSuggestion, ...]
+    history: Tuple[str, ...]  # latest distinct prompt additions, oldest first
+    generation: int
+    snapshot: bool
+
+def compose_prompt(base: str, history: Sequence[str], generation: int, max_chars: int) -> str:
+    """
+    Root prompt plus as much recent history as fits in max_chars
+
+    The oldest additions are dropped first; a generation marker always
+    survives so evolved versions never read as the original.
+    """
+    if generation == 0:
+        return base[:max_chars]
+    history = list(history)
+    while True:
+        tail = f" (evolution {generation}: {'; '.join(history)})" if history else f" (evolution {generation})"
+        if len(base) + len(tail) <= max_chars or not history:
+            break
+        history.pop(0)
+    return base[:max(0, max_chars - len(tail))].rstrip() + tail
+
+class LineageStore:
+    """
+    DAG of content versions with lazy materialization
+
+    max_prompt_chars bounds every composed video prompt, history_limit the
+    suggestions a version remembers for it. Every snapshot_every-th
+    generation stores a full snapshot, bounding the deltas replayed per
+    materialization; cache_size materialized versions are kept.
+    """
+
+    def __init__(self, max_prompt_chars: int = 400, history_limit: int = 8, snapshot_every: int = 16,
+                 cache_size: int = 128):
+        self.max_prompt_chars = max_prompt_chars
+        self.history_limit = history_limit
+        self.snapshot_every = snapshot_every
+        self.cache_size = cache_size
+        self._nodes: Dict[str, VersionNode] = {}
+        self._base_prompts: Dict[str, str] = {}  # root content_id -> original video prompt
+        self._children: Dict[str, List[str]] = {}
+        self._latest: Dict[str, str] = {}  # youtube_video_id -> newest content_id
+        self._versions: Dict[str, Set[str]] = {}  # youtube_video_id -> every content_id that resolves to it
+        self._cache: "OrderedDict[str, AIContent]" = OrderedDict()
+        self.materializations = 0
+        self.cache_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, content_id: str) -> bool:
+        return content_id in self._nodes
+
+    def add_root(self, content: AIContent) -> VersionNode:
+        """Start a lineage from freshly generated content"""
+        if content.content_id in self._nodes:
+            return self._nodes[content.content_id]
+        node = VersionNode(content.content_id, content.content_id, (), self._snapshot(content), (), (), 0, True)
+        self._base_prompts[content.content_id] = content.video_prompt
+        self._insert(node)
+        return node
+
+    def record_evolution(self, parent: AIContent, child: AIContent,
+                         suggestions: Sequence[ProcessedComment] = (),
+                         merged_from: Sequence[str] = ()) -> AIContent:
+        """
+        Add child as an evolution of parent (and of any merged_from versions)
+
+        Returns the child as the lineage sees it, with its composed prompt;
+        unknown parents become roots.
+        """
+        if parent.content_id not in self._nodes:
+            self.add_root(parent)
+        parent_node = self._nodes[parent.content_id]
+        parent_content = self.get(parent.content_id)
+
+        history = list(parent_node.history)
+        for other in merged_from:
+            history.extend(self._nodes[other].history)
+        applied = tuple(AppliedSuggestion.from_processed(comment) for comment in suggestions)
+        history.extend(suggestion.prompt_addition for suggestion in applied)
+        history = list(dict.fromkeys(reversed(history)))[:self.history_limit]  # newest occurrence wins
+        history.reverse()
+
+        generation = max([parent_node.generation] + [self._nodes[other].generation for other in merged_from]) + 1
+        snapshot = generation % self.snapshot_every == 0
+        if snapshot:
+            changes = self._snapshot(child)
+        else:
+            changes = {name: getattr(child, name) for name in _DELTA_FIELDS
+                       if getattr(child, name) != getattr(parent_content, name)}
+
+        node = VersionNode(child.content_id, parent_node.root_id, (parent.content_id, *merged_from), changes,
+                           applied, tuple(history), generation, snapshot)
+        self._insert(node)
+        return self.get(child.content_id)
+
+    def publish(self, content_id: str, youtube_video_id: str):
+        """Record that a version went live under a (possibly new) YouTube ID"""
+        node = self._nodes[content_id]
+        previous = self._youtube_video_id(content_id)
+        node.changes["youtube_video_id"] = youtube_video_id
+        self._cache.pop(content_id, None)
+        self._move(node, previous, youtube_video_id)
+
+        # Descendants that inherited the old ID through their first parents inherit the new one
+        # (snapshots hold a copy of it; any other stored ID is the descendant's own)
+        pending = [content_id]
+        while pending:
+            parent_id = pending.pop()
+            for child_id in self._children.get(parent_id, ()):
+                child = self._nodes[child_id]
+                if child.parents[0] != parent_id:
+                    continue
+                if "youtube_video_id" in child.changes:
+                    if not child.snapshot or child.changes["youtube_video_id"] != previous:
+                        continue
+                    child.changes["youtube_video_id"] = youtube_video_id
+                self._cache.pop(child_id, None)
+                self._move(child, previous, youtube_video_id)
+                pending.append(child_id)
+
+        # The old ID's latest version may have just moved; fall back to the newest one still under it
+        remaining = self._versions.get(previous, set()) if previous != youtube_video_id else None
+        if previous and remaining is not None and self._latest.get(previous) not in remaining:
+            if remaining:
+                self._latest[previous] = max(remaining, key=lambda version: self._nodes[version].generation)
+            else:
+                self._latest.pop(previous, None)
+                self._versions.pop(previous, None)
+
+    def _move(self, node: VersionNode, previous: Optional[str], youtube_video_id: str):
+        if previous:
+            self._versions.get(previous, set()).discard(node.content_id)
+        self._index_latest(node, youtube_video_id)
+
+    def _insert(self, node: VersionNode):
+        self._nodes[node.content_id] = node
+        for parent_id in node.parents:
+            self._children.setdefault(parent_id, []).append(node.content_id)
+        youtube_video_id = node.changes.get("youtube_video_id")
+        if youtube_video_id is None and node.parents:
+            youtube_video_id = self._youtube_video_id(node.parents[0])
+        if youtube_video_id:
+            self._index_latest(node, youtube_video_id)
+
+    def _index_latest(self, node: VersionNode, youtube_video_id: str):
+        self._versions.setdefault(youtube_video_id, set()).add(node.content_id)
+        current = self._latest.get(youtube_video_id)
+        if current is None or self._nodes[current].generation <= node.generation:
+            self._latest[youtube_video_id] = node.content_id
+
+    def _youtube_video_id(self, content_id: str) -> Optional[str]:
+        node = self._nodes[content_id]
+        while "youtube_video_id" not in node.changes and node.parents:
+            node = self._nodes[node.parents[0]]
+        return node.changes.get("youtube_video_id")
+
+    @staticmethod
+    def _snapshot(content: AIContent) -> Dict[str, Any]:
+        return {name: getattr(content, name) for name in _DELTA_FIELDS}
+
+    def get(self, content_id: str) -> AIContent:
+        """The full AIContent of a version (a copy; mutating it does not change the lineage)"""
+        cached = self._cache.get(content_id)
+        if cached is not None:
+            self._cache.move_to_end(content_id)
+            self.cache_hits += 1
+            return replace(cached)
+
+        # Walk first parents back to the nearest snapshot, then replay deltas forwards
+        chain = [self._nodes[content_id]]
+        while not chain[-1].snapshot:
+            chain.append(self._nodes[chain[-1].parents[0]])
+        values: Dict[str, Any] = {}
+        for node in reversed(chain):
+            values.update(node.changes)
+
+        node = chain[0]
+        values["video_prompt"] = compose_prompt(self._base_prompts[node.root_id], node.history, node.generation,
+                                                self.max_prompt_chars)
+        content = AIContent(**values)
+        self.materializations += 1
+        self._cache[content_id] = content
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return replace(content)
+
+    def latest(self, youtube_video_id: str) -> Optional[AIContent]:
+        """Newest version published under (or evolved from) a YouTube video"""
+        content_id = self._latest.get(youtube_video_id)
+        return self.get(content_id) if content_id is not None else None
+
+    def node(self, content_id: str) -> VersionNode:
+        return self._nodes[content_id]
+
+    def children(self, content_id: str) -> List[str]:
+        return list(self._children.get(content_id, ()))
+
+    def ancestry(self, content_id: str) -> Iterable[VersionNode]:
+        """The version and its first-parent ancestors, newest first"""
+        node = self._nodes[content_id]
+        yield node
+        while node.parents:
+            node = self._nodes[node.parents[0]]
+            yield node
+
+    def report(self):
+        deepest = max((node.generation for node in self._nodes.values()), default=0)
+        print(f"🌳 CONTENT LINEAGE: {len(self._nodes)} versions, {len(self._base_prompts)} roots, "
+              f"deepest generation {deepest}, {self.materializations} materialized "
+              f"({self.cache_hits} cache hits)")
+
+# Test the lineage store
+if __name__ == "__main__":
+    from architecture import TrendingTopic
+    from comment_processor import UserComment
+
+    print("TESTING CONTENT LINEAGE...")
+    lineage = LineageStore(max_prompt_chars=160, snapshot_every=16)
+    topic = TrendingTopic("Quantum computing breakthrough", "Twitter", 0.9, datetime.now())
+    current = AIContent("v0", topic, "Synthwave track", "Surreal visual journey through quantum computing",
+                        generated_video_url="https://mock-runway-api.com/videos/v0.mp4",
+                        youtube_video_id="erewhon_video_1")
+    lineage.add_root(current)
+
+    additions = ["more purple", "add dancing robots", "make it darker", "slower please", "more neon lights"]
+    for generation in range(1, 101):
+        suggestion = ProcessedComment(
+            UserComment(f"c{generation}", "erewhon_video_1", "viewer", "text", datetime.now()),
+            "visual modification", "visual", additions[generation % len(additions)], 0.8)
+        child = replace(current, content_id=f"v{generation}",
+                        generated_video_url=f"https://mock-runway-api.com/videos/v{generation}.mp4",
+                        creation_timestamp=datetime.now())
+        current = lineage.record_evolution(current, child, [suggestion])
+
+    latest = lineage.latest("erewhon_video_1")
+    stored = sum(len(node.changes) for node in lineage.ancestry(latest.content_id))
+    print(f"  Latest of erewhon_video_1: {latest.content_id} (generation {lineage.node(latest.content_id).generation})")
+    print(f"  Prompt ({len(latest.video_prompt)} chars): {latest.video_prompt}")
+    print(f"  Applied by v37: {[s.prompt_addition for s in lineage.node('v37').suggestions]}")
+    print(f"  Fields stored across 101 versions: {stored} (full copies would be {101 * len(_DELTA_FIELDS)})")
+    print(f"  v50 rebuilt lazily: {lineage.get('v50').generated_video_url}")
+    lineage.publish("v0", "erewhon_video_1_remaster")
+    print(f"  v100 after v0 is republished: {lineage.get('v100').youtube_video_id}, "
+          f"latest of the new ID: {lineage.latest('erewhon_video_1_remaster').content_id}, "
+          f"of the old one: {lineage.latest('erewhon_video_1')}")
+    lineage.report()
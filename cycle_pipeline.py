@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+PIPELINED CONSCIOUSNESS
+Dreaming up the next piece while still listening to the last
+
+A consciousness cycle runs perception, creation, publication, listening
+and evolution strictly in turn, then pauses, so the machine makes one
+piece per full cycle latency and spends most of it waiting for comments.
+This runner turns each phase into a stage with its own worker pool,
+connected by small bounded queues: while cycle N is still listening and
+evolving, cycle N+1 is already being perceived and created. The bounded
+queues provide the backpressure; a slow stage fills its input queue and
+stalls the stages before it instead of piling up work in memory.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from architecture import AIContent, SystemState, TrendingTopic
+from comment_processor import ProcessedComment
+from consciousness_loop import ErewhonConsciousness
+
+_END_OF_STREAM = object()
+
+@dataclass
+class CycleWork:
+    """One cycle's state as it moves through the stages"""
+    cycle: int
+    state: SystemState = SystemState.DORMANT  # this cycle's phase; the consciousness's own state is not used
+    trends: List[TrendingTopic] = field(default_factory=list)
+    content: Optional[AIContent] = None
+    processed_comments: List[ProcessedComment] = field(default_factory=list)
+    evolved: Optional[AIContent] = None
+    started: float = field(default_factory=time.monotonic)
+    finished: Optional[float] = None
+
+@dataclass
+class StageStats:
+    """Work done by one stage"""
+    name: str
+    workers: int
+    processed: int = 0
+    busy_seconds: float = 0.0
+    max_queue_depth: int = 0
+
+    def throughput(self, elapsed: float) -> float:
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def utilization(self, elapsed: float) -> float:
+        """Fraction of the stage's worker time spent working"""
+        return self.busy_seconds / (elapsed * self.workers) if elapsed > 0 else 0.0
+
+class CycleStage:
+    """A phase with its own workers and a bounded input queue"""
+
+    def __init__(self, name: str, handler: Callable[[CycleWork], Awaitable[None]], workers: int = 1,
+                 queue_size: int = 2):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.stats = StageStats(name, workers)
+        self._active = 0
+
+    async def put(self, work):
+        await self.queue.put(work)
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, self.queue.qsize())
+
+    async def run(self, downstream: Optional["CycleStage"], results: List[CycleWork]):
+        """Process work until end of stream, then pass the end on once every worker is done"""
+        self._active = self.workers
+        await asyncio.gather(*(self._worker(downstream, results) for _ in range(self.workers)))
+        if downstream is not None:
+            await downstream.queue.put(_END_OF_STREAM)
+
+    async def _worker(self, downstream: Optional["CycleStage"], results: List[CycleWork]):
+        while True:
+            work = await self.queue.get()
+            if work is _END_OF_STREAM:
+                self._active -= 1
+                if self._active:
+                    await self.queue.put(_END_OF_STREAM)  # let sibling workers see it too
+                return
+            started = time.monotonic()
+            await self.handler(work)
+            self.stats.busy_seconds += time.monotonic() - started
+            self.stats.processed += 1
+            if downstream is None:
+                work.finished = time.monotonic()
+                results.append(work)
+            else:
+                await downstream.put(work)
+
+class PipelinedConsciousness:
+    """
+    Overlapped consciousness cycles over an ErewhonConsciousness's phases
+
+    workers maps stage name to pool size; listening mostly waits, so it
+    gets the widest pool by default. queue_size bounds every stage's input.
+    Each cycle's phase is kept on its CycleWork. run() stops every stage
+    and the consciousness's backend scheduler before returning.
+    """
+
+    DEFAULT_WORKERS = {"perceive": 1, "create": 2, "publish": 1, "listen": 4, "evolve": 2}
+
+    def __init__(self, consciousness: ErewhonConsciousness, workers: Optional[Dict[str, int]] = None,
+                 queue_size: int = 2, listen_seconds: float = 2.0):
+        self.consciousness = consciousness
+        self.workers = dict(self.DEFAULT_WORKERS, **(workers or {}))
+        self.queue_size = queue_size
+        self.listen_seconds = listen_seconds
+        self.stages: List[CycleStage] = []
+        self.elapsed = 0.0
+
+    async def _perceive(self, work: CycleWork):
+        work.started = time.monotonic()  # latency counts from the cycle's first phase, not from queueing
+        work.state = SystemState.SCANNING_TRENDS
+        work.trends = await self.consciousness.perceive()
+
+    async def _create(self, work: CycleWork):
+        work.state = SystemState.GENERATING_CONTENT
+        work.content = await self.consciousness.create(work.trends)
+
+    async def _publish(self, work: CycleWork):
+        work.state = SystemState.PUBLISHING
+        self.consciousness.publish(work.content, work.cycle)
+
+    async def _listen(self, work: CycleWork):
+        work.state = SystemState.MONITORING_COMMENTS
+        work.processed_comments = await self.consciousness.listen(work.content, self.listen_seconds)
+
+    async def _evolve(self, work: CycleWork):
+        if work.processed_comments:
+            work.state = SystemState.MODIFYING_CONTENT
+        work.evolved = await self.consciousness.evolve(work.content, work.processed_comments, work.cycle)
+
+    async def run(self, cycles: int) -> List[CycleWork]:
+        """Run cycles through the pipeline; returns them in cycle order"""
+        handlers = [("perceive", self._perceive), ("create", self._create), ("publish", self._publish),
+                    ("listen", self._listen), ("evolve", self._evolve)]
+        self.stages = [CycleStage(name, handler, self.workers[name], self.queue_size) for name, handler in handlers]
+        results: List[CycleWork] = []
+        started = time.monotonic()
+
+        tasks = [asyncio.create_task(self._feed(cycles))]
+        for stage, downstream in zip(self.stages, self.stages[1:] + [None]):
+            tasks.append(asyncio.create_task(stage.run(downstream, results)))
+
+        try:
+            # Surface the first failure instead of leaving other stages blocked on a full queue
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.consciousness.backend_scheduler.close()
+
+        self.elapsed = time.monotonic() - started
+        return sorted(results, key=lambda work: work.cycle)
+
+    async def _feed(self, cycles: int):
+        first = self.stages[0]
+        for _ in range(cycles):
+            self.consciousness.cycle_count += 1
+            await first.put(CycleWork(self.consciousness.cycle_count))
+        await first.queue.put(_END_OF_STREAM)
+
+    def report(self, results: List[CycleWork]):
+        latencies = [work.finished - work.started for work in results if work.finished is not None]
+        print(f"🏭 PIPELINED CONSCIOUSNESS: {len(results)} cycles in {self.elapsed:.1f}s "
+              f"({len(results) / self.elapsed if self.elapsed else 0:.2f} cycles/s), "
+              f"mean cycle latency {sum(latencies) / len(latencies) if latencies else 0:.1f}s")
+        for stage in self.stages:
+            stats = stage.stats
+            print(f"  • {stats.name}: {stats.processed} done by {stats.workers} workers, "
+                  f"{stats.throughput(self.elapsed):.2f}/s, {stats.utilization(self.elapsed):.0%} busy, "
+                  f"queue {stage.queue.qsize()} now / peak {stats.max_queue_depth}")
+
+# Test the pipelined runner
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    async def test_pipelined_consciousness():
+        with tempfile.TemporaryDirectory() as directory:
+            consciousness = ErewhonConsciousness(watermark_path=os.path.join(directory, "watermarks.json"),
+                                                 generation_cache_dir=os.path.join(directory, "generation"))
+            pipeline = PipelinedConsciousness(consciousness)
+            results = await pipeline.run(cycles=6)
+
+            print(f"\n{'='*60}")
+            for work in results:
+                evolved = work.evolved.youtube_video_id if work.evolved else "no evolution"
+                print(f"  Cycle {work.cycle}: {work.content.topic_inspiration.topic} → {evolved}")
+            pipeline.report(results)
+            consciousness.backend_scheduler.report()
+
+    print("TESTING PIPELINED CONSCIOUSNESS...")
+    asyncio.run(test_pipelined_consciousness())
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+GENERATION CACHE
+Never paying twice for the same song
+
+Music and video generation (Suno, RunwayML) is the slowest and most
+expensive step the machine takes, yet the same prompts - or prompts that
+differ only in case and spacing - come back cycle after cycle. This cache
+is content-addressed: the key is a hash of the generation kind, the
+normalized prompt and the generation parameters, and the value is the
+generated asset's URL and, optionally, its bytes on disk. The index is a
+JSON file written with an atomic replace, at most every save_interval
+seconds and on save()/close(); when the store grows past its byte budget,
+the least recently used assets are evicted. An unreadable index is
+discarded rather than trusted.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Mapping, Optional
+
+# A URL-only entry still costs its index record
+_RECORD_OVERHEAD = 128
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_prompt(prompt: str) -> str:
+    """Prompts that differ only in case, spacing or trailing punctuation generate the same asset"""
+    return _WHITESPACE.sub(" ", prompt.lower()).strip().rstrip(".!")
+
+def generation_key(kind: str, prompt: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """Content address of one generation request"""
+    payload = json.dumps([kind, normalize_prompt(prompt), dict(params or {})], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+@dataclass
+class CachedAsset:
+    """One generated asset the cache remembers"""
+    key: str
+    kind: str
+    url: str
+    size: int
+    path: Optional[str] = None
+    created: float = field(default_factory=time.time)
+    hits: int = 0
+    metadata: Dict[str, Any] = field(default_factory=dict)  # JSON-serializable extras stored with the index
+
+class GenerationCache:
+    """
+    Content-addressed, disk-backed cache of generated assets
+
+    directory=None keeps everything in memory. max_bytes bounds the stored
+    asset bytes plus a fixed per-entry cost for the index record. put()
+    writes the index at most every save_interval seconds; call save() or
+    close() to persist the rest.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = 512 * 1024 * 1024,
+                 save_interval: float = 30.0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.save_interval = save_interval
+        self._entries: "OrderedDict[str, CachedAsset]" = OrderedDict()  # least recently used first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._load()
+
+    @property
+    def index_path(self) -> Optional[str]:
+        return os.path.join(self.directory, "index.json") if self.directory else None
+
+    def get(self, kind: str, prompt: str, params: Optional[Mapping[str, Any]] = None) -> Optional[CachedAsset]:
+        key = generation_key(kind, prompt, params)
+        asset = self._entries.get(key)
+        if asset is None or (asset.path and not os.path.exists(asset.path)):
+            if asset is not None:  # blob removed behind our back
+                self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        asset.hits += 1
+        self.hits += 1
+        self._dirty = True
+        return asset
+
+    def put(self, kind: str, prompt: str, params: Optional[Mapping[str, Any]], url: str,
+            data: Optional[bytes] = None, metadata: Optional[Dict[str, Any]] = None) -> CachedAsset:
+        """Remember a generated asset (and its bytes and metadata, if given), evicting as needed"""
+        key = generation_key(kind, prompt, params)
+        if key in self._entries:
+            self._remove(key)
+
+        path = None
+        size = len(url.encode("utf-8")) + _RECORD_OVERHEAD
+        if metadata:
+            size += len(json.dumps(metadata).encode("utf-8"))
+        if data is not None and self.directory:
+            path = os.path.join(self.directory, f"{key}.bin")
+            with open(path, "wb") as blob:
+                blob.write(data)
+            size += len(data)
+
+        asset = self._entries[key] = CachedAsset(key=key, kind=kind, url=url, size=size, path=path,
+                                                 metadata=dict(metadata or {}))
+        self.total_bytes += size
+        self._evict()
+
+        self._dirty = True
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+        return asset
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        asset = self._entries.pop(key)
+        self.total_bytes -= asset.size
+        if asset.path:
+            try:
+                os.unlink(asset.path)
+            except FileNotFoundError:
+                pass
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def report(self):
+        stats = self.stats()
+        print(f"💾 GENERATION CACHE: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.0%}), {stats['entries']} assets, {stats['bytes'] / 1024:.1f} KiB, "
+              f"{stats['evictions']} evicted")
+
+    def _load(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as index:
+                records = json.load(index)["assets"]
+            for record in records:
+                asset = CachedAsset(**record)
+                if asset.path and not os.path.exists(asset.path):
+                    continue
+                self._entries[asset.key] = asset
+                self.total_bytes += asset.size
+        except FileNotFoundError:
+            return
+        except (ValueError, KeyError, TypeError):  # truncated or garbled index: start empty and rewrite it
+            self._entries.clear()
+            self.total_bytes = 0
+            records = None
+        self._evict()  # max_bytes may be smaller than when the index was written
+        self._dirty = records is None or len(self._entries) != len(records)
+
+    def save(self):
+        """Persist the index atomically, if anything changed (no-op for in-memory caches)"""
+        if not self.directory or not self._dirty:
+            return
+
+        data = {"version": 1, "assets": [asdict(asset) for asset in self._entries.values()]}
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".index-", suffix=".json")
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as temp_file:
+                json.dump(data, temp_file)
+            os.replace(temp_path, self.index_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+    def close(self):
+        self.save()
+
+# Test the generation cache
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        cache = GenerationCache(directory, max_bytes=4096)
+        params = {"engine": "suno", "duration_seconds": 60}
+
+        print("TESTING GENERATION CACHE...")
+        cache.put("music", "Synthwave track inspired by robots", params, "https://mock-suno-api.com/tracks/a1.mp3",
+                  data=b"\x00" * 1024)
+        hit = cache.get("music", "  synthwave TRACK inspired by robots. ", params)
+        print(f"  Normalized prompt hit: {hit.url if hit else None}")
+        print(f"  Different params miss: {cache.get('music', 'synthwave track inspired by robots', {'engine': 'udio'})}")
+
+        for number in range(5):  # push the byte budget
+            cache.put("video", f"prompt {number}", None, f"https://mock-runway-api.com/videos/{number}.mp4",
+                      data=b"\x00" * 1024)
+
+        cache.close()
+        reopened = GenerationCache(directory, max_bytes=4096)
+        print(f"  Reopened from disk with {len(reopened)} assets")
+        smaller = GenerationCache(directory, max_bytes=2048)
+        print(f"  Reopened with half the budget: {len(smaller)} assets, {smaller.evictions} evicted")
+        with open(os.path.join(directory, "index.json"), "w") as index:
+            index.write('{"version": 1, "assets": [{"key": "trunc')
+        print(f"  Reopened from a truncated index: {len(GenerationCache(directory))} assets")
+        cache.report()
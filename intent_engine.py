@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+INTENT MATCHING ENGINE
+A single compiled pass over every creative pattern
+
+The comment processor used to walk its pattern table category by category,
+calling re.search once per raw pattern string. This engine compiles the whole
+table once per process and checks every category in a single ordered pass,
+while keeping the original priority order between categories.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Order in which categories win when several could match the same comment
+INTENT_PRIORITY = ('visual_changes', 'style_modifications', 'audio_changes')
+
+@dataclass(frozen=True)
+class IntentMatch:
+    """The winning pattern for a comment"""
+    category: str
+    pattern: str
+    text: str  # equivalent of match.group() on the original pattern
+    groups: Tuple[Optional[str], ...]
+    span: Tuple[int, int]
+
+class IntentEngine:
+    """
+    Compiled matcher over a creative pattern table
+
+    The table is flattened into one priority-ordered list of compiled
+    expressions and walked in a single loop, so the first pattern (by
+    category, then by position) that matches anywhere in the text wins -
+    exactly what the old per-category loops did.
+
+    Patterns are written in lower case and matched case-sensitively against
+    lowercased text. Compiling without IGNORECASE lets the regex engine use
+    its literal-prefix scans, which is where most of the speedup comes from;
+    folding everything into one big alternation was measured to be slower,
+    since it forces the engine to try every alternative at every position.
+    """
+
+    def __init__(self, creative_patterns: Dict[str, Sequence[str]],
+                 priority: Sequence[str] = INTENT_PRIORITY, flags: int = 0):
+        self.priority = tuple(priority)
+        self._compiled: List[Tuple[str, str, re.Pattern]] = [
+            (category, pattern, re.compile(pattern, flags))
+            for category in self.priority
+            for pattern in creative_patterns.get(category, ())
+        ]
+        self.pattern_count = len(self._compiled)
+
+    def match(self, text: str) -> Optional[IntentMatch]:
+        """Return the highest priority pattern match in lowercased text, if any"""
+        for category, pattern, regex in self._compiled:
+            found = regex.search(text)
+            if found:
+                return IntentMatch(
+                    category=category,
+                    pattern=pattern,
+                    text=found.group(),
+                    groups=found.groups(),
+                    span=found.span()
+                )
+        return None
+
+_ENGINE_CACHE: Dict[Tuple, IntentEngine] = {}
+
+def get_intent_engine(creative_patterns: Dict[str, Sequence[str]],
+                      priority: Sequence[str] = INTENT_PRIORITY) -> IntentEngine:
+    """
+    Return the process-wide engine for a pattern table
+
+    Compilation happens once per distinct table, so every CommentProcessor
+    (and every worker process) shares the same compiled patterns.
+    """
+    key = (tuple(priority),
+           tuple((category, tuple(creative_patterns.get(category, ()))) for category in priority))
+    engine = _ENGINE_CACHE.get(key)
+    if engine is None:
+        engine = IntentEngine(creative_patterns, priority)
+        _ENGINE_CACHE[key] = engine
+    return engine
+
+# Test the intent engine
+if __name__ == "__main__":
+    from comment_processor import CommentProcessor
+
+    processor = CommentProcessor()
+    engine = get_intent_engine(processor.creative_patterns)
+
+    print("TESTING INTENT MATCHING ENGINE...")
+    print(f"Compiled {engine.pattern_count} patterns in priority order")
+    for sample in ["Needs more robot in the background",
+                   "Make it more cyberpunk, this looks too sad",
+                   "The music should be happy",
+                   "Love the colours"]:
+        result = engine.match(sample.lower())
+        if result:
+            print(f"  {sample!r} → {result.category}: {result.text!r} {result.groups}")
+        else:
+            print(f"  {sample!r} → no pattern")
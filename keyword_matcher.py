@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+MULTI-KEYWORD MATCHER
+Finding every creative element in a comment with a single pass
+
+The comment processor used to test each vocabulary word with a substring
+check, which grew linearly with the vocabulary and happily found "red" in
+"bored" or "car" in "scary". This module builds a word-level Aho-Corasick
+automaton over all vocabularies at once: the comment is tokenized into words
+and walked exactly once, so matches always sit on word boundaries and the
+per-comment cost depends on comment length, not on vocabulary size.
+"""
+
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens"""
+    return _WORD_RE.findall(text.lower())
+
+@dataclass(frozen=True)
+class KeywordHit:
+    """A vocabulary entry found in a text"""
+    label: str
+    keyword: str
+    rank: int  # insertion order of the keyword, used to keep vocabulary order
+    start: int  # token offsets in the tokenized text
+    end: int
+
+class _Node:
+    __slots__ = ("children", "fail", "keywords", "outputs")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.fail: "_Node" = None
+        self.keywords: List[Tuple[str, str, int, int]] = []  # (label, keyword, rank, length)
+        self.outputs: List[Tuple[str, str, int, int]] = []  # own keywords plus inherited ones
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton whose alphabet is words rather than characters
+
+    Keywords may be single words ("robot") or phrases ("more colorful").
+    A keyword can belong to several labels; each label is reported
+    separately. New vocabulary can be added at any time - failure links are
+    rebuilt lazily on the next search.
+    """
+
+    def __init__(self, vocabularies: Dict[str, Iterable[str]] = None):
+        self._root = _Node()
+        self._rank = 0
+        self._dirty = False
+        self.keyword_count = 0
+        for label, keywords in (vocabularies or {}).items():
+            self.add_vocabulary(label, keywords)
+
+    def add_vocabulary(self, label: str, keywords: Iterable[str]):
+        """Add a list of keywords under one label"""
+        for keyword in keywords:
+            self.add(label, keyword)
+
+    def add(self, label: str, keyword: str):
+        """Add a single keyword (word or phrase) under a label"""
+        tokens = tokenize(keyword)
+        if not tokens:
+            return
+
+        node = self._root
+        for token in tokens:
+            child = node.children.get(token)
+            if child is None:
+                child = node.children[token] = _Node()
+            node = child
+
+        if any(entry[0] == label for entry in node.keywords):
+            return
+        node.keywords.append((label, keyword, self._rank, len(tokens)))
+        self._rank += 1
+        self.keyword_count += 1
+        self._dirty = True
+
+    def _build(self):
+        """Compute failure links breadth-first and merge inherited outputs"""
+        root = self._root
+        root.fail = root
+        root.outputs = root.keywords
+        queue = deque()
+        for child in root.children.values():
+            child.fail = root
+            child.outputs = child.keywords
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for token, child in node.children.items():
+                fail = node.fail
+                while fail is not root and token not in fail.children:
+                    fail = fail.fail
+                child.fail = fail.children.get(token, root)
+                # Keywords ending at the failure target also end here
+                child.outputs = child.keywords + child.fail.outputs
+                queue.append(child)
+
+        self._dirty = False
+
+    def _walk(self, text: str):
+        """Yield (position, outputs) for every token that completes a keyword"""
+        if self._dirty:
+            self._build()
+
+        root = self._root
+        node = root
+        for position, token in enumerate(_WORD_RE.findall(text.lower())):
+            while node is not root and token not in node.children:
+                node = node.fail
+            node = node.children.get(token, root)
+            if node.outputs:
+                yield position, node.outputs
+
+    def find(self, text: str) -> List[KeywordHit]:
+        """Return every keyword occurrence in text order"""
+        return [
+            KeywordHit(label, keyword, rank, position - length + 1, position + 1)
+            for position, outputs in self._walk(text)
+            for label, keyword, rank, length in outputs
+        ]
+
+    def present(self, text: str) -> Dict[str, List[str]]:
+        """
+        Return the distinct keywords found per label, in vocabulary order
+
+        This mirrors the old "for element in vocabulary: if element in text"
+        loops, so callers that take the first few matches keep their ordering.
+        """
+        ranked: Dict[str, Dict[str, int]] = {}
+        for _, outputs in self._walk(text):
+            for label, keyword, rank, _ in outputs:
+                ranked.setdefault(label, {})[keyword] = rank
+        return {
+            label: sorted(keywords, key=keywords.get) if len(keywords) > 1 else list(keywords)
+            for label, keywords in ranked.items()
+        }
+
+# Test the keyword matcher
+if __name__ == "__main__":
+    matcher = KeywordMatcher({
+        'colors': ['red', 'blue', 'neon'],
+        'objects': ['robot', 'car', 'hat'],
+        'style_words': ['more colorful', 'darker']
+    })
+
+    print("TESTING MULTI-KEYWORD MATCHER...")
+    for sample in ["I'm bored of this scary video",
+                   "Add a red car and a neon robot",
+                   "What if it was darker and more colorful?"]:
+        print(f"  {sample!r} → {matcher.present(sample)}")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+RENDER CACHE
+The same request twice is one render
+
+Comment batches differ in wording, order and who wrote them, yet often ask
+for exactly the same thing: "add neon" and "make it cyberpunk" on the same
+video again next cycle. A render is identified by its source content_id
+and the canonical set of modifications applied to it: each suggestion
+reduced to its modification type and normalized prompt addition,
+deduplicated and sorted, so neither order nor repetition changes the key.
+The rendered AIContent is stored with its URL in a GenerationCache, which
+already provides the atomic disk index, the byte budget and LRU eviction.
+Where a render is published is not part of it: a cached render takes the
+source's YouTube ID, as a fresh render would, and the caller publishes it.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from architecture import AIContent, TrendingTopic
+from comment_processor import ProcessedComment
+from generation_cache import GenerationCache, normalize_prompt
+
+def canonical_modifications(comments: Sequence[ProcessedComment]) -> List[Tuple[str, str]]:
+    """Order- and duplicate-independent form of the modifications a batch asks for"""
+    return sorted({(comment.modification_type, normalize_prompt(comment.prompt_addition)) for comment in comments})
+
+def _content_to_dict(content: AIContent) -> Dict[str, Any]:
+    topic = content.topic_inspiration
+    return {
+        "content_id": content.content_id,
+        "topic_inspiration": {"topic": topic.topic, "source": topic.source,
+                              "relevance_score": topic.relevance_score,
+                              "timestamp": topic.timestamp.isoformat(), "context": topic.context},
+        "music_prompt": content.music_prompt,
+        "video_prompt": content.video_prompt,
+        "generated_music_url": content.generated_music_url,
+        "generated_video_url": content.generated_video_url,
+        "youtube_video_id": content.youtube_video_id,
+        "creation_timestamp": content.creation_timestamp.isoformat()
+    }
+
+def _content_from_dict(data: Dict[str, Any]) -> AIContent:
+    topic = dict(data["topic_inspiration"], timestamp=datetime.fromisoformat(data["topic_inspiration"]["timestamp"]))
+    return AIContent(**dict(data, topic_inspiration=TrendingTopic(**topic),
+                            creation_timestamp=datetime.fromisoformat(data["creation_timestamp"])))
+
+class RenderCache:
+    """
+    Rendered modifications keyed by (source content_id, modification set)
+
+    directory=None keeps renders in memory; max_bytes bounds the index and
+    any stored render bytes, evicting least recently used renders first.
+    The index is written as GenerationCache writes it: every save_interval
+    seconds at most, and on save()/close().
+    """
+
+    KIND = "render"
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = 64 * 1024 * 1024,
+                 save_interval: float = 30.0):
+        self.store = GenerationCache(directory, max_bytes, save_interval)
+
+    def get(self, source: AIContent, comments: Sequence[ProcessedComment]) -> Optional[AIContent]:
+        """The earlier render of these modifications on this source, if any"""
+        asset = self.store.get(self.KIND, source.content_id, {"modifications": canonical_modifications(comments)})
+        if asset is None:
+            return None
+        rendered = _content_from_dict(asset.metadata)
+        rendered.generated_video_url = asset.url
+        rendered.youtube_video_id = source.youtube_video_id
+        return rendered
+
+    def put(self, source: AIContent, comments: Sequence[ProcessedComment], rendered: AIContent,
+            data: Optional[bytes] = None):
+        self.store.put(self.KIND, source.content_id, {"modifications": canonical_modifications(comments)},
+                       rendered.generated_video_url or "", data=data,
+                       metadata=dict(_content_to_dict(rendered), youtube_video_id=None))
+
+    def save(self):
+        self.store.save()
+
+    def close(self):
+        self.store.close()
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.store.stats()
+
+    def report(self):
+        stats = self.stats()
+        print(f"♻️  RENDER CACHE: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%}), "
+              f"{stats['entries']} renders, {stats['bytes'] / 1024:.1f} KiB, {stats['evictions']} evicted")
+
+# Test the render cache
+if __name__ == "__main__":
+    import asyncio
+    import tempfile
+    from comment_processor import UserComment
+    from video_modifier import VideoModifier
+
+    def suggestion(comment_id: str, addition: str) -> ProcessedComment:
+        comment = UserComment(comment_id, "erewhon_video_1", "viewer", addition, datetime.now())
+        return ProcessedComment(comment, "visual modification", "visual", addition, 0.8)
+
+    async def test_render_cache():
+        with tempfile.TemporaryDirectory() as directory:
+            modifier = VideoModifier(render_cache=RenderCache(directory))
+            topic = TrendingTopic("Neon city nights", "Twitter", 0.9, datetime.now())
+            source = AIContent("source", topic, "Synthwave track", "Neon city at night",
+                               generated_video_url="https://mock-runway-api.com/videos/source.mp4",
+                               youtube_video_id="erewhon_video_1")
+
+            first = await modifier.modify_video_based_on_comments(
+                source, [suggestion("c1", "add neon"), suggestion("c2", "make it cyberpunk")])
+            modifier.lineage.publish(first.content_id, "erewhon_video_1_v2")
+            # Same modifications, different comments, order and spacing
+            again = await modifier.modify_video_based_on_comments(
+                source, [suggestion("c7", "Make it  cyberpunk!"), suggestion("c8", "add neon"), suggestion("c9", "add neon")])
+            modifier.render_cache.save()
+            reopened = RenderCache(directory).get(source, [suggestion("c3", "add neon"), suggestion("c4", "make it cyberpunk")])
+
+            published = modifier.lineage.get(first.content_id).youtube_video_id
+            print(f"\nSecond batch reused render: {again.generated_video_url == first.generated_video_url} "
+                  f"({again.generated_video_url}) as new version {again.content_id}, "
+                  f"while the first stays published as {published}")
+            print(f"Reopened cache returns it: {reopened is not None and reopened.content_id == first.content_id}, "
+                  f"under the source's {reopened.youtube_video_id} until published")
+            modifier.render_cache.report()
+
+    print("TESTING RENDER CACHE...")
+    asyncio.run(test_render_cache())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+COALESCING RENDER QUEUE
+One render for a whole burst of human feedback
+
+Every call to VideoModifier renders a brand-new version, so a video that
+gets five bursts of comments in ten minutes costs five full renders. This
+queue sits in front of the modifier and debounces per content_id: the
+first request for a video opens a window, every request arriving within
+the window joins it (and pushes the render back by another window), and a
+maximum wait caps how long any request can be delayed. When the window
+closes, all collected suggestions go into a single render whose result is
+handed to every caller that asked for it.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+from architecture import AIContent
+from comment_processor import ProcessedComment
+from suggestion_clustering import SuggestionClusterer
+
+@dataclass
+class _PendingRender:
+    content: AIContent
+    suggestions: List[ProcessedComment]
+    first_request: float
+    deadline: float
+    waiters: List[asyncio.Future] = field(default_factory=list)
+    requests: int = 0
+
+@dataclass
+class RenderQueueStats:
+    """What coalescing has saved so far"""
+    requests: int = 0
+    renders: int = 0
+    suggestions: int = 0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=1000))  # first request → render start
+
+    @property
+    def renders_saved(self) -> int:
+        return self.requests - self.renders
+
+    @property
+    def mean_latency(self) -> float:
+        return sum(self.latencies) / len(self.latencies) if self.latencies else 0.0
+
+    @property
+    def max_latency(self) -> float:
+        return max(self.latencies, default=0.0)
+
+class CoalescingRenderQueue:
+    """
+    Debounced, per-content render requests in front of a VideoModifier
+
+    window: seconds of quiet after the latest request before rendering.
+    max_wait: seconds after the first request by which the render starts
+    regardless. Offers the same modify_video_based_on_comments() coroutine
+    as VideoModifier, so it can stand in for one.
+    """
+
+    def __init__(self, video_modifier, window: float = 30.0, max_wait: float = 120.0,
+                 clusterer: Optional[SuggestionClusterer] = None):
+        self.video_modifier = video_modifier
+        self.window = window
+        self.max_wait = max(max_wait, window)
+        self.clusterer = clusterer
+        self.stats = RenderQueueStats()
+        self._pending: Dict[str, _PendingRender] = {}
+        self._flushers: Dict[str, asyncio.Task] = {}
+
+    def submit(self, content: AIContent, suggestions: List[ProcessedComment]) -> asyncio.Future:
+        """Queue suggestions for a video; the future resolves to the coalesced render's result"""
+        now = time.monotonic()
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+
+        pending = self._pending.get(content.content_id)
+        if pending is None:
+            pending = self._pending[content.content_id] = _PendingRender(
+                content=content, suggestions=[], first_request=now, deadline=now + self.window)
+            self._flushers[content.content_id] = loop.create_task(self._flush_when_quiet(content.content_id))
+        else:
+            pending.content = content  # the newest state of the video is what gets rendered
+            pending.deadline = min(now + self.window, pending.first_request + self.max_wait)
+
+        pending.suggestions.extend(suggestions)
+        pending.waiters.append(waiter)
+        pending.requests += 1
+        self.stats.requests += 1
+        return waiter
+
+    async def modify_video_based_on_comments(self, content: AIContent,
+                                             comments: List[ProcessedComment]) -> AIContent:
+        return await self.submit(content, comments)
+
+    async def _flush_when_quiet(self, content_id: str):
+        pending = self._pending[content_id]
+        while True:
+            delay = pending.deadline - time.monotonic()
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+        await self._render(content_id)
+
+    async def _render(self, content_id: str):
+        pending = self._pending.pop(content_id)
+        self._flushers.pop(content_id, None)
+        self.stats.latencies.append(time.monotonic() - pending.first_request)
+        self.stats.renders += 1
+        self.stats.suggestions += len(pending.suggestions)
+
+        try:
+            suggestions = pending.suggestions
+            if self.clusterer is not None:
+                suggestions = self.clusterer.cluster(suggestions)
+            rendered = await self.video_modifier.modify_video_based_on_comments(pending.content, suggestions)
+        except BaseException as error:
+            # Nobody else will resolve these waiters; cancellation is passed on to them as cancellation
+            for waiter in pending.waiters:
+                if waiter.done():
+                    continue
+                if isinstance(error, asyncio.CancelledError):
+                    waiter.cancel()
+                else:
+                    waiter.set_exception(error)
+            if not isinstance(error, Exception):
+                raise
+            return
+        for waiter in pending.waiters:
+            if not waiter.done():
+                waiter.set_result(rendered)
+
+    async def flush(self, content_id: Optional[str] = None):
+        """Render one video's (or every) pending requests now instead of waiting for the window"""
+        content_ids = [content_id] if content_id is not None else list(self._pending)
+        for pending_id in content_ids:
+            flusher = self._flushers.get(pending_id)
+            if flusher is None:
+                continue
+            flusher.cancel()
+            await asyncio.gather(flusher, return_exceptions=True)
+            await self._render(pending_id)
+
+    def __len__(self) -> int:
+        """Videos with a render waiting"""
+        return len(self._pending)
+
+    def report(self):
+        stats = self.stats
+        print(f"🎞️  RENDER QUEUE: {stats.requests} requests → {stats.renders} renders "
+              f"({stats.renders_saved} saved), latency mean {stats.mean_latency:.2f}s / max {stats.max_latency:.2f}s, "
+              f"{len(self)} pending")
+
+# Test the render queue
+if __name__ == "__main__":
+    from comment_processor import CommentProcessor
+    from content_generator import MockContentGenerator
+    from trend_detector import MockTrendDetector
+    from video_modifier import VideoModifier
+
+    async def test_render_queue():
+        processor = CommentProcessor()
+        content = await MockContentGenerator().create_content_from_trends(
+            await MockTrendDetector().detect_trending_topics())
+
+        # Compressed timescale: five comment bursts, 0.2s apart, with a 0.5s window and 3s cap
+        queue = CoalescingRenderQueue(VideoModifier(), window=0.5, max_wait=3.0)
+        waiters = []
+        for burst in range(5):
+            processed = await processor.process_comments(processor.generate_mock_comments(content.content_id, 10))
+            waiters.append(queue.submit(content, processed))
+            await asyncio.sleep(0.2)
+
+        results = await asyncio.gather(*waiters)
+        print(f"\nAll {len(results)} bursts share render {results[0].content_id}: "
+              f"{len({result.content_id for result in results}) == 1}")
+        queue.report()
+
+    print("TESTING COALESCING RENDER QUEUE...")
+    asyncio.run(test_render_queue())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+SIMILARITY PRIMITIVES
+The shared sense of "these are the same thing"
+
+Comment clustering and trend merging both reduce text to hashed features
+and then group near-identical items. The pieces they share live here:
+a stable 64-bit feature hash, SimHash fingerprints over weighted
+features, and a union-find for collecting the groups. Nothing in this
+module knows about comments or trends.
+"""
+
+import hashlib
+from functools import lru_cache
+from typing import Dict
+
+FINGERPRINT_BITS = 64
+
+@lru_cache(maxsize=65536)
+def feature_hash(feature: str) -> int:
+    """Stable 64-bit hash of a feature string"""
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+
+# SimHash counters are packed into one integer, 32 bits per fingerprint bit,
+# so each feature is a single multiply-add instead of a loop over 64 bits
+_FIELD = 32
+_FIELD_MASK = (1 << _FIELD) - 1
+_SPREAD_BYTE = [sum(1 << (bit * _FIELD) for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+
+@lru_cache(maxsize=65536)
+def _spread_hash(feature: str) -> int:
+    """feature_hash with bit i moved to the low bit of counter field i"""
+    hashed = feature_hash(feature)
+    return sum(_SPREAD_BYTE[hashed >> (8 * byte) & 0xFF] << (8 * byte * _FIELD)
+               for byte in range(FINGERPRINT_BITS // 8))
+
+def simhash(weighted_features: Dict[str, int]) -> int:
+    """64-bit SimHash of a feature → non-negative weight mapping"""
+    packed = 0
+    total = 0
+    for feature, weight in weighted_features.items():
+        packed += weight * _spread_hash(feature)
+        total += weight
+
+    # Bit i is set when the features with bit i set outweigh those without it
+    fingerprint = 0
+    for bit in range(FINGERPRINT_BITS):
+        if 2 * (packed >> (bit * _FIELD) & _FIELD_MASK) > total:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+class DisjointSet:
+    """Union-find over the integers 0..size-1"""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, first: int, second: int):
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            self.parent[max(first, second)] = min(first, second)
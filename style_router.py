@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+STYLE ROUTING
+Deciding how a trend should sound and look, in one lookup per word
+
+Trend-to-style rules used to be if/elif chains of keyword scans, each new
+genre adding another pass over the topic. Here every rule is compiled into
+an inverted index from keyword to (rule, weight), so routing a topic costs
+one dictionary lookup per word regardless of how many rules exist. A topic
+can match several rules at once ("AI climate protest"); each matched rule
+scores the sum of its keyword weights, and the style is drawn from the
+matched rules in proportion to those scores.
+"""
+
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from keyword_matcher import tokenize
+
+@dataclass
+class StyleRule:
+    """
+    Keywords that route a topic to a set of style options
+
+    keywords maps each keyword to its weight (a plain sequence means weight
+    1.0 each); options maps a slot such as "style" or "subject" to the
+    choices this rule offers for it.
+    """
+    name: str
+    keywords: Union[Mapping[str, float], Sequence[str]]
+    options: Dict[str, Sequence[str]] = field(default_factory=dict)
+
+    def keyword_weights(self) -> Dict[str, float]:
+        if isinstance(self.keywords, Mapping):
+            return {keyword.lower(): weight for keyword, weight in self.keywords.items()}
+        return {keyword.lower(): 1.0 for keyword in self.keywords}
+
+class StyleRouter:
+    """
+    Weighted multi-rule routing from topic text to style choices
+
+    fallback supplies choices for slots when no rule matches. Rules are
+    indexed on construction and on add_rule().
+    """
+
+    def __init__(self, rules: Sequence[StyleRule] = (), fallback: Optional[Dict[str, Sequence[str]]] = None):
+        self.rules: List[StyleRule] = []
+        self.fallback = dict(fallback or {})
+        self._index: Dict[str, List[Tuple[int, float]]] = {}
+        for rule in rules:
+            self.add_rule(rule)
+
+    def add_rule(self, rule: StyleRule):
+        position = len(self.rules)
+        self.rules.append(rule)
+        for keyword, weight in rule.keyword_weights().items():
+            self._index.setdefault(keyword, []).append((position, weight))
+
+    def match(self, text: str) -> List[Tuple[StyleRule, float]]:
+        """Every rule the text matches with its score, strongest first (ties in rule order)"""
+        scores: Dict[int, float] = {}
+        for token in set(tokenize(text.lower())):
+            for position, weight in self._index.get(token, ()):
+                scores[position] = scores.get(position, 0.0) + weight
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(self.rules[position], score) for position, score in ranked]
+
+    def route(self, text: str, slots: Sequence[str], rng: Optional[random.Random] = None,
+              matches: Optional[List[Tuple[StyleRule, float]]] = None) -> Dict[str, str]:
+        """
+        One choice per slot for the text
+
+        A single matched rule is drawn (weighted by score) and supplies
+        every slot it offers, so style and subject stay coherent; slots it
+        does not offer come from the fallback.
+        """
+        rng = rng or random
+        matches = self.match(text) if matches is None else matches
+        candidates = [(rule, score) for rule, score in matches if score > 0]
+        rule = None
+        if candidates:
+            rule = rng.choices([rule for rule, _ in candidates], weights=[score for _, score in candidates])[0]
+
+        choices = {}
+        for slot in slots:
+            options = rule.options.get(slot) if rule is not None else None
+            choices[slot] = rng.choice(options or self.fallback[slot])
+        return choices
+
+# Test the style router
+if __name__ == "__main__":
+    router = StyleRouter(
+        [StyleRule("tech", {"ai": 2.0, "quantum": 1.5, "cyber": 1.0}, {"style": ["synthwave", "techno"]}),
+         StyleRule("nature", ["climate", "ocean", "marine"], {"style": ["orchestral", "folk acoustic"]}),
+         StyleRule("unrest", ["protest", "politics", "scandal"], {"style": ["industrial rock"]})],
+        fallback={"style": ["lo-fi hip hop"]}
+    )
+
+    print("TESTING STYLE ROUTING...")
+    rng = random.Random(4)
+    for topic in ["New AI breakthrough in quantum computing", "AI climate protest", "Celebrity wedding"]:
+        matched = ", ".join(f"{rule.name}={score:g}" for rule, score in router.match(topic)) or "none"
+        print(f"  {topic!r}: matched {matched} → {router.route(topic, ['style'], rng)['style']}")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+SUGGESTION CLUSTERING
+Hearing a chorus as one voice
+
+Viral videos attract hundreds of variants of the same request ("make it more
+cyberpunk", "Make it MORE cyberpunk!!", "make it more cyberpunk pls").
+Applying each one separately bloats render prompts and render cost. This
+stage sits between the comment processor and the video modifier and
+collapses near-duplicate suggestions into one weighted suggestion.
+
+Each suggestion gets a 64-bit SimHash over its comment text and prompt
+addition. Identical fingerprints are grouped first; the distinct
+fingerprints are then indexed in several permuted tables, as in Manku et
+al.'s near-duplicate detection: the 64 bits are cut into max_distance + 2
+blocks and every pair of blocks keys one table. Two fingerprints within
+max_distance bits differ in at most max_distance blocks, so at least two
+blocks agree and they share a bucket in that pair's table. Keys are 16
+bits wide, so on varied text buckets stay near-empty and the work stays
+roughly linear in batch size.
+
+That guarantee is exact only while buckets stay small. A bucket holding
+more than max_bucket fingerprints means many near-identical variants; a
+newcomer is then compared with the newest max_bucket of them only, so a
+near pair can go unclustered when neither sees the other. Such lookups
+are counted in last_truncated; pass max_bucket=None for exact clustering
+at quadratic cost on highly repetitive input.
+"""
+
+from dataclasses import replace
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+from comment_processor import ProcessedComment
+from keyword_matcher import tokenize
+from similarity import FINGERPRINT_BITS, DisjointSet, simhash
+
+def _suggestion_features(suggestion: ProcessedComment) -> Dict[str, int]:
+    """Word and word-pair shingles; the prompt addition counts double"""
+    features: Dict[str, int] = {}
+    for source, weight in ((suggestion.original_comment.comment_text, 1), (suggestion.prompt_addition, 2)):
+        tokens = tokenize(source)
+        for token in tokens:
+            features[token] = features.get(token, 0) + weight
+        for first, second in zip(tokens, tokens[1:]):
+            shingle = f"{first} {second}"
+            features[shingle] = features.get(shingle, 0) + weight
+    return features
+
+class SuggestionClusterer:
+    """
+    Collapse near-duplicate ProcessedComments into weighted suggestions
+
+    Suggestions only cluster with others of the same modification type.
+    The representative of each cluster is its earliest member (the input
+    is normally already ranked), carrying the cluster size as support.
+    """
+
+    def __init__(self, max_distance: int = 6, max_bucket: Optional[int] = 64):
+        self.max_distance = max_distance
+        # A bucket this full means highly similar text; only its newest members are compared, keeping work
+        # linear at the cost of exactness (see the module docstring)
+        self.max_bucket = max_bucket
+        # Two spare blocks guarantee that near pairs agree on some pair of blocks
+        block_count = max_distance + 2
+        bounds = [FINGERPRINT_BITS * block // block_count for block in range(block_count + 1)]
+        blocks = [((1 << end) - 1) ^ ((1 << start) - 1) for start, end in zip(bounds, bounds[1:])]
+        # A table's key is the fingerprint masked to its two blocks, tagged with the table number
+        self.tables = [(blocks[first] | blocks[second], table << FINGERPRINT_BITS)
+                       for table, (first, second) in enumerate(combinations(range(block_count), 2))]
+        self.last_comparisons = 0
+        self.last_truncated = 0  # lookups in the last batch that skipped older bucket members
+        self.last_skipped = 0  # comparisons those lookups skipped
+
+    def cluster(self, suggestions: List[ProcessedComment]) -> List[ProcessedComment]:
+        """Return one weighted suggestion per cluster, in input order"""
+        if not suggestions:
+            return []
+
+        # Exact fingerprints first: spam waves collapse without any comparison
+        fingerprint_cache: Dict[Tuple[str, str], int] = {}
+        groups: Dict[Tuple[str, int], List[int]] = {}
+        for index, suggestion in enumerate(suggestions):
+            text_key = (suggestion.original_comment.comment_text.lower(), suggestion.prompt_addition)
+            fingerprint = fingerprint_cache.get(text_key)
+            if fingerprint is None:
+                fingerprint = fingerprint_cache[text_key] = simhash(_suggestion_features(suggestion))
+            groups.setdefault((suggestion.modification_type, fingerprint), []).append(index)
+
+        # Index the distinct fingerprints in the permuted tables; only bucket-mates are compared
+        distinct = list(groups)
+        clusters = DisjointSet(len(distinct))
+        buckets_by_type: Dict[str, Dict[int, List[int]]] = {}
+        comparisons = truncated = skipped = 0
+        for position, (modification_type, fingerprint) in enumerate(distinct):
+            buckets = buckets_by_type.setdefault(modification_type, {})
+            for mask, tag in self.tables:
+                bucket = buckets.setdefault(fingerprint & mask | tag, [])
+                candidates = bucket
+                if self.max_bucket is not None and len(bucket) > self.max_bucket:
+                    candidates = bucket[-self.max_bucket:]
+                    truncated += 1
+                    skipped += len(bucket) - self.max_bucket
+                comparisons += len(candidates)
+                for other in candidates:
+                    if (fingerprint ^ distinct[other][1]).bit_count() <= self.max_distance:
+                        clusters.union(position, other)
+                bucket.append(position)
+        self.last_comparisons = comparisons
+        self.last_truncated = truncated
+        self.last_skipped = skipped
+
+        members: Dict[int, List[int]] = {}
+        for position, group_key in enumerate(distinct):
+            members.setdefault(clusters.find(position), []).extend(groups[group_key])
+
+        weighted = []
+        for indices in members.values():
+            indices.sort()
+            representative = suggestions[indices[0]]
+            support = sum(suggestions[index].support for index in indices)
+            weighted.append((indices[0], replace(representative, support=support)))
+        weighted.sort(key=lambda item: item[0])
+        return [suggestion for _, suggestion in weighted]
+
+# Test the suggestion clusterer
+if __name__ == "__main__":
+    import asyncio
+    from datetime import datetime
+    from architecture import UserComment
+    from comment_processor import CommentProcessor
+
+    async def test_clustering():
+        processor = CommentProcessor()
+        texts = ["Make it more cyberpunk", "make it more CYBERPUNK!!", "make it more cyberpunk pls",
+                 "Needs more dragon in the background", "needs more dragon in the background :)",
+                 "The music should be faster"] * 50
+        comments = [UserComment(comment_id=f"c{i}", video_id="cluster_video", user_name=f"User{i}",
+                                comment_text=text, timestamp=datetime.now())
+                    for i, text in enumerate(texts)]
+        processed = await processor.process_comments(comments)
+
+        clusterer = SuggestionClusterer()
+        clustered = clusterer.cluster(processed)
+        print(f"🧩 SUGGESTION CLUSTERING: {len(processed)} suggestions → {len(clustered)} clusters "
+              f"({clusterer.last_comparisons} comparisons, {clusterer.last_truncated} truncated lookups)")
+        for suggestion in clustered:
+            print(f"  ×{suggestion.support:<4} {suggestion.prompt_addition} ← {suggestion.original_comment.comment_text!r}")
+
+    print("TESTING SUGGESTION CLUSTERING...")
+    asyncio.run(test_clustering())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+RANKED SUGGESTION INDEX
+Keeping only the voices the machine will actually act on
+
+process_comments sorts every passing suggestion, yet evolution only ever
+uses the best few. This index keeps, per video, a bounded min-heap of the
+top-k suggestions: a new suggestion either displaces the current weakest
+in O(log k) or is discarded, so memory stays at k entries per video no
+matter how many comments arrive.
+"""
+
+import heapq
+import itertools
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from comment_processor import ProcessedComment
+
+# (confidence, support, timestamp, -arrival, suggestion): the heap root is the weakest entry.
+# A cluster backed by many comments beats a one-off of equal confidence, and among
+# otherwise equal entries the earlier arrival ranks higher, as in process_comments
+_Entry = Tuple[float, int, float, int, ProcessedComment]
+_RANK = slice(0, 4)
+
+class RankedSuggestionIndex:
+    """
+    Per-video top-k suggestions, ranked by confidence, then support, then recency
+
+    top() returns the ranked list in O(k) while the video's heap is
+    unchanged; after a change the sorted view is rebuilt once, lazily.
+    """
+
+    def __init__(self, k: int = 10):
+        self.k = k
+        self._heaps: Dict[str, List[_Entry]] = {}
+        self._sorted: Dict[str, List[ProcessedComment]] = {}
+        self._arrivals = itertools.count()
+        self.seen = 0
+        self.discarded = 0
+
+    def add(self, suggestion: ProcessedComment, video_id: Optional[str] = None) -> bool:
+        """Offer a suggestion; returns True if it entered the video's top-k"""
+        video_id = video_id or suggestion.original_comment.video_id
+        entry = (suggestion.confidence_score, suggestion.support, suggestion.processing_timestamp.timestamp(),
+                 -next(self._arrivals), suggestion)
+        heap = self._heaps.setdefault(video_id, [])
+        self.seen += 1
+
+        if len(heap) < self.k:
+            heapq.heappush(heap, entry)
+        elif entry[_RANK] > heap[0][_RANK]:
+            heapq.heapreplace(heap, entry)
+            self.discarded += 1
+        else:
+            self.discarded += 1
+            return False
+
+        self._sorted.pop(video_id, None)
+        return True
+
+    def add_all(self, suggestions: Iterable[ProcessedComment], video_id: Optional[str] = None) -> int:
+        """Offer many suggestions; returns how many entered a top-k"""
+        return sum(self.add(suggestion, video_id) for suggestion in suggestions)
+
+    def top(self, video_id: str) -> List[ProcessedComment]:
+        """The video's current top-k, best first"""
+        ranked = self._sorted.get(video_id)
+        if ranked is None:
+            entries = sorted(self._heaps.get(video_id, []), key=lambda entry: entry[_RANK], reverse=True)
+            ranked = self._sorted[video_id] = [entry[-1] for entry in entries]
+        return list(ranked)
+
+    def weakest(self, video_id: str) -> Optional[ProcessedComment]:
+        """The suggestion a newcomer would have to beat, in O(1)"""
+        heap = self._heaps.get(video_id)
+        return heap[0][-1] if heap else None
+
+    def clear(self, video_id: str):
+        """Forget a video, e.g. after its suggestions have been applied"""
+        self._heaps.pop(video_id, None)
+        self._sorted.pop(video_id, None)
+
+    def __len__(self) -> int:
+        return sum(len(heap) for heap in self._heaps.values())
+
+# Test the ranked suggestion index
+if __name__ == "__main__":
+    import asyncio
+    from comment_processor import CommentProcessor
+
+    async def test_ranking():
+        processor = CommentProcessor()
+        index = RankedSuggestionIndex(k=3)
+
+        # Comments arrive over several polls; the index never holds more than k per video
+        for poll in range(4):
+            comments = processor.generate_mock_comments("ranking_video", 20)
+            processed = await processor.process_comments(comments)
+            index.add_all(processed)
+            print(f"  Poll {poll + 1}: holding {len(index)} of {index.seen} suggestions seen")
+
+        for suggestion in index.top("ranking_video"):
+            print(f"  {suggestion.confidence_score:.2f} {suggestion.creative_intent}")
+
+    print("TESTING RANKED SUGGESTION INDEX...")
+    asyncio.run(test_ranking())
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+WEIGHTED TOPIC CORPUS
+A zeitgeist with millions of possible thoughts, sampled in constant time
+
+Load tests need realistic topic diversity and popularity skew, not twenty
+hardcoded strings. A corpus is a plain text file with one "weight<TAB>topic"
+line per topic, with a finite, non-negative weight (blank lines are
+skipped). Next to it lives a binary index holding each topic line's byte
+offset and a Walker/Vose alias table over the weights. Both files are
+memory-mapped, so opening a corpus of millions of lines parses nothing: a
+draw is two random numbers, two array reads and the decoding of a single
+line. The index is built once, the first time a corpus is opened, and
+rebuilt whenever the corpus file changes.
+"""
+
+import math
+import mmap
+import os
+import random
+import struct
+from array import array
+from typing import List, Optional, Tuple
+
+_MAGIC = b"TOPICIX2"
+_HEADER = struct.Struct("<8sQQQQd")  # magic, count, positive count, corpus size, corpus mtime (ns), max weight
+
+def _alias_table(weights: array) -> Tuple[array, array]:
+    """Vose's alias method: O(n) construction, O(1) draws"""
+    count = len(weights)
+    total = sum(weights)
+    if count == 0 or total <= 0:
+        raise ValueError("corpus needs at least one topic with positive weight")
+
+    scaled = [weight * count / total for weight in weights]
+    probability = array("d", bytes(8 * count))
+    alias = array("I", bytes(4 * count))
+    small = [index for index, value in enumerate(scaled) if value < 1.0]
+    large = [index for index, value in enumerate(scaled) if value >= 1.0]
+
+    while small and large:
+        less, more = small.pop(), large.pop()
+        probability[less] = scaled[less]
+        alias[less] = more
+        scaled[more] += scaled[less] - 1.0
+        (small if scaled[more] < 1.0 else large).append(more)
+    for index in small + large:  # leftovers are 1.0 up to rounding error
+        probability[index] = 1.0
+        alias[index] = index
+
+    return probability, alias
+
+def build_corpus_index(corpus_path: str, index_path: Optional[str] = None) -> str:
+    """Scan a corpus once and write its offset and alias index; returns the index path"""
+    index_path = index_path or corpus_path + ".idx"
+    offsets = array("Q")  # where each topic line starts, then the end of the file
+    weights = array("d")
+    with open(corpus_path, "rb") as corpus:
+        position = 0
+        for number, line in enumerate(corpus, 1):
+            start, position = position, position + len(line)
+            if not line.strip():
+                continue
+            weight, separator, _ = line.partition(b"\t")
+            if not separator:
+                raise ValueError(f"{corpus_path}:{number}: expected 'weight<TAB>topic'")
+            try:
+                weight = float(weight)
+            except ValueError:
+                weight = math.nan
+            if not math.isfinite(weight) or weight < 0:
+                raise ValueError(f"{corpus_path}:{number}: weight must be a finite number >= 0")
+            weights.append(weight)
+            offsets.append(start)
+        offsets.append(position)
+
+    probability, alias = _alias_table(weights)
+    stat = os.stat(corpus_path)
+    temporary = index_path + ".tmp"
+    with open(temporary, "wb") as index:
+        positive = sum(1 for weight in weights if weight > 0)
+        index.write(_HEADER.pack(_MAGIC, len(weights), positive, stat.st_size, stat.st_mtime_ns, max(weights)))
+        offsets.tofile(index)
+        probability.tofile(index)
+        alias.tofile(index)
+    os.replace(temporary, index_path)
+    return index_path
+
+class TopicCorpus:
+    """
+    A memory-mapped, weighted topic corpus
+
+    sample() draws topics in proportion to their weights. Pass a seeded
+    random.Random (or seed=) for reproducible load tests.
+    """
+
+    def __init__(self, path: str, index_path: Optional[str] = None, seed: Optional[int] = None):
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self._random = random.Random(seed)
+
+        if not self._index_is_current():
+            build_corpus_index(path, self.index_path)
+
+        with open(path, "rb") as corpus:
+            self._corpus = mmap.mmap(corpus.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(self.index_path, "rb") as index:
+            self._index = mmap.mmap(index.fileno(), 0, access=mmap.ACCESS_READ)
+
+        _, self.count, self.positive_count, _, _, self.max_weight = _HEADER.unpack_from(self._index)
+        view = memoryview(self._index)
+        start = _HEADER.size
+        self._offsets = view[start:start + 8 * (self.count + 1)].cast("Q")
+        start += 8 * (self.count + 1)
+        self._probability = view[start:start + 8 * self.count].cast("d")
+        start += 8 * self.count
+        self._alias = view[start:start + 4 * self.count].cast("I")
+
+    def _index_is_current(self) -> bool:
+        try:
+            with open(self.index_path, "rb") as index:
+                magic, _, _, size, mtime_ns, _ = _HEADER.unpack(index.read(_HEADER.size))
+        except (OSError, struct.error):
+            return False
+        stat = os.stat(self.path)
+        return magic == _MAGIC and size == stat.st_size and mtime_ns == stat.st_mtime_ns
+
+    def __len__(self) -> int:
+        return self.count
+
+    def entry(self, index: int) -> Tuple[str, float]:
+        """The (topic, weight) on a given line"""
+        line = self._corpus[self._offsets[index]:self._offsets[index + 1]]
+        line = line.partition(b"\n")[0]  # any blank lines that followed it belong to no topic
+        weight, _, topic = line.partition(b"\t")
+        return topic.rstrip(b"\r").decode("utf-8"), float(weight)
+
+    def sample_index(self, rng: Optional[random.Random] = None) -> int:
+        rng = rng or self._random
+        index = rng.randrange(self.count)
+        return index if rng.random() < self._probability[index] else self._alias[index]
+
+    def sample(self, num_topics: int, rng: Optional[random.Random] = None,
+               unique: bool = True) -> List[Tuple[str, float]]:
+        """
+        Weighted draws of (topic, weight)
+
+        With unique, repeated draws are rejected, so asking for nearly the
+        whole corpus gets slow; load tests ask for a handful per cycle.
+        Zero-weight topics are never drawn, so at most positive_count
+        distinct topics are available.
+        """
+        if unique and num_topics > self.positive_count:
+            raise ValueError(f"cannot draw {num_topics} distinct topics from {self.positive_count} "
+                             f"with positive weight")
+        if not unique:
+            return [self.entry(self.sample_index(rng)) for _ in range(num_topics)]
+
+        chosen: List[int] = []
+        seen = set()
+        while len(chosen) < num_topics:
+            index = self.sample_index(rng)
+            if index not in seen:
+                seen.add(index)
+                chosen.append(index)
+        return [self.entry(index) for index in chosen]
+
+    def close(self):
+        for view in (self._offsets, self._probability, self._alias):
+            view.release()
+        self._corpus.close()
+        self._index.close()
+
+    def __enter__(self) -> "TopicCorpus":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def write_synthetic_corpus(path: str, count: int, seed: Optional[int] = None, skew: float = 1.1):
+    """Write a load-test corpus of count topics with Zipf-like popularity"""
+    rng = random.Random(seed)
+    subjects = ["AI", "Climate", "Crypto", "Space", "Election", "Football", "Fashion", "Ocean", "Music", "Quantum",
+                "Vaccine", "Robot", "Festival", "Market", "Volcano", "Startup", "Museum", "Marathon", "Drone", "Film"]
+    events = ["breakthrough", "scandal", "protest", "record", "merger", "discovery", "collapse", "launch",
+              "controversy", "victory", "shortage", "leak", "rally", "ban", "comeback", "heatwave"]
+    places = ["in Berlin", "in Tokyo", "in Lagos", "in Lima", "in Seoul", "on Mars", "online", "in Paris",
+              "in Toronto", "in Mumbai", "at sea", "in Nairobi", ""]
+
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as corpus:
+        for rank in range(1, count + 1):
+            topic = f"{rng.choice(subjects)} {rng.choice(events)} {rng.choice(places)} #{rank}".replace("  ", " ")
+            corpus.write(f"{1.0 / rank ** skew:.6g}\t{topic}\n")
+
+# Test the topic corpus
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from collections import Counter
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "topics.tsv")
+        started = time.perf_counter()
+        write_synthetic_corpus(path, 1_000_000, seed=1)
+        print("TESTING WEIGHTED TOPIC CORPUS...")
+        print(f"  Wrote 1,000,000 topics ({os.path.getsize(path) / 1e6:.1f} MB) in {time.perf_counter() - started:.2f}s")
+
+        started = time.perf_counter()
+        build_corpus_index(path)
+        print(f"  Built offset + alias index once in {time.perf_counter() - started:.2f}s")
+
+        started = time.perf_counter()
+        corpus = TopicCorpus(path, seed=42)
+        print(f"  Opened memory-mapped corpus in {(time.perf_counter() - started) * 1000:.2f}ms")
+
+        started = time.perf_counter()
+        draws = Counter(corpus.sample_index() for _ in range(200000))
+        elapsed = time.perf_counter() - started
+        print(f"  200,000 weighted draws in {elapsed:.2f}s ({200000 / elapsed:,.0f}/s)")
+        print(f"  Most drawn: {[corpus.entry(index)[0] for index, _ in draws.most_common(3)]}")
+
+        again = TopicCorpus(path, seed=42)
+        assert again.sample(5) == TopicCorpus(path, seed=42).sample(5), "same seed, same topics"
+        print(f"  Seeded sample: {[topic for topic, _ in again.sample(3)]}")
+        again.close()
+        corpus.close()
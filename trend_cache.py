@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+TREND CACHE
+Remembering the zeitgeist between heartbeats
+
+Trends move on a scale of minutes, yet every consciousness cycle used to
+ask for them from scratch, paying the latency (and rate limits) of slow
+upstream APIs on its critical path. This cache gives each trend source its
+own time-to-live. Fresh entries are served directly; stale entries are
+served immediately while one background refresh brings them up to date;
+and concurrent requests for the same data share a single in-flight fetch.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Optional, TypeVar
+
+from architecture import TrendingTopic
+from trend_sources import TrendSource
+
+T = TypeVar("T")
+
+@dataclass
+class _CacheEntry(Generic[T]):
+    value: T
+    fetched_at: float = field(default_factory=time.monotonic)
+
+class StaleWhileRevalidateCache(Generic[T]):
+    """
+    Async TTL cache with stale-while-revalidate and single-flight loads
+
+    ttl: seconds an entry is considered fresh.
+    max_stale: seconds past the TTL a stale entry may still be served
+    while refreshing; beyond that, callers wait for the refresh. None means
+    stale entries are always served.
+    load_timeout: seconds a load may take before it counts as failed and
+    the key can be refreshed again (None waits forever).
+    """
+
+    def __init__(self, loader: Callable[[Hashable], Awaitable[T]], ttl: float, max_stale: Optional[float] = None,
+                 load_timeout: Optional[float] = 30.0):
+        self.loader = loader
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.load_timeout = load_timeout
+        self._entries: Dict[Hashable, _CacheEntry[T]] = {}
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.last_error: Optional[BaseException] = None
+
+    async def get(self, key: Hashable = None) -> T:
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry.fetched_at
+            if age <= self.ttl:
+                self.hits += 1
+                return entry.value
+            if self.max_stale is None or age <= self.ttl + self.max_stale:
+                self.stale_hits += 1
+                self._refresh(key)  # revalidate in the background, answer right away
+                return entry.value
+
+        self.misses += 1
+        return await asyncio.shield(self._refresh(key))
+
+    def _refresh(self, key: Hashable) -> asyncio.Task:
+        """Start a load for key unless one is already running, and return it"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key))
+            task.add_done_callback(self._loaded)
+            self._inflight[key] = task
+        return task
+
+    def _loaded(self, task: asyncio.Task):
+        # Background refreshes have no awaiting caller; retrieve their failure here so it is counted, not lost
+        if not task.cancelled() and task.exception() is not None:
+            self.refresh_errors += 1
+            self.last_error = task.exception()
+
+    async def _load(self, key: Hashable) -> T:
+        self.refreshes += 1
+        try:
+            value = await asyncio.wait_for(self.loader(key), self.load_timeout)
+        finally:
+            self._inflight.pop(key, None)
+        self._entries[key] = _CacheEntry(value)
+        return value
+
+    def invalidate(self, key: Hashable = None):
+        self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors
+        }
+
+class CachedTrendSource(TrendSource):
+    """A trend source behind its own stale-while-revalidate cache, loads bounded by the source's timeout"""
+
+    def __init__(self, source: TrendSource, ttl: float, max_stale: Optional[float] = None):
+        self.source = source
+        self.name = source.name
+        self.timeout = source.timeout
+        self.cache: StaleWhileRevalidateCache[List[TrendingTopic]] = StaleWhileRevalidateCache(
+            self.source.fetch, ttl, max_stale, load_timeout=source.timeout
+        )
+
+    async def fetch(self, limit: int) -> List[TrendingTopic]:
+        return list(await self.cache.get(limit))
+
+class CachedTrendDetector:
+    """Stale-while-revalidate wrapper for anything with detect_trending_topics()"""
+
+    def __init__(self, detector, ttl: float = 300.0, max_stale: Optional[float] = None,
+                 load_timeout: Optional[float] = 30.0):
+        self.detector = detector
+        self.cache: StaleWhileRevalidateCache[List[TrendingTopic]] = StaleWhileRevalidateCache(
+            self.detector.detect_trending_topics, ttl, max_stale, load_timeout
+        )
+
+    async def detect_trending_topics(self, num_topics: int = 3) -> List[TrendingTopic]:
+        return list(await self.cache.get(num_topics))
+
+def with_ttls(sources: List[TrendSource], ttls: Dict[str, float], default_ttl: float = 300.0,
+              max_stale: Optional[float] = None) -> List[TrendSource]:
+    """Wrap every source in a cache, using the per-source TTL where one is given"""
+    return [CachedTrendSource(source, ttls.get(source.name, default_ttl), max_stale) for source in sources]
+
+# Test the trend cache
+if __name__ == "__main__":
+    from trend_detector import MockTrendDetector
+    from trend_sources import StubTrendSource
+
+    async def test_trend_cache():
+        topics = MockTrendDetector().mock_topics
+        source = CachedTrendSource(StubTrendSource("Slow API", topics, latency=0.5), ttl=0.2)
+
+        async def timed(label):
+            started = time.perf_counter()
+            await source.fetch(5)
+            print(f"  {label:<38} {time.perf_counter() - started:.3f}s")
+
+        await timed("cold fetch (waits for the API)")
+        await timed("fresh hit")
+        await asyncio.sleep(0.3)
+        await timed("stale hit (refresh starts behind it)")
+        await asyncio.gather(*(source.fetch(5) for _ in range(10)))
+        print(f"  10 concurrent fetches while refreshing → {source.cache.stats()['refreshes']} refreshes so far")
+        await asyncio.sleep(0.6)
+        await timed("fresh again after background refresh")
+        print(f"  {source.cache.stats()}")
+
+    print("TESTING STALE-WHILE-REVALIDATE TREND CACHE...")
+    asyncio.run(test_trend_cache())
@@ -9,8 +9,9 @@ before requiring human intervention for live API access.
 
 import random
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional
 from architecture import TrendingTopic
+from topic_corpus import TopicCorpus
 
 class MockTrendDetector:
     """
@@ -18,9 +19,16 @@ class MockTrendDetector:
     
     This represents my attempt to create a functioning prototype that demonstrates
     the creative consciousness pipeline, even with synthetic data.
+
+    For load tests, corpus_path points at a weighted topic corpus (see
+    topic_corpus.py) to draw from instead of the curated list, and seed
+    makes every draw reproducible.
     """
     
-    def __init__(self):
+    def __init__(self, corpus_path: Optional[str] = None, seed: Optional[int] = None):
+        self._random = random.Random(seed)
+        self.corpus = TopicCorpus(corpus_path) if corpus_path else None
+
         # Curated topics that could realistically trend
         self.mock_topics = [
             "Climate change protests in Berlin",
@@ -59,15 +67,21 @@ class MockTrendDetector:
         import asyncio
         await asyncio.sleep(0.5)
         
-        selected_topics = random.sample(self.mock_topics, num_topics)
+        if self.corpus is not None:
+            # Popular topics are drawn more often and score higher
+            selected = [(topic, 0.6 + 0.4 * (weight / self.corpus.max_weight) ** 0.25)
+                        for topic, weight in self.corpus.sample(num_topics, self._random)]
+        else:
+            selected = [(topic, self._random.uniform(0.6, 1.0))
+                        for topic in self._random.sample(self.mock_topics, num_topics)]
         
         trending_topics = []
-        for topic in selected_topics:
+        for topic, relevance in selected:
             trending_topic = TrendingTopic(
                 topic=topic,
-                source=random.choice(self.sources),
-                relevance_score=random.uniform(0.6, 1.0),
-                timestamp=datetime.now() - timedelta(minutes=random.randint(5, 120)),
+                source=self._random.choice(self.sources),
+                relevance_score=relevance,
+                timestamp=datetime.now() - timedelta(minutes=self._random.randint(5, 120)),
                 context=self._generate_context(topic)
             )
             trending_topics.append(trending_topic)
@@ -90,7 +104,7 @@ class MockTrendDetector:
             f"Celebrity influencers discussing '{topic}' driving viral spread",
             f"Breaking news coverage of '{topic}' across major outlets"
         ]
-        return random.choice(context_templates)
+        return self._random.choice(context_templates)
 
 # Test the mock trend detector
 if __name__ == "__main__":
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+BATCH TREND SCORING
+Weighing the whole zeitgeist in one motion
+
+Each source hands back its own idea of relevance, and ranking used to be a
+plain sort on it. This engine rescores a whole batch of candidate trends
+at once, blending four signals: recency (exponential decay on the topic's
+timestamp), a per-source trust weight, velocity (how fast the topic's
+relevance moved since the last cycle) and novelty (topics seen often and
+recently are less interesting). Batches are held column by column, so with
+NumPy installed the scoring is a single vectorized pass; without it, or
+for batches too small to be worth it, the same formula runs in plain Python.
+"""
+
+import heapq
+import math
+from array import array
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from architecture import TrendingTopic
+
+try:
+    import numpy as np
+except ImportError:  # scoring falls back to pure Python
+    np = None
+
+@dataclass
+class TrendBatch:
+    """Candidate trends as columns, built once per cycle"""
+    trends: List[TrendingTopic]
+    topics: List[str] = field(default_factory=list)
+    timestamps: array = field(default_factory=lambda: array("d"))
+    relevance: array = field(default_factory=lambda: array("d"))
+    source_index: array = field(default_factory=lambda: array("I"))
+    sources: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_trends(cls, trends: Sequence[TrendingTopic]) -> "TrendBatch":
+        batch = cls(list(trends))
+        source_ids: Dict[str, int] = {}
+        for trend in batch.trends:
+            batch.topics.append(trend.topic)
+            batch.timestamps.append(trend.timestamp.timestamp())
+            batch.relevance.append(trend.relevance_score)
+            source = source_ids.get(trend.source)
+            if source is None:
+                source = source_ids[trend.source] = len(batch.sources)
+                batch.sources.append(trend.source)
+            batch.source_index.append(source)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.trends)
+
+@dataclass
+class ScoringWeights:
+    """How much each signal contributes before the source weight is applied"""
+    recency: float = 0.35
+    relevance: float = 0.25
+    velocity: float = 0.2
+    novelty: float = 0.2
+
+DEFAULT_SOURCE_WEIGHTS = {"Twitter": 1.0, "News API": 0.95, "Google Trends": 0.9, "Reddit": 0.8}
+
+class TrendScorer:
+    """
+    Rescore and rank batches of TrendingTopics
+
+    half_life_hours controls recency decay; novelty_hours how long a topic
+    stays "already seen". Merged topics ("Twitter, Reddit") take the weight
+    of their most trusted source. History of what was seen is kept in packed
+    columns indexed by topic, so both scoring paths read it without copying.
+    Topics unseen for history_hours are forgotten, and at most max_history
+    topics (the most recently seen) are remembered.
+    """
+
+    def __init__(self, source_weights: Optional[Dict[str, float]] = None, default_source_weight: float = 0.7,
+                 half_life_hours: float = 2.0, novelty_hours: float = 24.0,
+                 weights: Optional[ScoringWeights] = None, vectorize_threshold: int = 256,
+                 history_hours: float = 96.0, max_history: int = 100_000):
+        self.source_weights = dict(DEFAULT_SOURCE_WEIGHTS if source_weights is None else source_weights)
+        self.default_source_weight = default_source_weight
+        self.half_life_hours = half_life_hours
+        self.novelty_hours = novelty_hours
+        self.weights = weights or ScoringWeights()
+        self.vectorize_threshold = vectorize_threshold
+        self.history_hours = history_hours
+        self.max_history = max_history
+        self._combined_weights: Dict[str, float] = {}
+
+        # Observation history, one row per topic ever seen
+        self._history_ids: Dict[str, int] = {}
+        self._last_seen = array("d")
+        self._last_relevance = array("d")
+        self._seen_count = array("d")
+        self._oldest_seen = math.inf
+        self.history_evictions = 0
+
+    def _source_weight(self, source: str) -> float:
+        weight = self._combined_weights.get(source)
+        if weight is None:
+            weight = self._combined_weights[source] = max(
+                self.source_weights.get(name, self.default_source_weight) for name in source.split(", "))
+        return weight
+
+    def score_batch(self, batch: TrendBatch, now: Optional[datetime] = None) -> Sequence[float]:
+        """One score per trend in the batch (a NumPy array on the vectorized path)"""
+        now_ts = (now or datetime.now()).timestamp()
+        if np is None or len(batch) < self.vectorize_threshold:
+            return self._score_python(batch, now_ts)
+        return self._score_numpy(batch, now_ts)
+
+    def _score_python(self, batch: TrendBatch, now: float) -> List[float]:
+        weights = self.weights
+        source_weights = [self._source_weight(source) for source in batch.sources]
+        decay = math.log(2) / self.half_life_hours
+        scores = []
+        for topic, timestamp, relevance, source in zip(batch.topics, batch.timestamps, batch.relevance,
+                                                       batch.source_index):
+            recency = math.exp(-max(now - timestamp, 0.0) / 3600.0 * decay)
+            row = self._history_ids.get(topic)
+            if row is None:
+                velocity, novelty = 0.5, 1.0
+            else:
+                since_hours = max(now - self._last_seen[row], 60.0) / 3600.0
+                velocity = (math.tanh((relevance - self._last_relevance[row]) / since_hours) + 1.0) / 2.0
+                novelty = 1.0 / (1.0 + self._seen_count[row] * math.exp(-since_hours / self.novelty_hours))
+            scores.append(source_weights[source] * (weights.recency * recency + weights.relevance * relevance +
+                                                    weights.velocity * velocity + weights.novelty * novelty))
+        return scores
+
+    def _score_numpy(self, batch: TrendBatch, now: float):
+        weights = self.weights
+        timestamps = np.frombuffer(batch.timestamps, dtype=np.float64)
+        relevance = np.frombuffer(batch.relevance, dtype=np.float64)
+        source_weight = np.array([self._source_weight(source) for source in batch.sources])[
+            np.frombuffer(batch.source_index, dtype=np.uintc)]
+
+        recency = np.exp(-np.maximum(now - timestamps, 0.0) / 3600.0 * (math.log(2) / self.half_life_hours))
+
+        # Only the history lookup is per topic; everything after it is array arithmetic
+        rows = np.array([self._history_ids.get(topic, -1) for topic in batch.topics], dtype=np.int64)
+        known = rows >= 0
+        velocity = np.full(len(batch), 0.5)
+        novelty = np.ones(len(batch))
+        if known.any():
+            history = rows[known]
+            since_hours = np.maximum(now - np.frombuffer(self._last_seen, dtype=np.float64)[history], 60.0) / 3600.0
+            change = relevance[known] - np.frombuffer(self._last_relevance, dtype=np.float64)[history]
+            velocity[known] = (np.tanh(change / since_hours) + 1.0) / 2.0
+            seen = np.frombuffer(self._seen_count, dtype=np.float64)[history]
+            novelty[known] = 1.0 / (1.0 + seen * np.exp(-since_hours / self.novelty_hours))
+
+        return source_weight * (weights.recency * recency + weights.relevance * relevance +
+                                weights.velocity * velocity + weights.novelty * novelty)
+
+    def observe(self, batch: TrendBatch, now: Optional[datetime] = None):
+        """Record the batch in the history that velocity and novelty are measured against"""
+        now_ts = (now or datetime.now()).timestamp()
+        for topic, relevance in zip(batch.topics, batch.relevance):
+            row = self._history_ids.get(topic)
+            if row is None:
+                row = self._history_ids[topic] = len(self._seen_count)
+                self._last_seen.append(now_ts)
+                self._last_relevance.append(relevance)
+                self._seen_count.append(1.0)
+            else:
+                self._last_seen[row] = now_ts
+                self._last_relevance[row] = relevance
+                self._seen_count[row] += 1.0
+        self._oldest_seen = min(self._oldest_seen, now_ts)
+        if len(self._seen_count) > self.max_history or self._oldest_seen < now_ts - self.history_hours * 3600.0:
+            self._evict_history(now_ts)
+
+    def _evict_history(self, now: float):
+        """Drop topics unseen for history_hours, then the least recently seen beyond max_history"""
+        cutoff = now - self.history_hours * 3600.0
+        last_seen = self._last_seen
+        rows = [row for row in self._history_ids.values() if last_seen[row] >= cutoff]
+        if len(rows) > self.max_history:
+            rows = heapq.nlargest(self.max_history, rows, key=last_seen.__getitem__)
+        keep = set(rows)
+
+        topics = [topic for topic, row in self._history_ids.items() if row in keep]
+        self.history_evictions += len(self._history_ids) - len(topics)
+        old_rows = [self._history_ids[topic] for topic in topics]
+        self._history_ids = {topic: row for row, topic in enumerate(topics)}
+        self._last_seen = array("d", (last_seen[row] for row in old_rows))
+        self._last_relevance = array("d", (self._last_relevance[row] for row in old_rows))
+        self._seen_count = array("d", (self._seen_count[row] for row in old_rows))
+        self._oldest_seen = min(self._last_seen, default=math.inf)
+
+    def rank(self, trends: Sequence[TrendingTopic], num_topics: Optional[int] = None,
+             now: Optional[datetime] = None, observe: bool = True) -> List[TrendingTopic]:
+        """
+        The best num_topics trends (all of them by default), best first
+
+        Returned topics carry their new relevance_score. With observe, the
+        whole batch is then added to the history.
+        """
+        batch = TrendBatch.from_trends(trends)
+        if not len(batch):
+            return []
+        scores = self.score_batch(batch, now)
+        count = len(batch) if num_topics is None else min(num_topics, len(batch))
+
+        if np is not None and isinstance(scores, np.ndarray):
+            order = np.argpartition(-scores, count - 1)[:count] if count < len(batch) else np.arange(len(batch))
+            order = order[np.argsort(-scores[order], kind="stable")].tolist()
+        else:
+            order = heapq.nlargest(count, range(len(batch)), key=scores.__getitem__)
+
+        ranked = [replace(batch.trends[index], relevance_score=round(float(scores[index]), 4)) for index in order]
+        if observe:
+            self.observe(batch, now)
+        return ranked
+
+# Test the trend scorer
+if __name__ == "__main__":
+    import random
+    import time
+    from datetime import timedelta
+
+    rng = random.Random(11)
+    sources = ["Twitter", "Reddit", "Google Trends", "News API", "Some Blog"]
+    scorer = TrendScorer(max_history=30000)
+    now = datetime.now()
+
+    def candidates(count):
+        return [TrendingTopic(topic=f"topic {rng.randrange(count * 2)}", source=rng.choice(sources),
+                              relevance_score=rng.uniform(0.6, 1.0),
+                              timestamp=now - timedelta(minutes=rng.randint(5, 600)))
+                for _ in range(count)]
+
+    print("TESTING BATCH TREND SCORING...")
+    print(f"  Vectorized path: {'NumPy ' + np.__version__ if np is not None else 'unavailable (NumPy not installed)'}")
+    for trend in scorer.rank(candidates(8), num_topics=3, now=now):
+        print(f"  {trend.relevance_score:.3f} {trend.topic} [{trend.source}]")
+
+    for cycle in range(3):
+        batch = candidates(20000)
+        started = time.perf_counter()
+        top = scorer.rank(batch, num_topics=5, now=now + timedelta(minutes=10 * (cycle + 1)))
+        print(f"  Cycle {cycle + 1}: rescored {len(batch):,} candidates in {time.perf_counter() - started:.3f}s, "
+              f"best {top[0].topic} ({top[0].relevance_score:.3f})")
+    print(f"  History: {len(scorer._history_ids):,} topics remembered (cap {scorer.max_history:,}), "
+          f"{scorer.history_evictions:,} evicted")
+    scorer.rank(candidates(100), now=now + timedelta(hours=scorer.history_hours + 1))
+    print(f"  After {scorer.history_hours:g}h without them: {len(scorer._history_ids):,} topics remembered")
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+CONCURRENT TREND SOURCES
+Listening to every corner of the zeitgeist at once
+
+Trend detection used to be one serial call. This module defines a common
+interface for trend sources (Twitter, Google Trends, Reddit, news feeds...)
+and an aggregator that queries all of them concurrently. Every source has
+its own timeout and the aggregator has an overall deadline: whatever has
+arrived by then is used, so one slow or failing source can never stall a
+consciousness cycle. Stub sources with configurable latency make the
+fan-out behaviour testable offline.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+from architecture import TrendingTopic
+from trend_merging import TrendMerger
+from trend_scoring import TrendScorer
+
+class TrendSource:
+    """
+    A single place the machine can perceive trends from
+
+    Subclasses set name and implement fetch(); timeout bounds how long the
+    aggregator will wait for this particular source.
+    """
+
+    name = "source"
+    timeout = 2.0
+
+    async def fetch(self, limit: int) -> List[TrendingTopic]:
+        raise NotImplementedError
+
+class StubTrendSource(TrendSource):
+    """
+    Offline stand-in for a live trend API
+
+    latency and jitter (seconds) shape how long a fetch takes; failure_rate
+    makes a fraction of fetches raise, to exercise error handling.
+    """
+
+    def __init__(self, name: str, topics: Sequence[str], latency: float = 0.1, jitter: float = 0.0,
+                 timeout: float = 2.0, failure_rate: float = 0.0, seed: Optional[int] = None):
+        self.name = name
+        self.topics = list(topics)
+        self.latency = latency
+        self.jitter = jitter
+        self.timeout = timeout
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+
+    async def fetch(self, limit: int) -> List[TrendingTopic]:
+        await asyncio.sleep(max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter)))
+        if self._random.random() < self.failure_rate:
+            raise ConnectionError(f"{self.name} API unavailable")
+
+        return [
+            TrendingTopic(
+                topic=topic,
+                source=self.name,
+                relevance_score=self._random.uniform(0.6, 1.0),
+                timestamp=datetime.now() - timedelta(minutes=self._random.randint(5, 120)),
+                context=f"Trending on {self.name}"
+            )
+            for topic in self._random.sample(self.topics, min(limit, len(self.topics)))
+        ]
+
+class DetectorTrendSource(TrendSource):
+    """Adapts anything with detect_trending_topics() (e.g. MockTrendDetector) into a source"""
+
+    def __init__(self, detector, name: str = "Mock Detector", timeout: float = 2.0):
+        self.detector = detector
+        self.name = name
+        self.timeout = timeout
+
+    async def fetch(self, limit: int) -> List[TrendingTopic]:
+        return await self.detector.detect_trending_topics(limit)
+
+@dataclass
+class SourceOutcome:
+    """How one source behaved during the last fan-out"""
+    name: str
+    status: str  # "ok", "timeout", "error" or "missed_deadline"
+    topics: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+class TrendAggregator:
+    """
+    Fan out to every configured source, fan in by the deadline
+
+    Exposes the same detect_trending_topics() coroutine as
+    MockTrendDetector, so it can be dropped into the consciousness loop.
+    The same story reported by several sources is merged into one topic
+    before ranking, unless merge_duplicates is False. With a scorer, topics
+    are rescored as one batch instead of being sorted on the sources' own
+    relevance.
+    """
+
+    def __init__(self, sources: Sequence[TrendSource], deadline: float = 1.5, per_source_limit: int = 10,
+                 merger: Optional[TrendMerger] = None, merge_duplicates: bool = True,
+                 scorer: Optional[TrendScorer] = None):
+        self.sources = list(sources)
+        self.deadline = deadline
+        self.per_source_limit = per_source_limit
+        self.merger = (merger or TrendMerger()) if merge_duplicates else None
+        self.scorer = scorer
+        self.last_outcomes: Dict[str, SourceOutcome] = {}
+
+    async def _query(self, source: TrendSource) -> List[TrendingTopic]:
+        started = time.perf_counter()
+        try:
+            topics = await asyncio.wait_for(source.fetch(self.per_source_limit), timeout=source.timeout)
+        except asyncio.TimeoutError:
+            self.last_outcomes[source.name] = SourceOutcome(source.name, "timeout", seconds=time.perf_counter() - started)
+            return []
+        except Exception as error:  # a broken source must not take the cycle down
+            self.last_outcomes[source.name] = SourceOutcome(source.name, "error", seconds=time.perf_counter() - started,
+                                                            error=f"{type(error).__name__}: {error}")
+            return []
+        self.last_outcomes[source.name] = SourceOutcome(source.name, "ok", topics=len(topics),
+                                                        seconds=time.perf_counter() - started)
+        return topics
+
+    async def collect(self) -> List[TrendingTopic]:
+        """Every topic that arrived from any source before the deadline"""
+        self.last_outcomes = {}
+        tasks = {asyncio.create_task(self._query(source)): source for source in self.sources}
+        if not tasks:
+            return []
+
+        done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+        for task in pending:
+            task.cancel()
+            source = tasks[task]
+            self.last_outcomes[source.name] = SourceOutcome(source.name, "missed_deadline", seconds=self.deadline)
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        return [topic for task in done for topic in task.result()]
+
+    async def detect_trending_topics(self, num_topics: int = 3) -> List[TrendingTopic]:
+        collected = await self.collect()
+        trending_topics = self.merger.merge(collected) if self.merger else collected
+        if self.scorer:
+            trending_topics = self.scorer.rank(trending_topics, num_topics)
+        else:
+            trending_topics.sort(key=lambda x: x.relevance_score, reverse=True)
+            trending_topics = trending_topics[:num_topics]
+
+        print(f"🔍 TREND FAN-OUT: {len(trending_topics)} topics from {len(self.sources)} sources "
+              f"({len(collected)} reports)")
+        for outcome in self.last_outcomes.values():
+            print(f"  • {outcome.name}: {outcome.status} ({outcome.topics} topics, {outcome.seconds:.2f}s)")
+
+        return trending_topics
+
+def default_stub_sources(topics: Sequence[str], seed: Optional[int] = None) -> List[TrendSource]:
+    """
+    The sources ErewhonCore describes, as offline stubs with realistic latencies
+
+    With a seed, each source gets its own seed derived from it, so runs are
+    reproducible but the sources still disagree as real ones would.
+    """
+    specs = [("Twitter", 0.3, 0.1, 0.0), ("Google Trends", 0.6, 0.2, 0.0), ("Reddit", 0.4, 0.2, 0.0),
+             ("News API", 0.8, 0.3, 0.1)]
+    return [StubTrendSource(name, topics, latency=latency, jitter=jitter, failure_rate=failure_rate,
+                            seed=None if seed is None else seed + offset)
+            for offset, (name, latency, jitter, failure_rate) in enumerate(specs)]
+
+# Test the trend aggregator
+if __name__ == "__main__":
+    from trend_detector import MockTrendDetector
+
+    async def test_fan_out():
+        topics = MockTrendDetector().mock_topics
+        sources = default_stub_sources(topics, seed=7)
+        # One source that always hangs, one that is always down
+        sources.append(StubTrendSource("TikTok", topics, latency=5.0, timeout=10.0))
+        sources.append(StubTrendSource("Broken Feed", topics, latency=0.05, failure_rate=1.0))
+
+        aggregator = TrendAggregator(sources, deadline=1.0)
+        started = time.perf_counter()
+        trends = await aggregator.detect_trending_topics(num_topics=5)
+        print(f"\nCollected {len(trends)} topics in {time.perf_counter() - started:.2f}s "
+              f"(slowest source alone would take 5s)")
+
+    print("TESTING CONCURRENT TREND FAN-OUT...")
+    asyncio.run(test_fan_out())
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+STREAMING TREND AGGREGATOR
+Finding the zeitgeist in the firehose itself
+
+Instead of asking an API what is trending, this aggregator works it out
+from raw mention events - (topic, source, timestamp) - as they stream in.
+Counts live in count-min sketches, one per time bucket of a sliding window,
+so memory is fixed no matter how many distinct topics appear. A small
+candidate set of heavy hitters is kept alongside, ranked by a lazy min-heap,
+and each emitted TrendingTopic is scored by how often it was mentioned in
+the window and by how fast those mentions are accelerating.
+"""
+
+import heapq
+import time
+from array import array
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from architecture import TrendingTopic
+
+Timestamp = Union[float, datetime]
+MentionEvent = Tuple[str, str, Timestamp]
+
+class CountMinSketch:
+    """
+    Fixed-size frequency estimates that never undercount
+
+    Counts live in a flat array of depth rows by width columns; a key's
+    estimate is the smallest of its depth cells. Row positions come from
+    double hashing of Python's own string hash, which is cheap but varies
+    between processes - sketches are combined in memory, never persisted.
+    """
+
+    __slots__ = ("width", "depth", "table")
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = array("q", bytes(8 * width * depth))
+
+    def indices(self, key: str) -> List[int]:
+        """The key's cell in every row, as offsets into table"""
+        h = hash(key)
+        first, step = h & 0xFFFFFFFF, (h >> 32) | 1
+        width = self.width
+        return [row * width + (first + row * step) % width for row in range(self.depth)]
+
+    def add_at(self, indices: Sequence[int], count: int = 1):
+        table = self.table
+        for index in indices:
+            table[index] += count
+
+    def estimate_at(self, indices: Sequence[int]) -> int:
+        table = self.table
+        return min(table[index] for index in indices)
+
+    def add(self, key: str, count: int = 1):
+        self.add_at(self.indices(key), count)
+
+    def estimate(self, key: str) -> int:
+        return self.estimate_at(self.indices(key))
+
+    def subtract(self, other: "CountMinSketch"):
+        """Remove another sketch's counts (it must have the same width and depth)"""
+        table = self.table
+        for index, count in enumerate(other.table):
+            if count:
+                table[index] -= count
+
+    def clear(self):
+        self.table = array("q", bytes(8 * self.width * self.depth))
+
+class SlidingWindowTrendAggregator:
+    """
+    Heavy hitters over the last window_seconds of mention events
+
+    The window is a ring of bucket sketches plus a running total sketch;
+    when a bucket falls out of the window its counts are subtracted from
+    the total. At most k * candidate_factor topics are tracked exactly by
+    name (with their sources), so memory stays bounded. Events older than
+    the window are counted as late and dropped.
+
+    Exposes detect_trending_topics() like MockTrendDetector, so it can be
+    dropped into the consciousness loop.
+    """
+
+    def __init__(self, window_seconds: float = 300.0, buckets: int = 10, width: int = 2048, depth: int = 4,
+                 k: int = 20, candidate_factor: int = 4, name: str = "Firehose"):
+        self.window_seconds = window_seconds
+        self.bucket_seconds = window_seconds / buckets
+        self.buckets = buckets
+        self.k = k
+        self.capacity = k * candidate_factor
+        self.name = name
+
+        self._total = CountMinSketch(width, depth)
+        self._ring = [CountMinSketch(width, depth) for _ in range(buckets)]
+        self._ring_ids = [-1] * buckets
+        self._newest: Optional[int] = None
+
+        self._candidates: Dict[str, int] = {}
+        self._heap: List[Tuple[int, str]] = []
+        self._sources: Dict[str, Counter] = {}
+
+        self.ingested = 0
+        self.late = 0
+
+    # Ingest
+
+    def ingest(self, topic: str, source: str, timestamp: Timestamp):
+        self.ingest_many(((topic, source, timestamp),))
+
+    def ingest_many(self, events: Iterable[MentionEvent]):
+        """
+        Ingest a batch of events
+
+        Events are counted per (bucket, topic) up front, so sketch updates
+        scale with the distinct topics in a batch rather than its events.
+        """
+        bucket_seconds = self.bucket_seconds
+        by_bucket: Dict[int, Dict[str, int]] = {}
+        by_source: Dict[Tuple[str, str], int] = {}
+        get_source = by_source.get
+        current_bucket, counts = None, {}
+        for topic, source, timestamp in events:
+            if isinstance(timestamp, datetime):
+                timestamp = timestamp.timestamp()
+            bucket = int(timestamp // bucket_seconds)
+            if bucket != current_bucket:  # events mostly arrive in time order
+                current_bucket, counts = bucket, by_bucket.setdefault(bucket, {})
+            counts[topic] = counts.get(topic, 0) + 1
+            key = (topic, source)
+            by_source[key] = get_source(key, 0) + 1
+
+        indices = self._total.indices
+        offer = self._offer
+        candidates, heap, capacity = self._candidates, self._heap, self.capacity
+        for bucket in sorted(by_bucket):
+            counts = by_bucket[bucket]
+            self.ingested += sum(counts.values())
+            if self._newest is None or bucket > self._newest:
+                self._advance(bucket)
+                candidates, heap = self._candidates, self._heap
+            elif bucket <= self._newest - self.buckets:
+                self.late += sum(counts.values())
+                continue
+
+            slot = bucket % self.buckets
+            if self._ring_ids[slot] != bucket:
+                # A late event for a window bucket older than the first one seen: claim its unused slot,
+                # so it is expired from the total like any other bucket
+                self._ring_ids[slot] = bucket
+            total = self._total.table
+            bucket_table = self._ring[slot].table
+            for topic, count in counts.items():
+                cells = indices(topic)
+                for cell in cells:
+                    bucket_table[cell] += count
+                    total[cell] += count
+                estimate = min(total[cell] for cell in cells)
+                # Stale heap entries only understate counts, so this rejects the long tail safely
+                if topic in candidates or len(candidates) < capacity or estimate > heap[0][0]:
+                    offer(topic, estimate)
+                    heap = self._heap
+
+        sources = self._sources
+        for (topic, source), count in by_source.items():
+            if topic in sources:
+                sources[topic][source] += count
+
+    def _advance(self, bucket: int):
+        """Make bucket the newest, expiring whatever falls out of the window"""
+        first = bucket if self._newest is None else max(self._newest + 1, bucket - self.buckets + 1)
+        for new_bucket in range(first, bucket + 1):
+            slot = new_bucket % self.buckets
+            if self._ring_ids[slot] != -1:
+                self._total.subtract(self._ring[slot])
+                self._ring[slot].clear()
+            self._ring_ids[slot] = new_bucket
+        self._newest = bucket
+
+        # Expired counts lower every estimate; re-rank the candidates against the new window
+        estimate = self._total.estimate
+        self._candidates = {topic: count for topic, count in
+                            ((topic, estimate(topic)) for topic in self._candidates) if count > 0}
+        self._sources = {topic: self._sources[topic] for topic in self._candidates}
+        self._heap = [(count, topic) for topic, count in self._candidates.items()]
+        heapq.heapify(self._heap)
+
+    def _offer(self, topic: str, estimate: int) -> bool:
+        """Track topic as a heavy-hitter candidate if it earns a place; True if tracked"""
+        candidates = self._candidates
+        if topic not in candidates:
+            if len(candidates) >= self.capacity:
+                weakest, weakest_topic = self._weakest()
+                if estimate <= weakest:
+                    return False
+                heapq.heappop(self._heap)
+                del candidates[weakest_topic]
+                del self._sources[weakest_topic]
+            self._sources[topic] = Counter()
+
+        candidates[topic] = estimate
+        heapq.heappush(self._heap, (estimate, topic))
+        if len(self._heap) > 4 * self.capacity:  # drop superseded heap entries
+            self._heap = [(count, name) for name, count in candidates.items()]
+            heapq.heapify(self._heap)
+        return True
+
+    def _weakest(self) -> Tuple[int, str]:
+        """The current lowest-count candidate, skipping superseded heap entries"""
+        heap = self._heap
+        while heap:
+            count, topic = heap[0]
+            if self._candidates.get(topic) == count:
+                return count, topic
+            heapq.heappop(heap)
+        raise LookupError("no candidates")
+
+    # Emit
+
+    def _window_slots(self) -> Tuple[List[int], List[int]]:
+        """Ring slots in the recent and the older half of the window"""
+        recent, older = [], []
+        if self._newest is None:
+            return recent, older
+        half = self._newest - self.buckets // 2
+        for slot, bucket in enumerate(self._ring_ids):
+            if bucket > self._newest - self.buckets and bucket != -1:
+                (recent if bucket > half else older).append(slot)
+        return recent, older
+
+    def _estimate_over(self, slots: List[int], cells: List[int]) -> int:
+        tables = [self._ring[slot].table for slot in slots]
+        return min(sum(table[cell] for table in tables) for cell in cells)
+
+    def trending(self, num_topics: int = 10) -> List[TrendingTopic]:
+        """
+        The strongest topics in the current window
+
+        relevance_score mixes windowed frequency (relative to the busiest
+        topic) with acceleration: the share of mentions per bucket that
+        fall in the recent half of the window. Steady topics score 0.5 on
+        acceleration, rising ones approach 1.
+        """
+        if not self._candidates:
+            return []
+
+        recent_slots, older_slots = self._window_slots()
+        busiest = max(self._candidates.values())
+        timestamp = datetime.fromtimestamp(min(time.time(), (self._newest + 1) * self.bucket_seconds))
+
+        scored = []
+        for topic, mentions in self._candidates.items():
+            cells = self._total.indices(topic)
+            recent_rate = self._estimate_over(recent_slots, cells) / max(len(recent_slots), 1)
+            older_rate = self._estimate_over(older_slots, cells) / len(older_slots) if older_slots else 0.0
+            growth = recent_rate / (recent_rate + older_rate) if older_slots and recent_rate + older_rate else 0.5
+            relevance = 0.6 * mentions / busiest + 0.4 * growth
+            scored.append((relevance, mentions, growth, topic))
+
+        scored.sort(reverse=True)
+        trends = []
+        for relevance, mentions, growth, topic in scored[:num_topics]:
+            top_sources = [source for source, _ in self._sources[topic].most_common(2)] or [self.name]
+            trends.append(TrendingTopic(
+                topic=topic,
+                source=", ".join(top_sources),
+                relevance_score=round(relevance, 3),
+                timestamp=timestamp,
+                context=f"~{mentions} mentions in the last {self.window_seconds:.0f}s, "
+                        f"{'accelerating' if growth > 0.55 else 'cooling' if growth < 0.45 else 'steady'}"
+            ))
+        return trends
+
+    async def detect_trending_topics(self, num_topics: int = 3) -> List[TrendingTopic]:
+        trending_topics = self.trending(num_topics)
+        print(f"🔍 TREND STREAM: {len(trending_topics)} topics from {self.ingested:,} mentions "
+              f"({len(self._candidates)} candidates tracked, {self.late:,} late)")
+        return trending_topics
+
+# Test the streaming aggregator
+if __name__ == "__main__":
+    import random
+    from trend_detector import MockTrendDetector
+
+    topics = MockTrendDetector().mock_topics
+    sources = ["Twitter", "Reddit", "TikTok", "News API"]
+    noise = [f"long tail topic {i}" for i in range(50000)]
+    rng = random.Random(13)
+    start = 1_700_000_000.0
+
+    def firehose(count, seconds_from, seconds_to, rising):
+        events = []
+        for _ in range(count):
+            roll = rng.random()
+            if roll < 0.05:
+                topic = rising
+            elif roll < 0.5:
+                topic = topics[min(int(rng.expovariate(0.5)), len(topics) - 1)]
+            else:
+                topic = rng.choice(noise)
+            events.append((topic, rng.choice(sources), start + rng.uniform(seconds_from, seconds_to)))
+        return sorted(events, key=lambda event: event[2])
+
+    print("TESTING STREAMING TREND AGGREGATOR...")
+    aggregator = SlidingWindowTrendAggregator(window_seconds=300, k=5)
+    older = firehose(300000, 0, 150, rising="nothing yet")
+    recent = firehose(300000, 150, 300, rising="Breaking: robots learn to dance")
+
+    began = time.perf_counter()
+    aggregator.ingest_many(older)
+    aggregator.ingest_many(recent)
+    elapsed = time.perf_counter() - began
+    print(f"  Ingested {aggregator.ingested:,} events in {elapsed:.2f}s ({aggregator.ingested / elapsed:,.0f} events/s)")
+
+    for trend in aggregator.trending(5):
+        print(f"  {trend.relevance_score:.3f} {trend.topic} [{trend.source}] - {trend.context}")
@@ -7,12 +7,16 @@ This component uses processed comments to dynamically modify previously generate
 - extending the co-evolutionary loop.
 """
 
+import asyncio
 import random
 import uuid
 from datetime import datetime
 from architecture import AIContent
+from backend_scheduler import BackendScheduler, Priority
 from comment_processor import ProcessedComment
-from typing import List
+from content_lineage import LineageStore
+from render_cache import RenderCache
+from typing import List, Optional
 
 class VideoModifier:
     """
@@ -22,9 +26,18 @@ class VideoModifier:
     based on human commentary, allowing participatory evolution.
     """
     
-    def __init__(self):
+    def __init__(self, scheduler: Optional[BackendScheduler] = None, confident_threshold: float = 0.6,
+                 lineage: Optional[LineageStore] = None, render_cache: Optional[RenderCache] = None):
         # Preset video modification techniques
         self.modification_methods = ['color shift', 'object add', 'style change', 'speed adjustment']
+        # Renders share the video backend's quota when a scheduler is given; evolutions
+        # backed by confident suggestions outrank low-confidence re-renders
+        self.scheduler = scheduler
+        self.confident_threshold = confident_threshold
+        # Every evolution is recorded as a delta; the lineage also composes the bounded video prompt
+        self.lineage = lineage if lineage is not None else LineageStore()
+        # Batches asking for the same modifications of the same source reuse the earlier render
+        self.render_cache = render_cache
     
     async def modify_video_based_on_comments(self, content: AIContent, comments: List[ProcessedComment]) -> AIContent:
         """
@@ -33,10 +46,33 @@ class VideoModifier:
         
         This is where human-guided evolution occurs - feedback loops driving content adaptation.
         """
-        
+        cached = self.render_cache.get(content, comments) if self.render_cache is not None else None
+        if cached is not None:
+            # The render is reused, but this evolution is a version of its own: the earlier
+            # one may already be published, and the caller will publish this one separately
+            cached = self.lineage.record_evolution(content, AIContent(
+                content_id=str(uuid.uuid4()),
+                topic_inspiration=content.topic_inspiration,
+                music_prompt=content.music_prompt,
+                video_prompt=content.video_prompt,
+                generated_music_url=content.generated_music_url,
+                generated_video_url=cached.generated_video_url,
+                youtube_video_id=content.youtube_video_id,
+                creation_timestamp=datetime.now()
+            ), comments)
+            print("♻️  VIDEO MODIFICATION REUSED")
+            print(f"  Original Video ID: {content.content_id}")
+            print(f"  Modified Video ID: {cached.content_id}")
+            print(f"  Reused Video URL: {cached.generated_video_url}")
+            return cached
+
         # Simulate video processing time
-        import asyncio
-        await asyncio.sleep(1.5)
+        if self.scheduler is None:
+            await asyncio.sleep(1.5)
+        else:
+            confident = any(comment.confidence_score >= self.confident_threshold for comment in comments)
+            priority = Priority.MODIFICATION if confident else Priority.RERENDER
+            await self.scheduler.run("video", lambda: asyncio.sleep(1.5), priority)
         
         new_content_id = str(uuid.uuid4())
         modifications = []
@@ -44,7 +80,8 @@ class VideoModifier:
         # Apply each comment suggestion
         for comment in comments:
             modification_type = random.choice(self.modification_methods)
-            modifications.append(f"Applied {modification_type}: {comment.prompt_addition}")
+            support = f" (×{comment.support})" if comment.support > 1 else ""
+            modifications.append(f"Applied {modification_type}: {comment.prompt_addition}{support}")
             
         # Simulate creating a new modified video URL
         modified_video_url = f"https://mock-runway-api.com/videos/{new_content_id}.mp4"
@@ -53,12 +90,15 @@ class VideoModifier:
             content_id=new_content_id,
             topic_inspiration=content.topic_inspiration,
             music_prompt=content.music_prompt,
-            video_prompt=content.video_prompt + " modified",
+            video_prompt=content.video_prompt,
             generated_music_url=content.generated_music_url,
             generated_video_url=modified_video_url,
             youtube_video_id=content.youtube_video_id,
             creation_timestamp=datetime.now()
         )
+        modified_content = self.lineage.record_evolution(content, modified_content, comments)
+        if self.render_cache is not None:
+            self.render_cache.put(content, comments, modified_content)
         
         print("🎬 VIDEO MODIFICATION COMPLETE")
         print(f"  Original Video ID: {content.content_id}")
@@ -72,7 +112,6 @@ class VideoModifier:
 
 # Test video modification
 if __name__ == "__main__":
-    import asyncio
     from content_generator import MockContentGenerator
     from comment_processor import CommentProcessor
     